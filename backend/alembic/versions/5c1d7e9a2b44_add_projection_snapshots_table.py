@@ -0,0 +1,46 @@
+"""Add projection_snapshots table
+
+Revision ID: 5c1d7e9a2b44
+Revises: 37f2f1ffbabb
+Create Date: 2026-10-17 10:12:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1d7e9a2b44'
+down_revision: Union[str, None] = '37f2f1ffbabb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'projection_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('scenario_id', sa.Integer(), nullable=True),
+        sa.Column('parameters_key', sa.String(length=64), nullable=False),
+        sa.Column('parameters', sa.Text(), nullable=False),
+        sa.Column('series', sa.LargeBinary(), nullable=False),
+        sa.Column('details', sa.Text(), nullable=False),
+        sa.Column('current_year', sa.Integer(), nullable=False),
+        sa.Column('is_stale', sa.Boolean(), nullable=False, server_default='0'),
+        sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['scenario_id'], ['scenarios.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'parameters_key')
+    )
+    op.create_index(op.f('ix_projection_snapshots_id'), 'projection_snapshots', ['id'], unique=False)
+    op.create_index(op.f('ix_projection_snapshots_user_id'), 'projection_snapshots', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_projection_snapshots_user_id'), table_name='projection_snapshots')
+    op.drop_index(op.f('ix_projection_snapshots_id'), table_name='projection_snapshots')
+    op.drop_table('projection_snapshots')
@@ -0,0 +1,26 @@
+"""Add household_revision to users
+
+Revision ID: 8e2f4b6a1d93
+Revises: 5c1d7e9a2b44
+Create Date: 2026-10-17 14:03:12.544816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2f4b6a1d93'
+down_revision: Union[str, None] = '5c1d7e9a2b44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('household_revision', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'household_revision')
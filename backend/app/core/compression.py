@@ -0,0 +1,127 @@
+import gzip
+from typing import List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+GZIP_ENCODING = "gzip"
+BROTLI_ENCODING = "br"
+
+
+def available_encodings() -> List[str]:
+    """Content encodings that can be produced with the installed packages, preferred first."""
+    return [BROTLI_ENCODING, GZIP_ENCODING] if brotli is not None else [GZIP_ENCODING]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the content encoding of a response from an Accept-Encoding header.
+
+    Encodings are ranked by their q-value, then brotli before gzip. A
+    wildcard stands for every encoding that isn't listed.
+
+    Args:
+        accept_encoding: The Accept-Encoding header, if any
+
+    Returns:
+        The encoding to compress with, or None to send the body as is
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, *parameters = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+
+    available = available_encodings()
+    candidates = []
+    for preference, encoding in enumerate(available):
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > 0:
+            candidates.append((-quality, preference, encoding))
+    return min(candidates)[2] if candidates else None
+
+
+def compress(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    """Compress a response body with a content encoding from `available_encodings`."""
+    if encoding == BROTLI_ENCODING:
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing response bodies of at least `minimum_size`
+    bytes with the encoding negotiated from Accept-Encoding: brotli when it
+    is installed and accepted, otherwise gzip.
+
+    Only responses with a Content-Length are compressed: streamed responses
+    (NDJSON and Server-Sent Events) and bodies that already have a
+    Content-Encoding are sent as is. Compression runs on a worker thread.
+    """
+
+    def __init__(self, app, minimum_size: int, gzip_level: int, brotli_quality: int):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        encoding = None
+        if scope["type"] == "http":
+            encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        chunks = []
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                length = headers.get("content-length")
+                if length is None or "content-encoding" in headers:
+                    await send(message)
+                    return
+                headers.add_vary_header("Accept-Encoding")
+                if int(length) < self.minimum_size:
+                    await send(message)
+                    return
+                # Held until the whole body is buffered and compressed
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = await run_in_threadpool(
+                compress, b"".join(chunks), encoding, self.gzip_level, self.brotli_quality
+            )
+            headers = MutableHeaders(scope=start_message)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
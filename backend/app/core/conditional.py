@@ -0,0 +1,69 @@
+import hashlib
+from datetime import date
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+# Request state key holding the entity tag of the response
+ETAG_STATE_KEY = "etag"
+
+# Cache-Control of tagged responses: per user, and revalidated before every reuse
+TAGGED_CACHE_CONTROL = "private, no-cache"
+
+
+def household_etag(user_id: int, revision: int, *request_parts: object) -> str:
+    """
+    Weak entity tag of a response computed from a user's household.
+
+    Args:
+        user_id: Owner of the household
+        revision: Stored household revision, bumped by every write
+        request_parts: Whatever else selects the response (path, query, body, ...)
+
+    Returns:
+        The weak entity tag, quoted
+    """
+    # Today's date is part of the tag: ages and projections depend on it
+    seed = repr((user_id, revision, date.today().isoformat(), request_parts))
+    return f'W/"{hashlib.blake2b(seed.encode("utf-8"), digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches a tag, with the weak comparison."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+class ETagMiddleware:
+    """
+    ASGI middleware adding the ETag computed while handling a request to its
+    successful response.
+
+    Endpoints store the tag in the request state (see ETAG_STATE_KEY); doing
+    it here also covers endpoints returning their own Response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                etag = scope.get("state", {}).get(ETAG_STATE_KEY)
+                if etag is not None:
+                    headers = MutableHeaders(scope=message)
+                    headers["ETag"] = etag
+                    headers.setdefault("Cache-Control", TAGGED_CACHE_CONTROL)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -13,6 +13,19 @@ class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str = "sqlite:///./wealthsphere.db"
     
+    # Connection pool (not used for in-memory SQLite); the statement timeout applies to Postgres
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    
+    # SQLite pragmas set on every connection (an empty value keeps the SQLite default)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    
     # JWT Authentication
     SECRET_KEY: str = "CHANGE_THIS_TO_A_STRONG_SECRET_KEY_IN_PRODUCTION"
     ALGORITHM: str = "HS256"
@@ -22,6 +35,46 @@ class Settings(BaseSettings):
     FIRST_USER_EMAIL: Optional[str] = None
     FIRST_USER_PASSWORD: Optional[str] = None
     
+    # Password hashing: bcrypt cost factor (log2 rounds) and threads hashing passwords
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    
+    # Validated access tokens cached by get_current_user; the cache is per
+    # process, so a user change made by another worker is seen within the TTL
+    AUTH_CACHE_SIZE: int = 4096
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    
+    # Largest page of the keyset-paginated list endpoints (limit= parameter)
+    MAX_PAGE_SIZE: int = 1000
+    
+    # Response compression (brotli when installed, else gzip) from this body size, in bytes
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 1
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    
+    # Projection result cache
+    PROJECTION_CACHE_SIZE: int = 256
+    PROJECTION_CACHE_TTL_SECONDS: int = 300
+    
+    # Stored projection snapshots: quiet period before a recompute after writes, and snapshots kept per user
+    PROJECTION_SNAPSHOT_DEBOUNCE_SECONDS: float = 2.0
+    PROJECTION_SNAPSHOTS_PER_USER: int = 32
+    
+    # Worker threads running the scenarios of a batch projection
+    PROJECTION_BATCH_WORKERS: int = 4
+    
+    # Withdrawal optimizer: worker processes (1 to evaluate inline) and memoized evaluations
+    OPTIMIZER_WORKERS: int = 4
+    OPTIMIZER_MEMO_SIZE: int = 4096
+    
+    # Per-request tracing (X-Trace header), only for the listed users, and
+    # where trace files are written: at most TRACE_MAX_FILES, the oldest are deleted
+    REQUEST_TRACING_ENABLED: bool = False
+    TRACE_ADMIN_EMAILS: List[str] = []
+    TRACE_DIR: str = "traces"
+    TRACE_MAX_FILES: int = 100
+    TRACE_MAX_RECORDS: int = 10000
+    
     # Canadian specific settings
     TAX_YEAR: int = 2023
     
@@ -0,0 +1,217 @@
+import json
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional dependency
+    pa = None
+
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Media types accepted in the Accept header, mapped to the type we respond with
+MEDIA_TYPE_ALIASES = {
+    JSON_MEDIA_TYPE: JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE: MSGPACK_MEDIA_TYPE,
+    "application/x-msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.msgpack": MSGPACK_MEDIA_TYPE,
+    ARROW_MEDIA_TYPE: ARROW_MEDIA_TYPE,
+}
+
+
+def available_media_types() -> List[str]:
+    """Media types that can be produced with the installed packages."""
+    media_types = [JSON_MEDIA_TYPE]
+    if msgpack is not None:
+        media_types.append(MSGPACK_MEDIA_TYPE)
+    if pa is not None:
+        media_types.append(ARROW_MEDIA_TYPE)
+    return media_types
+
+
+def negotiate_media_type(accept: Optional[str]) -> Optional[str]:
+    """
+    Pick the response media type from an Accept header.
+
+    Media types are ranked by their q-value, then by their order in the
+    header. Wildcards select JSON.
+
+    Args:
+        accept: The Accept header, if any
+
+    Returns:
+        The media type to respond with, or None when nothing acceptable can be produced
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    available = available_media_types()
+    candidates = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *parameters = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality <= 0:
+            continue
+
+        media_type = media_type.lower()
+        if media_type in ("*/*", "application/*"):
+            resolved = JSON_MEDIA_TYPE
+        else:
+            resolved = MEDIA_TYPE_ALIASES.get(media_type)
+        if resolved in available:
+            candidates.append((-quality, position, resolved))
+
+    return min(candidates)[2] if candidates else None
+
+
+def to_builtin(value: Any) -> Any:
+    """Convert numpy arrays and scalars nested in dicts and lists into Python types."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {key: to_builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_builtin(item) for item in value]
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """Encode the values the JSON encoders don't handle natively."""
+    if isinstance(value, np.ndarray):
+        # orjson only serializes C-contiguous arrays itself
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Encode content as compact JSON: with orjson when it is installed,
+    otherwise with the standard library. Numpy arrays and scalars, and
+    dates, are encoded too.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            content, default=json_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(content, separators=(",", ":"), default=json_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class of the app: JSON encoded by `dumps_json`."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+def trusted_json_response(content: Any, adapter: TypeAdapter) -> FastJSONResponse:
+    """
+    Respond with content whose shape is already trusted, such as the output
+    of the projection engines, skipping the validation and serialization of
+    the endpoint's response model.
+
+    With DEBUG, the content is still checked against the precompiled adapter
+    of the response model.
+
+    Args:
+        content: JSON-compatible content (numpy values allowed)
+        adapter: Adapter of the endpoint's response model
+
+    Returns:
+        The JSON response
+    """
+    if settings.DEBUG:
+        adapter.validate_python(content)
+    return FastJSONResponse(content)
+
+
+def encode_json(columns: Dict) -> bytes:
+    """Encode columnar data as JSON."""
+    return dumps_json(columns)
+
+
+def encode_msgpack(columns: Dict) -> bytes:
+    """Encode columnar data as MessagePack."""
+    return msgpack.packb(to_builtin(columns), use_bin_type=True)
+
+
+def encode_arrow(columns: Dict) -> bytes:
+    """
+    Encode columnar data as an Arrow IPC stream with one row per year.
+
+    One-dimensional series become columns named "<group>.<series>"; account
+    series become one column per account, named "<group>.<series>.<account id>".
+    Everything that isn't indexed by year (family members, accounts and death
+    benefits) is stored as JSON in the "wealthsphere" schema metadata.
+
+    Args:
+        columns: Columnar data with a "years" axis
+
+    Returns:
+        The Arrow IPC stream
+    """
+    arrays = {"year": pa.array(columns["years"])}
+    account_ids = [account["id"] for account in columns["accounts"]]
+    metadata = {}
+    for group, series in columns.items():
+        if group == "years":
+            continue
+        if not isinstance(series, dict) or not all(isinstance(values, np.ndarray) for values in series.values()):
+            metadata[group] = series
+            continue
+
+        for name, values in series.items():
+            if values.ndim == 1:
+                arrays[f"{group}.{name}"] = pa.array(values)
+            else:
+                for account_id, row in zip(account_ids, values):
+                    arrays[f"{group}.{name}.{account_id}"] = pa.array(row)
+
+    table = pa.table(arrays, metadata={"wealthsphere": json.dumps(to_builtin(metadata))})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+ENCODERS = {
+    JSON_MEDIA_TYPE: encode_json,
+    MSGPACK_MEDIA_TYPE: encode_msgpack,
+    ARROW_MEDIA_TYPE: encode_arrow,
+}
+
+
+def encode_columns(columns: Dict, media_type: str) -> bytes:
+    """Encode columnar data in a media type returned by `negotiate_media_type`."""
+    return ENCODERS[media_type](columns)
@@ -1,29 +1,79 @@
 import logging
 import sys
-from typing import Any, Dict, List
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
 
 from app.core.config import settings
 
 
+# Logger of the application; module loggers from `get_logger` are its children
+APP_LOGGER_NAME = "wealthsphere"
+
+# Log messages captured for the current request while it is traced
+_trace_records: ContextVar[Optional[List[str]]] = ContextVar("trace_records", default=None)
+
+# Number of requests being traced, and the application logger's level to
+# restore once none is
+_active_traces = 0
+_configured_level = logging.NOTSET
+_trace_lock = threading.Lock()
+
+
+def application_level() -> int:
+    """Level application records are logged at, outside of traces."""
+    with _trace_lock:
+        if _active_traces:
+            # A logger without a level of its own inherits the root's
+            return _configured_level or logging.getLogger().getEffectiveLevel()
+    return logging.getLogger(APP_LOGGER_NAME).getEffectiveLevel()
+
+
+class TraceHandler(logging.Handler):
+    """Appends formatted records to the trace of the current request, if any."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        records = _trace_records.get()
+        if records is not None:
+            records.append(self.format(record))
+
+
+class ConfiguredLevelFilter(logging.Filter):
+    """Drops application records below the configured level, i.e. those only emitted for a trace."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.name != APP_LOGGER_NAME and not record.name.startswith(APP_LOGGER_NAME + "."):
+            return True
+        return record.levelno >= application_level()
+
+
 def setup_logging() -> None:
     """Configure logging settings for the application."""
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    
+
     # Configure root logger
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.addFilter(ConfiguredLevelFilter())
     logging.basicConfig(
         level=logging.INFO if settings.DEBUG else logging.WARNING,
         format=log_format,
-        handlers=[logging.StreamHandler(sys.stdout)]
+        handlers=[stream_handler]
     )
-    
+
     # Set level for specific loggers
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("fastapi").setLevel(logging.INFO)
-    
+
     # Our application logger
-    logger = logging.getLogger("wealthsphere")
+    logger = logging.getLogger(APP_LOGGER_NAME)
     logger.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
-    
+
+    # Capture application records into the trace of traced requests
+    if not any(isinstance(handler, TraceHandler) for handler in logger.handlers):
+        trace_handler = TraceHandler()
+        trace_handler.setFormatter(logging.Formatter("%(name)s - %(levelname)s - %(message)s"))
+        logger.addHandler(trace_handler)
+
     # You could add file handlers here if needed
     # file_handler = logging.FileHandler("logs/app.log")
     # file_handler.setFormatter(logging.Formatter(log_format))
@@ -33,11 +83,54 @@ def setup_logging() -> None:
 # Get a pre-configured logger for use throughout the application
 def get_logger(name: str) -> logging.Logger:
     """Get a logger with the specified name.
-    
+
+    Records of every level are emitted while a request is traced (see
+    `start_trace`); otherwise the application's level applies as usual.
+
     Args:
         name: The name for the logger (typically the module name)
-        
+
     Returns:
         A configured logger instance
     """
-    return logging.getLogger(f"wealthsphere.{name}") 
\ No newline at end of file
+    return logging.getLogger(f"{APP_LOGGER_NAME}.{name}")
+
+
+def start_trace() -> Any:
+    """Start capturing application log records for the current request.
+
+    While any request is traced, the application logger is lowered to DEBUG
+    so that records of every level reach its trace handler; records of other
+    requests below the configured level are dropped by `ConfiguredLevelFilter`.
+    Outside of traces, disabled debug calls return before a record is made.
+
+    Returns:
+        A token to pass to `stop_trace`
+    """
+    global _active_traces, _configured_level
+    with _trace_lock:
+        if _active_traces == 0:
+            logger = logging.getLogger(APP_LOGGER_NAME)
+            _configured_level = logger.level
+            logger.setLevel(logging.DEBUG)
+        _active_traces += 1
+    return _trace_records.set([])
+
+
+def stop_trace(token: Any) -> List[str]:
+    """Stop capturing log records for the current request.
+
+    Args:
+        token: The token returned by `start_trace`
+
+    Returns:
+        The captured log messages
+    """
+    global _active_traces
+    records = _trace_records.get() or []
+    _trace_records.reset(token)
+    with _trace_lock:
+        _active_traces -= 1
+        if _active_traces == 0:
+            logging.getLogger(APP_LOGGER_NAME).setLevel(_configured_level)
+    return records
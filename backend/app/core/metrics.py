@@ -0,0 +1,310 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Default latency buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Sample produced by a collector: (metric name, labels, value)
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Format labels as {name="value",...}."""
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, writing whole numbers without a decimal part."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    Process-wide registry of counters, gauges and histograms.
+
+    Updates are lock-free: every thread writes to its own shard, a plain dict
+    only that thread touches. Rendering sums the shards of all threads, so a
+    scrape may miss updates that are in flight, but never blocks writers.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, "Metric"] = {}
+        self._collectors: List[Tuple[str, str, str, Callable[[], Iterable[Sample]]]] = []
+        self._shards: List[Dict] = []
+        self._local = threading.local()
+        # Only taken when a thread writes its first sample or a metric is declared
+        self._lock = threading.Lock()
+
+    def shard(self) -> Dict:
+        """The calling thread's shard, keyed by (metric name, label values)."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def register(self, metric: "Metric") -> "Metric":
+        """Declare a metric."""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def register_collector(
+        self,
+        name: str,
+        metric_type: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Sample]]
+    ) -> None:
+        """
+        Declare a metric whose samples are produced on each scrape.
+
+        Args:
+            name: Name of the metric
+            metric_type: Prometheus type ("counter" or "gauge")
+            documentation: Help text
+            collect: Function returning (name, labels, value) samples
+        """
+        with self._lock:
+            self._collectors.append((name, metric_type, documentation, collect))
+
+    def _aggregate(self) -> Dict:
+        """Sum the shards of all threads."""
+        totals: Dict = {}
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # Copying the items of a dict is atomic, so writers can keep going
+            for key, value in list(shard.items()):
+                if isinstance(value, list):
+                    total = totals.setdefault(key, [0.0] * len(value))
+                    for index, item in enumerate(value):
+                        total[index] += item
+                else:
+                    totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        totals = self._aggregate()
+        by_metric: Dict[str, List] = {}
+        for (name, label_values), value in totals.items():
+            by_metric.setdefault(name, []).append((label_values, value))
+
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.metric_type}")
+            for label_values, value in sorted(by_metric.get(name, [])):
+                lines.extend(metric.format_samples(label_values, value))
+
+        for name, metric_type, documentation, collect in self._collectors:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for sample_name, labels, value in collect():
+                lines.append(f"{sample_name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+class Metric:
+    """Base class of metrics with a fixed set of label names."""
+
+    metric_type = "untyped"
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = ()
+    ):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        registry.register(self)
+
+    def format_samples(self, label_values: Tuple[str, ...], value) -> List[str]:
+        """Sample lines for one set of label values."""
+        return [f"{self.name}{_format_labels(self.labelnames, label_values)} {_format_value(value)}"]
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1.0, labels: Tuple[str, ...] = ()) -> None:
+        """Add an amount to the counter for the given label values."""
+        shard = self.registry.shard()
+        key = (self.name, labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+
+class Gauge(Counter):
+    """Value that goes up and down, e.g. requests in flight."""
+
+    metric_type = "gauge"
+
+    def dec(self, amount: float = 1.0, labels: Tuple[str, ...] = ()) -> None:
+        """Subtract an amount from the gauge for the given label values."""
+        self.inc(-amount, labels)
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        """Record a value for the given label values."""
+        shard = self.registry.shard()
+        key = (self.name, labels)
+        # Per-bucket counts (the last one is +Inf), then the sum and the count
+        state = shard.get(key)
+        if state is None:
+            state = shard[key] = [0.0] * (len(self.buckets) + 3)
+        state[bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def format_samples(self, label_values: Tuple[str, ...], value) -> List[str]:
+        lines = []
+        cumulative = 0.0
+        for bound, count in zip(self.buckets + (float("inf"),), value):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _format_value(bound)
+            labels = _format_labels(self.labelnames, label_values, f'le="{le}"')
+            lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+        labels = _format_labels(self.labelnames, label_values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(value[-2])}")
+        lines.append(f"{self.name}_count{labels} {_format_value(value[-1])}")
+        return lines
+
+
+metrics = MetricsRegistry()
+
+HTTP_REQUESTS = Counter(
+    metrics, "wealthsphere_http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ("method", "route", "status")
+)
+HTTP_REQUEST_ERRORS = Counter(
+    metrics, "wealthsphere_http_request_errors_total",
+    "HTTP requests that failed with a server error or an unhandled exception.",
+    ("method", "route")
+)
+HTTP_REQUEST_DURATION = Histogram(
+    metrics, "wealthsphere_http_request_duration_seconds",
+    "HTTP request latency by method and route template, in seconds.",
+    ("method", "route")
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    metrics, "wealthsphere_http_requests_in_progress",
+    "HTTP requests currently being handled.",
+    ("method",)
+)
+PROJECTION_RUNS = Counter(
+    metrics, "wealthsphere_projection_runs_total",
+    "Projection runs by engine.",
+    ("engine",)
+)
+PROJECTION_YEARS = Counter(
+    metrics, "wealthsphere_projection_years_total",
+    "Projection years computed by engine.",
+    ("engine",)
+)
+PROJECTION_ACCOUNTS = Counter(
+    metrics, "wealthsphere_projection_accounts_total",
+    "Investment accounts processed by projection runs, by engine.",
+    ("engine",)
+)
+
+
+def register_stats(
+    prefix: str,
+    stats: Callable[[], Dict[str, float]],
+    fields: Sequence[Tuple[str, str, str]]
+) -> None:
+    """
+    Expose values of a stats() method as metrics read on each scrape.
+
+    Args:
+        prefix: Metric name prefix, e.g. "wealthsphere_projection_cache"
+        stats: Function returning the current values by key
+        fields: (key, Prometheus type, help text) of each exposed value;
+            counters get a "_total" suffix
+    """
+    for key, metric_type, documentation in fields:
+        name = f"{prefix}_{key}" + ("_total" if metric_type == "counter" else "")
+        metrics.register_collector(
+            name,
+            metric_type,
+            documentation,
+            lambda name=name, key=key: [(name, {}, stats()[key])]
+        )
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latency, in-flight requests and
+    errors per route template (e.g. /api/assets/{asset_id}).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code: Optional[int] = None
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc(labels=(method,))
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            status_code = 500
+            raise
+        finally:
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            status = str(status_code or 500)
+            HTTP_REQUESTS_IN_PROGRESS.dec(labels=(method,))
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, (method, route_path))
+            HTTP_REQUESTS.inc(labels=(method, route_path, status))
+            if status_code is None or status_code >= 500:
+                HTTP_REQUEST_ERRORS.inc(labels=(method, route_path))
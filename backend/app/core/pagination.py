@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.encoding import JSON_MEDIA_TYPE, dumps_json
+from app.db import Base
+
+
+# Response header holding the cursor of the next page, absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass(frozen=True)
+class ListParams:
+    """Pagination and fieldset of a list request."""
+    limit: Optional[int] = None
+    cursor: Optional[int] = None
+    fields: Optional[Tuple[str, ...]] = None
+
+
+def list_params(
+    limit: Optional[int] = Query(
+        None, ge=1, le=settings.MAX_PAGE_SIZE, description="Page size; every item is returned when omitted"
+    ),
+    cursor: Optional[int] = Query(
+        None, ge=0, description=f"Cursor of the page, from the {NEXT_CURSOR_HEADER} header of the previous one"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return; id is always returned"
+    )
+) -> ListParams:
+    """Dependency reading the pagination and fieldset query parameters of a list endpoint."""
+    names = None
+    if fields is not None:
+        names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    return ListParams(limit=limit, cursor=cursor, fields=names)
+
+
+def resolve_fields(schema: Type[BaseModel], requested: Sequence[str]) -> List[str]:
+    """
+    Validate a fieldset against the response schema.
+
+    Args:
+        schema: Response schema of one item
+        requested: Requested field names
+
+    Returns:
+        The fields to return, with id, in the order of the schema
+
+    Raises:
+        HTTPException: 400 when a field isn't part of the schema
+    """
+    unknown = sorted(set(requested) - set(schema.model_fields))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {unknown}"
+        )
+    wanted = set(requested) | {"id"}
+    return [name for name in schema.model_fields if name in wanted]
+
+
+async def list_page(
+    db: AsyncSession,
+    model: Type[Base],
+    schema: Type[BaseModel],
+    conditions: Sequence[Any],
+    params: ListParams,
+    response: Response,
+    calculated: Optional[Dict[str, Tuple[str, ...]]] = None
+) -> Union[List[Base], Response]:
+    """
+    Load one page of a list endpoint, ordered by id.
+
+    Pages are keyset-paginated: the cursor is the id of the last item of the
+    previous page, so a page costs an index range scan whatever its depth.
+    Without a fieldset the items are ORM objects validated against the
+    response model. With one, only the needed columns are selected and the
+    rows are encoded straight to JSON, skipping model validation.
+
+    Args:
+        db: Database session
+        model: Model of the table
+        schema: Response schema of one item
+        conditions: WHERE conditions selecting the user's items
+        params: Pagination and fieldset
+        response: Response of the endpoint, receiving the next cursor header
+        calculated: Schema fields that are model properties, with the columns they're computed from
+
+    Returns:
+        The ORM objects, or the JSON response of a fieldset
+    """
+    calculated = calculated or {}
+    fields = resolve_fields(schema, params.fields) if params.fields is not None else None
+    if fields is None:
+        query = select(model)
+    else:
+        columns = dict.fromkeys(
+            column for name in fields for column in calculated.get(name, (name,))
+        )
+        query = select(*(getattr(model, column) for column in columns))
+
+    query = query.where(*conditions).order_by(model.id)
+    if params.cursor is not None:
+        query = query.where(model.id > params.cursor)
+    if params.limit is not None:
+        # One more row tells whether there is a next page
+        query = query.limit(params.limit + 1)
+
+    rows = (await (db.scalars(query) if fields is None else db.execute(query))).all()
+    headers = {}
+    if params.limit is not None and len(rows) > params.limit:
+        rows = rows[:params.limit]
+        headers[NEXT_CURSOR_HEADER] = str(rows[-1].id)
+
+    if fields is None:
+        response.headers.update(headers)
+        return rows
+
+    getters: Dict[str, Callable[[Any], Any]] = {
+        name: getattr(model, name).fget if name in calculated else (lambda row, name=name: getattr(row, name))
+        for name in fields
+    }
+    items = [{name: getter(row) for name, getter in getters.items()} for row in rows]
+    return Response(content=dumps_json(items), media_type=JSON_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,110 @@
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import List
+
+from fastapi import HTTPException, Request, Response
+from fastapi.security.utils import get_authorization_scheme_param
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import settings
+from app.core.logging_config import get_logger, start_trace, stop_trace
+from app.db import AsyncSessionLocal
+from app.routers.auth import get_current_user
+
+logger = get_logger("tracing")
+
+# Request header enabling the trace mode: "response" or "file"
+TRACE_HEADER = "X-Trace"
+# Response header holding the path of the trace file
+TRACE_FILE_HEADER = "X-Trace-File"
+
+
+def write_trace_file(request: Request, records: List[str]) -> str:
+    """
+    Write the trace of a request to a new file in TRACE_DIR and return its path.
+
+    At most TRACE_MAX_RECORDS records are written, and the oldest files
+    beyond TRACE_MAX_FILES are deleted.
+    """
+    os.makedirs(settings.TRACE_DIR, exist_ok=True)
+    file_name = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}.log"
+    path = os.path.join(settings.TRACE_DIR, file_name)
+    with open(path, "w", encoding="utf-8") as trace_file:
+        trace_file.write(f"{request.method} {request.url.path}\n")
+        trace_file.writelines(f"{record}\n" for record in records[:settings.TRACE_MAX_RECORDS])
+        if len(records) > settings.TRACE_MAX_RECORDS:
+            trace_file.write(f"... {len(records) - settings.TRACE_MAX_RECORDS} more records\n")
+    prune_trace_files(settings.TRACE_DIR, settings.TRACE_MAX_FILES, keep=file_name)
+    return path
+
+
+def prune_trace_files(trace_dir: str, max_files: int, keep: str) -> None:
+    """Delete the oldest trace files of a directory beyond `max_files`, never the file `keep`."""
+    # File names start with their UTC timestamp, so they sort oldest first
+    names = sorted(name for name in os.listdir(trace_dir) if name.endswith(".log") and name != keep)
+    for name in names[:max(len(names) + 1 - max_files, 0)]:
+        try:
+            os.remove(os.path.join(trace_dir, name))
+        except FileNotFoundError:
+            pass  # Pruned by a concurrent request
+
+
+async def is_trace_admin(request: Request) -> bool:
+    """Whether the request is authenticated as a user of TRACE_ADMIN_EMAILS."""
+    scheme, token = get_authorization_scheme_param(request.headers.get("authorization"))
+    if scheme.lower() != "bearer" or not token or not settings.TRACE_ADMIN_EMAILS:
+        return False
+    async with AsyncSessionLocal() as db:
+        try:
+            user = await get_current_user(request, token, db)
+        except HTTPException:
+            return False
+    return user.is_active and user.email in settings.TRACE_ADMIN_EMAILS
+
+
+class RequestTraceMiddleware(BaseHTTPMiddleware):
+    """
+    Opt-in per-request tracing.
+
+    When REQUEST_TRACING_ENABLED is set, a request of a user listed in
+    TRACE_ADMIN_EMAILS sent with `X-Trace: response` or `X-Trace: file`
+    captures every application log record, debug level included, emitted
+    while it is handled. The header is ignored for everybody else.
+    With "response", JSON responses are wrapped as {"result": ..., "trace": [...]};
+    with "file" (and for other responses), the trace is written to a file
+    whose path is returned in the X-Trace-File header.
+    """
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        mode = request.headers.get(TRACE_HEADER, "").lower()
+        if not settings.REQUEST_TRACING_ENABLED or mode not in ("response", "file"):
+            return await call_next(request)
+        if not await is_trace_admin(request):
+            return await call_next(request)
+
+        token = start_trace()
+        try:
+            response = await call_next(request)
+            body = b"".join([chunk async for chunk in response.body_iterator])
+        finally:
+            records = stop_trace(token)
+
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in ("content-length", "content-type")
+        }
+        media_type = response.media_type or response.headers.get("content-type")
+        if mode == "response" and media_type and media_type.startswith("application/json"):
+            result = json.loads(body) if body else None
+            return Response(
+                content=json.dumps({"result": result, "trace": records}),
+                status_code=response.status_code,
+                headers=headers,
+                media_type="application/json"
+            )
+
+        headers[TRACE_FILE_HEADER] = write_trace_file(request, records)
+        logger.info("Trace of %s %s written to %s", request.method, request.url.path, headers[TRACE_FILE_HEADER])
+        return Response(content=body, status_code=response.status_code, headers=headers, media_type=media_type)
@@ -1,46 +1,158 @@
-from sqlalchemy import create_engine
+from typing import Any, AsyncIterator, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.exceptions import HTTPException
 
 from app.core.config import settings
 from app.core.logging_config import get_logger
 
 logger = get_logger("db")
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL, 
-    echo=settings.DEBUG,
-    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
-)
+# Async drivers used by the API for each database backend
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def async_database_url(database_url: str) -> str:
+    """Switch a database URL to the async driver of its backend, e.g. sqlite:// to sqlite+aiosqlite://."""
+    url = make_url(database_url)
+    backend = "postgresql" if url.get_backend_name() in ("postgres", "postgresql") else url.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        return database_url
+    return url.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    Keyword arguments of create_engine/create_async_engine for a database URL.
+
+    Pooled engines get the pool settings; in-memory SQLite keeps its default
+    single-connection pool. Postgres connections get the statement timeout.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    driver = url.get_driver_name()
+    options: Dict[str, Any] = {"echo": settings.DEBUG}
+
+    if backend == "sqlite":
+        if driver == "pysqlite":
+            options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            return options
+        if driver == "aiosqlite":
+            # aiosqlite defaults to opening a connection, and its thread, per session
+            options["poolclass"] = AsyncAdaptedQueuePool
+    elif backend in ("postgres", "postgresql") and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        if driver == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING
+    )
+    return options
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """SQLite pragmas from the settings, by name."""
+    pragmas = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+    return {name: value for name, value in pragmas.items() if value not in (None, "")}
+
+
+def set_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """
+    Set pragmas on every new connection of a SQLite engine.
+
+    In WAL mode readers don't block on a writer and a writer doesn't block
+    on readers; busy_timeout makes a second writer wait instead of failing
+    with "database is locked".
+
+    Args:
+        engine: SQLite engine, the sync_engine of an async engine
+        pragmas: Pragma values by name
+    """
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+# Synchronous engine, for scripts and tooling that run outside the API
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 
 # Create sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used by the API, so queries don't block the event loop
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    **engine_options(async_database_url(settings.DATABASE_URL))
+)
+
+if engine.dialect.name == "sqlite":
+    set_sqlite_pragmas(engine, sqlite_pragmas())
+    set_sqlite_pragmas(async_engine.sync_engine, sqlite_pragmas())
+
+# Objects stay loaded after commit: an expired attribute can't be reloaded lazily
+# outside of an awaited call
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create a base class for declarative models
 Base = declarative_base()
 
 
 # Dependency for FastAPI routes to get database session
-def get_db_session() -> Session:
+async def get_db_session() -> AsyncIterator[AsyncSession]:
     """Get a database session.
+
+    HTTP errors raised by the endpoint (404, 304 Not Modified, ...) are
+    answers, not database errors: they aren't logged, and whatever the
+    endpoint left uncommitted is discarded when the session closes.
     
     Yields:
-        SQLAlchemy Session
+        SQLAlchemy AsyncSession
     """
-    session = SessionLocal()
-    try:
-        yield session
-        session.commit()
-    except Exception as e:
-        session.rollback()
-        logger.error(f"Database session error: {str(e)}")
-        raise
-    finally:
-        session.close()
-
-
-def init_db() -> None:
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except HTTPException:
+            raise
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Database session error: {str(e)}")
+            raise
+
+
+async def init_db() -> None:
     """Initialize the database with all tables."""
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database initialized.") 
\ No newline at end of file
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    logger.info("Database initialized.")
+
+
+async def close_db() -> None:
+    """Close the pooled connections of the async engine."""
+    await async_engine.dispose()
+    logger.info("Database connections closed.")
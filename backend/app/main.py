@@ -1,9 +1,18 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from app.core.compression import CompressionMiddleware
+from app.core.conditional import ETagMiddleware
 from app.core.config import settings
+from app.core.encoding import FastJSONResponse
 from app.core.logging_config import setup_logging
-from app.db import init_db, get_db_session
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.tracing import RequestTraceMiddleware
+from app.db import close_db, init_db, get_db_session
+from app.services.projection_snapshots import snapshot_worker
+from app.services.withdrawal_optimizer import shutdown_process_pool, start_process_pool
 
 # Import routers
 from app.routers import auth, family
@@ -18,6 +27,7 @@ app = FastAPI(
     title=settings.APP_NAME,
     description=f"{settings.APP_NAME} API - A wealth management application for Canadian financial planning",
     version="0.1.0",
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS
@@ -33,8 +43,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "X-Snapshot"],
 )
 
+# ETags of list and projection responses (see app.routers.conditional)
+app.add_middleware(ETagMiddleware)
+
+# Opt-in per-request tracing
+app.add_middleware(RequestTraceMiddleware)
+
+# Compression of large bodies, outside tracing so that traced bodies are read uncompressed
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+)
+
+# Request counts, latency and errors per route, outermost so tracing is measured too
+app.add_middleware(MetricsMiddleware)
+
 
 # Root endpoint
 @app.get("/")
@@ -49,9 +77,21 @@ async def health_check():
 
 # Event handlers
 @app.on_event("startup")
-def on_startup():
+async def on_startup():
     # Initialize the database tables
-    init_db()
+    await init_db()
+    # Recompute projection snapshots in the background after writes
+    snapshot_worker.start()
+    # Worker processes of the withdrawal optimizer
+    start_process_pool()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await snapshot_worker.stop()
+    shutdown_process_pool()
+    # Pooled connections keep aiosqlite threads alive until closed
+    await close_db()
 
 
 # Include routers
@@ -71,6 +111,11 @@ app.include_router(scenarios, prefix=settings.API_PREFIX, tags=["scenarios"])
 async def health_check():
     return {"status": "healthy"}
 
+# Prometheus metrics
+@app.get("/api/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Add a development setup endpoint to create a test user if needed
 @app.get("/api/dev-setup", tags=["Development"])
 async def dev_setup(db=Depends(get_db_session)):
@@ -79,28 +124,29 @@ async def dev_setup(db=Depends(get_db_session)):
     This should be disabled in production.
     """
     if settings.DEBUG:
+        from sqlalchemy import select
         from app.models.user import User
-        from app.core.security import get_password_hash
+        from app.core.security import get_password_hash_async
         from app.services.scenario_service import ensure_default_scenario
         
         # Check if test user exists
-        test_user = db.query(User).filter(User.email == "test@example.com").first()
+        test_user = await db.scalar(select(User).where(User.email == "test@example.com"))
         
         if not test_user:
             # Create a test user
             test_user = User(
                 email="test@example.com",
-                hashed_password=get_password_hash("password123"),
+                hashed_password=await get_password_hash_async("password123"),
                 first_name="Test",
                 last_name="User",
                 is_active=True
             )
             db.add(test_user)
-            db.commit()
-            db.refresh(test_user)
+            await db.commit()
+            await db.refresh(test_user)
         
         # Ensure the default scenario exists for this user
-        default_scenario = ensure_default_scenario(db, test_user.id)
+        default_scenario = await ensure_default_scenario(db, test_user.id)
             
         return {
             "message": "Development setup completed successfully", 
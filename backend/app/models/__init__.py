@@ -12,6 +12,7 @@ from app.models.finance import (
 )
 from app.models.insurance import InsurancePolicy, InsuranceType
 from app.models.scenario import Scenario
+from app.models.projection_snapshot import ProjectionSnapshot
 
 # Import all models here to make them available when importing from app.models
 __all__ = [
@@ -28,4 +29,5 @@ __all__ = [
     "ExpenseType",
     "InsuranceType",
     "Scenario",
+    "ProjectionSnapshot",
 ] 
\ No newline at end of file
@@ -0,0 +1,34 @@
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, LargeBinary, Text, UniqueConstraint
+from datetime import datetime
+
+from app.db import Base
+
+
+class ProjectionSnapshot(Base):
+    """
+    Materialized columnar projection of a user's household for one scenario
+    and parameter set, recomputed in the background after household writes.
+    """
+    __tablename__ = "projection_snapshots"
+    __table_args__ = (UniqueConstraint("user_id", "parameters_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    scenario_id = Column(Integer, ForeignKey("scenarios.id"), nullable=True)
+
+    # Hash of the scenario and parameters, and the parameters as JSON
+    parameters_key = Column(String(64), nullable=False)
+    parameters = Column(Text, nullable=False)
+
+    # Year series as zlib-compressed float arrays, and the
+    # member, account and death benefit details as JSON
+    series = Column(LargeBinary, nullable=False)
+    details = Column(Text, nullable=False)
+
+    # The projection depends on the current year as well as on the household
+    current_year = Column(Integer, nullable=False)
+    is_stale = Column(Boolean, default=False, nullable=False)
+    computed_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ProjectionSnapshot user={self.user_id} scenario={self.scenario_id} key={self.parameters_key[:8]}>"
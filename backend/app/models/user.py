@@ -15,6 +15,10 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     date_of_birth = Column(Date, nullable=True)
     is_active = Column(Boolean, default=True)
+
+    # Bumped in the transaction of every write to the user's household, so
+    # that every process sees the same revision (see household_revision)
+    household_revision = Column(Integer, default=0, server_default="0", nullable=False)
     
     # Relationships
     family_members = relationship("FamilyMember", back_populates="user")
@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
+from app.core.pagination import ListParams, list_page, list_params
 from app.db import get_db_session
 from app.models import Asset
-from app.schemas import AssetCreate, Asset as AssetRead, AssetUpdate
+from app.schemas import (
+    BulkDeleteRequest,
+    BulkRequest,
+    AssetCreate,
+    Asset as AssetRead,
+    AssetUpdate,
+    AssetBulkUpdate
+)
 from app.routers.auth import get_current_user
+from app.routers.conditional import conditional_request
+from app.services.bulk_crud import bulk_delete, bulk_insert, bulk_update, find_missing_ids
+from app.services.household_revision import commit_household_write
 from app.schemas import User
 
 
@@ -13,9 +25,9 @@ router = APIRouter()
 
 
 @router.post("/assets", response_model=AssetRead)
-def create_asset(
+async def create_asset(
     payload: AssetCreate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new asset."""
@@ -31,31 +43,83 @@ def create_asset(
         notes=payload.notes
     )
     db.add(db_asset)
-    db.commit()
-    db.refresh(db_asset)
+    await commit_household_write(db, current_user.id)
+    await db.refresh(db_asset)
     return db_asset
 
 
-@router.get("/assets", response_model=List[AssetRead])
-def list_assets(
-    db: Session = Depends(get_db_session),
+@router.post("/assets/bulk", response_model=List[AssetRead])
+async def create_assets_bulk(
+    payload: BulkRequest[AssetCreate],
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all assets."""
-    return db.query(Asset).filter(Asset.user_id == current_user.id).all()
+    """Create several assets in one transaction."""
+    assets = await bulk_insert(db, Asset, current_user.id, [item.model_dump() for item in payload.items])
+    await commit_household_write(db, current_user.id)
+    return assets
+
+
+@router.put("/assets/bulk", response_model=List[AssetRead])
+async def update_assets_bulk(
+    payload: BulkRequest[AssetBulkUpdate],
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Update several assets in one transaction; only the fields set on each item change."""
+    missing = await find_missing_ids(db, Asset, current_user.id, [item.id for item in payload.items])
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Assets not found: {missing}"
+        )
+
+    assets = await bulk_update(db, Asset, [item.model_dump(exclude_unset=True) for item in payload.items])
+    await commit_household_write(db, current_user.id)
+    return assets
+
+
+@router.post("/assets/bulk/delete", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_assets_bulk(
+    payload: BulkDeleteRequest,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete several assets in one transaction."""
+    missing = await find_missing_ids(db, Asset, current_user.id, payload.ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Assets not found: {missing}"
+        )
+
+    await bulk_delete(db, Asset, current_user.id, payload.ids)
+    await commit_household_write(db, current_user.id)
+    return None
+
+
+@router.get("/assets", response_model=List[AssetRead], dependencies=[Depends(conditional_request)])
+async def list_assets(
+    response: Response,
+    params: ListParams = Depends(list_params),
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a page of assets ordered by id."""
+    return await list_page(db, Asset, AssetRead, [Asset.user_id == current_user.id], params, response)
 
 
 @router.get("/assets/{asset_id}", response_model=AssetRead)
-def get_asset(
+async def get_asset(
     asset_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific asset by ID."""
-    asset = db.query(Asset).filter(
+    asset = await db.scalar(select(Asset).where(
         Asset.id == asset_id,
         Asset.user_id == current_user.id
-    ).first()
+    ))
     
     if not asset:
         raise HTTPException(
@@ -67,17 +131,17 @@ def get_asset(
 
 
 @router.put("/assets/{asset_id}", response_model=AssetRead)
-def update_asset(
+async def update_asset(
     asset_id: int,
     payload: AssetUpdate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Update an asset."""
-    asset = db.query(Asset).filter(
+    asset = await db.scalar(select(Asset).where(
         Asset.id == asset_id,
         Asset.user_id == current_user.id
-    ).first()
+    ))
     
     if not asset:
         raise HTTPException(
@@ -91,30 +155,30 @@ def update_asset(
     
     # If setting a new asset as primary residence, unset any other primary residences
     if payload.is_primary_residence:
-        primary_residences = db.query(Asset).filter(
+        primary_residences = (await db.scalars(select(Asset).where(
             Asset.user_id == current_user.id,
             Asset.is_primary_residence == True,
             Asset.id != asset_id
-        ).all()
+        ))).all()
         for residence in primary_residences:
             residence.is_primary_residence = False
     
-    db.commit()
-    db.refresh(asset)
+    await commit_household_write(db, current_user.id)
+    await db.refresh(asset)
     return asset
 
 
 @router.delete("/assets/{asset_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_asset(
+async def delete_asset(
     asset_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Delete an asset."""
-    asset = db.query(Asset).filter(
+    asset = await db.scalar(select(Asset).where(
         Asset.id == asset_id,
         Asset.user_id == current_user.id
-    ).first()
+    ))
     
     if not asset:
         raise HTTPException(
@@ -122,6 +186,6 @@ def delete_asset(
             detail="Asset not found"
         )
     
-    db.delete(asset)
-    db.commit()
+    await db.delete(asset)
+    await commit_household_write(db, current_user.id)
     return None 
\ No newline at end of file
@@ -1,16 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from typing import Any, Dict
 
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.security import create_access_token, get_password_hash_async, verify_and_update_password_async
 from app.db import get_db_session
 from app.models.user import User
 from app.schemas.user import Token, TokenPayload, UserCreate, User as UserSchema
 from app.core.logging_config import get_logger
+from app.services.auth_cache import auth_cache
 from app.services.scenario_service import ensure_default_scenario
 
 logger = get_logger("auth")
@@ -20,25 +22,48 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PREFIX}/auth/login")
 
 
-def get_user_by_email(db: Session, email: str) -> User:
+async def get_user_by_email(db: AsyncSession, email: str) -> User:
     """Get a user by email."""
-    return db.query(User).filter(User.email == email).first()
+    return await db.scalar(select(User).where(User.email == email))
 
 
-def authenticate_user(db: Session, email: str, password: str) -> User:
-    """Authenticate a user by email and password."""
-    user = get_user_by_email(db, email)
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> User:
+    """Authenticate a user by email and password.
+
+    A password hashed with an outdated cost factor is rehashed and saved.
+    """
+    user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        await db.commit()
+        logger.info(f"Rehashed the password of user {user.id}")
     return user
 
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db_session)
-) -> User:
-    """Get the current user from the token."""
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db_session)
+) -> UserSchema:
+    """Get the current user from the token.
+
+    The user is resolved once per request, and validated tokens are cached
+    so that later requests skip decoding the token and loading the user.
+    """
+    current_user = getattr(request.state, "current_user", None)
+    if current_user is not None:
+        return current_user
+
+    current_user = auth_cache.get(token)
+    if current_user is not None:
+        request.state.current_user = current_user
+        return current_user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -56,19 +81,24 @@ async def get_current_user(
         logger.error("JWT validation error")
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == token_data.sub).first()
+    # Read the revision before loading, so a concurrent change makes the snapshot stale
+    revision = auth_cache.revision(token_data.sub)
+    user = await db.get(User, token_data.sub)
     if user is None:
         logger.error(f"User ID {token_data.sub} not found")
         raise credentials_exception
     
-    return user
+    current_user = UserSchema.model_validate(user)
+    auth_cache.put(token, current_user, revision, expires_at=payload.get("exp"))
+    request.state.current_user = current_user
+    return current_user
 
 
 @router.post("/register", response_model=UserSchema)
-def register(user_in: UserCreate, db: Session = Depends(get_db_session)) -> Any:
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db_session)) -> Any:
     """Register a new user."""
     # Check if user already exists
-    user = get_user_by_email(db, user_in.email)
+    user = await get_user_by_email(db, user_in.email)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -81,26 +111,26 @@ def register(user_in: UserCreate, db: Session = Depends(get_db_session)) -> Any:
         first_name=user_in.first_name,
         last_name=user_in.last_name,
         date_of_birth=user_in.date_of_birth,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     # Create default scenario for the new user
-    ensure_default_scenario(db, db_user.id)
+    await ensure_default_scenario(db, db_user.id)
     
     logger.info(f"User {user_in.email} registered successfully")
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
 ) -> Any:
     """Login with username and password."""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         logger.warning(f"Failed login attempt for {form_data.username}")
         raise HTTPException(
@@ -120,6 +150,6 @@ def login(
 
 
 @router.get("/me", response_model=UserSchema)
-def read_users_me(current_user: User = Depends(get_current_user)) -> Any:
+async def read_users_me(current_user: UserSchema = Depends(get_current_user)) -> Any:
     """Get current user information."""
     return current_user 
\ No newline at end of file
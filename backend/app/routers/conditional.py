@@ -0,0 +1,52 @@
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.conditional import ETAG_STATE_KEY, etag_matches, household_etag
+from app.db import get_db_session
+from app.routers.auth import get_current_user
+from app.schemas import User
+from app.services.household_revision import load_household_revision
+
+
+async def check_not_modified(request: Request, db: AsyncSession, user_id: int) -> str:
+    """
+    Tag a response computed from a user's household, or answer 304 Not Modified.
+
+    The tag derives from the household revision stored with the user and
+    from the request (path, query, Accept and body), so an unchanged reload
+    is answered after a single primary key lookup, before any projection is
+    computed, whichever process handled the writes.
+
+    Args:
+        request: The request
+        db: Database session
+        user_id: ID of the user owning the household
+
+    Returns:
+        The entity tag, added to the response by ETagMiddleware
+
+    Raises:
+        HTTPException: 304 when If-None-Match holds the tag
+    """
+    etag = household_etag(
+        user_id,
+        await load_household_revision(db, user_id),
+        request.method,
+        request.url.path,
+        request.url.query,
+        request.headers.get("accept"),
+        await request.body()
+    )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    setattr(request.state, ETAG_STATE_KEY, etag)
+    return etag
+
+
+async def conditional_request(
+    request: Request,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+) -> str:
+    """Dependency applying `check_not_modified` to the current user's request."""
+    return await check_not_modified(request, db, current_user.id)
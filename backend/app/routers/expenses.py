@@ -1,21 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
+from app.core.pagination import ListParams, list_page, list_params
 from app.db import get_db_session
 from app.models import Expense
-from app.schemas import ExpenseCreate, Expense as ExpenseRead, ExpenseUpdate, ExpenseCopyRequest
+from app.schemas import (
+    BulkDeleteRequest,
+    BulkRequest,
+    ExpenseCreate,
+    Expense as ExpenseRead,
+    ExpenseUpdate,
+    ExpenseBulkUpdate,
+    ExpenseCopyRequest,
+    ExpenseBulkCopyRequest
+)
 from app.routers.auth import get_current_user
+from app.routers.conditional import conditional_request
+from app.services.bulk_crud import bulk_delete, bulk_insert, bulk_update, find_missing_ids
+from app.services.expense_copy import copy_expenses
+from app.services.household_revision import commit_household_write
 from app.schemas import User
+from app.core.logging_config import get_logger
 
+logger = get_logger("expenses")
 
 router = APIRouter()
 
 
 @router.post("/expenses", response_model=ExpenseRead)
-def create_expense(
+async def create_expense(
     payload: ExpenseCreate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new expense."""
@@ -35,11 +52,11 @@ def create_expense(
             family_member_id=payload.family_member_id
         )
         db.add(expense)
-        db.commit()
-        db.refresh(expense)
+        await commit_household_write(db, current_user.id)
+        await db.refresh(expense)
         return expense
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error creating expense: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -47,42 +64,94 @@ def create_expense(
         )
 
 
-@router.get("/expenses", response_model=List[ExpenseRead])
-def list_expenses(
+@router.post("/expenses/bulk", response_model=List[ExpenseRead])
+async def create_expenses_bulk(
+    payload: BulkRequest[ExpenseCreate],
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Create several expenses in one transaction."""
+    expenses = await bulk_insert(db, Expense, current_user.id, [item.model_dump() for item in payload.items])
+    await commit_household_write(db, current_user.id)
+    return expenses
+
+
+@router.put("/expenses/bulk", response_model=List[ExpenseRead])
+async def update_expenses_bulk(
+    payload: BulkRequest[ExpenseBulkUpdate],
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Update several expenses in one transaction; only the fields set on each item change."""
+    missing = await find_missing_ids(db, Expense, current_user.id, [item.id for item in payload.items])
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Expenses not found: {missing}"
+        )
+
+    expenses = await bulk_update(db, Expense, [item.model_dump(exclude_unset=True) for item in payload.items])
+    await commit_household_write(db, current_user.id)
+    return expenses
+
+
+@router.post("/expenses/bulk/delete", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_expenses_bulk(
+    payload: BulkDeleteRequest,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete several expenses in one transaction."""
+    missing = await find_missing_ids(db, Expense, current_user.id, payload.ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Expenses not found: {missing}"
+        )
+
+    await bulk_delete(db, Expense, current_user.id, payload.ids)
+    await commit_household_write(db, current_user.id)
+    return None
+
+
+@router.get("/expenses", response_model=List[ExpenseRead], dependencies=[Depends(conditional_request)])
+async def list_expenses(
+    response: Response,
     family_member_id: Optional[int] = None,
     expense_type: Optional[str] = None,
     year: Optional[int] = None,
-    db: Session = Depends(get_db_session),
+    params: ListParams = Depends(list_params),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all expenses, with optional filters."""
-    query = db.query(Expense).filter(Expense.user_id == current_user.id)
+    """Get a page of expenses ordered by id, with optional filters and fieldset."""
+    conditions = [Expense.user_id == current_user.id]
     
     if family_member_id:
-        query = query.filter(Expense.family_member_id == family_member_id)
+        conditions.append(Expense.family_member_id == family_member_id)
     
     if expense_type:
-        query = query.filter(Expense.expense_type == expense_type)
+        conditions.append(Expense.expense_type == expense_type)
     
     if year:
         # Filter expenses that are active in the given year (start_year <= year and (end_year is None or end_year >= year))
-        query = query.filter(Expense.start_year <= year)
-        query = query.filter((Expense.end_year.is_(None)) | (Expense.end_year >= year))
+        conditions.append(Expense.start_year <= year)
+        conditions.append((Expense.end_year.is_(None)) | (Expense.end_year >= year))
     
-    return query.all()
+    return await list_page(db, Expense, ExpenseRead, conditions, params, response)
 
 
 @router.get("/expenses/{expense_id}", response_model=ExpenseRead)
-def get_expense(
+async def get_expense(
     expense_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific expense by ID."""
-    expense = db.query(Expense).filter(
+    expense = await db.scalar(select(Expense).where(
         Expense.id == expense_id,
         Expense.user_id == current_user.id
-    ).first()
+    ))
     
     if not expense:
         raise HTTPException(
@@ -94,17 +163,17 @@ def get_expense(
 
 
 @router.put("/expenses/{expense_id}", response_model=ExpenseRead)
-def update_expense(
+async def update_expense(
     expense_id: int,
     payload: ExpenseUpdate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Update an expense."""
-    expense = db.query(Expense).filter(
+    expense = await db.scalar(select(Expense).where(
         Expense.id == expense_id,
         Expense.user_id == current_user.id
-    ).first()
+    ))
     
     if not expense:
         raise HTTPException(
@@ -116,22 +185,22 @@ def update_expense(
     for field, value in payload.dict(exclude_unset=True).items():
         setattr(expense, field, value)
     
-    db.commit()
-    db.refresh(expense)
+    await commit_household_write(db, current_user.id)
+    await db.refresh(expense)
     return expense
 
 
 @router.delete("/expenses/{expense_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_expense(
+async def delete_expense(
     expense_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Delete an expense."""
-    expense = db.query(Expense).filter(
+    expense = await db.scalar(select(Expense).where(
         Expense.id == expense_id,
         Expense.user_id == current_user.id
-    ).first()
+    ))
     
     if not expense:
         raise HTTPException(
@@ -139,23 +208,23 @@ def delete_expense(
             detail="Expense not found"
         )
     
-    db.delete(expense)
-    db.commit()
+    await db.delete(expense)
+    await commit_household_write(db, current_user.id)
     return None
 
 
 @router.post("/expenses/{expense_id}/copy", response_model=List[ExpenseRead])
-def copy_expense_to_years(
+async def copy_expense_to_years(
     expense_id: int,
     payload: ExpenseCopyRequest,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
-    """Copy an expense to multiple years."""
-    source_expense = db.query(Expense).filter(
+    """Copy an expense to multiple years, skipping the year it already starts in."""
+    source_expense = await db.scalar(select(Expense.id).where(
         Expense.id == expense_id,
         Expense.user_id == current_user.id
-    ).first()
+    ))
     
     if not source_expense:
         raise HTTPException(
@@ -163,32 +232,53 @@ def copy_expense_to_years(
             detail="Source expense not found"
         )
     
-    new_expenses = []
-    for year in payload.target_years:
-        # Ensure we're not creating a duplicate for the existing expense's year
-        if source_expense.start_year == year:
-            continue
-            
-        # Create a new expense for each target year
-        new_expense = Expense(
-            user_id=current_user.id,
-            name=source_expense.name,
-            expense_type=source_expense.expense_type,
-            amount=payload.adjust_amount if payload.adjust_amount is not None else source_expense.amount,
-            start_year=year,
-            end_year=payload.end_year,
-            expected_growth_rate=source_expense.expected_growth_rate,
-            is_tax_deductible=source_expense.is_tax_deductible,
-            notes=source_expense.notes,
-            family_member_id=source_expense.family_member_id
+    new_expenses = await copy_expenses(
+        db,
+        current_user.id,
+        payload.target_years,
+        expense_ids=[expense_id],
+        adjust_amount=payload.adjust_amount,
+        end_year=payload.end_year
+    )
+    await commit_household_write(db, current_user.id)
+    return new_expenses
+
+
+@router.post("/expenses/copy", response_model=List[ExpenseRead])
+async def copy_expenses_to_years(
+    payload: ExpenseBulkCopyRequest,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Copy a set of expenses to multiple years in one statement.
+
+    The expenses are selected by id, category and/or the year they are active
+    in; each one is copied to every target year except the one it starts in.
+    """
+    if payload.expense_ids is None and payload.category is None and payload.year is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="One of expense_ids, category or year is required"
         )
-        db.add(new_expense)
-        new_expenses.append(new_expense)
-    
-    db.commit()
-    
-    # Refresh all new expenses
-    for expense in new_expenses:
-        db.refresh(expense)
-    
-    return new_expenses 
\ No newline at end of file
+
+    if payload.expense_ids:
+        missing = await find_missing_ids(db, Expense, current_user.id, payload.expense_ids)
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Expenses not found: {missing}"
+            )
+
+    new_expenses = await copy_expenses(
+        db,
+        current_user.id,
+        payload.target_years,
+        expense_ids=payload.expense_ids,
+        category=payload.category,
+        year=payload.year,
+        adjust_amount=payload.adjust_amount,
+        end_year=payload.end_year
+    )
+    await commit_household_write(db, current_user.id)
+    return new_expenses
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Any, List
 
+from app.core.pagination import ListParams, list_page, list_params
 from app.db import get_db_session
-from app.models.user import User
+from app.schemas import User
 from app.models.family import FamilyMember
 from app.schemas.family import (
     FamilyMember as FamilyMemberSchema,
@@ -12,26 +14,35 @@ from app.schemas.family import (
     FamilyMemberList
 )
 from app.routers.auth import get_current_user
+from app.routers.conditional import conditional_request
+from app.services.household_revision import commit_household_write
 from app.core.logging_config import get_logger
 
 logger = get_logger("family")
 
 router = APIRouter(prefix="/family", tags=["family"])
 
+# Calculated fields of a family member, with the columns they are computed from
+CALCULATED_FIELDS = {
+    "age": ("date_of_birth",),
+    "retirement_year": ("date_of_birth", "expected_retirement_age"),
+    "death_year": ("date_of_birth", "expected_death_age"),
+}
+
 
 @router.post("", response_model=FamilyMemberSchema)
-def create_family_member(
+async def create_family_member(
     family_member_in: FamilyMemberCreate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ) -> Any:
     """Create a new family member."""
     # Check if it's marked as primary and other members exist
     if family_member_in.is_primary:
-        existing_primary = db.query(FamilyMember).filter(
+        existing_primary = await db.scalar(select(FamilyMember).where(
             FamilyMember.user_id == current_user.id,
             FamilyMember.is_primary == True
-        ).first()
+        ))
         
         if existing_primary:
             raise HTTPException(
@@ -51,37 +62,38 @@ def create_family_member(
         expected_death_age=family_member_in.expected_death_age,
     )
     db.add(db_family_member)
-    db.commit()
-    db.refresh(db_family_member)
+    await commit_household_write(db, current_user.id)
+    await db.refresh(db_family_member)
     
     logger.info(f"Family member {db_family_member.id} created for user {current_user.id}")
     return db_family_member
 
 
-@router.get("", response_model=List[FamilyMemberSchema])
-def get_family_members(
-    db: Session = Depends(get_db_session),
+@router.get("", response_model=List[FamilyMemberSchema], dependencies=[Depends(conditional_request)])
+async def get_family_members(
+    response: Response,
+    params: ListParams = Depends(list_params),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ) -> Any:
-    """Get all family members for the current user."""
-    family_members = db.query(FamilyMember).filter(
-        FamilyMember.user_id == current_user.id
-    ).all()
-    
-    return family_members
+    """Get a page of the current user's family members ordered by id."""
+    return await list_page(
+        db, FamilyMember, FamilyMemberSchema, [FamilyMember.user_id == current_user.id], params, response,
+        calculated=CALCULATED_FIELDS
+    )
 
 
 @router.get("/{family_member_id}", response_model=FamilyMemberSchema)
-def get_family_member(
+async def get_family_member(
     family_member_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ) -> Any:
     """Get a specific family member by ID."""
-    family_member = db.query(FamilyMember).filter(
+    family_member = await db.scalar(select(FamilyMember).where(
         FamilyMember.id == family_member_id,
         FamilyMember.user_id == current_user.id
-    ).first()
+    ))
     
     if not family_member:
         raise HTTPException(
@@ -93,17 +105,17 @@ def get_family_member(
 
 
 @router.put("/{family_member_id}", response_model=FamilyMemberSchema)
-def update_family_member(
+async def update_family_member(
     family_member_id: int,
     family_member_in: FamilyMemberUpdate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ) -> Any:
     """Update a family member."""
-    family_member = db.query(FamilyMember).filter(
+    family_member = await db.scalar(select(FamilyMember).where(
         FamilyMember.id == family_member_id,
         FamilyMember.user_id == current_user.id
-    ).first()
+    ))
     
     if not family_member:
         raise HTTPException(
@@ -114,11 +126,11 @@ def update_family_member(
     # Check primary status change
     if family_member_in.is_primary is not None and family_member_in.is_primary and not family_member.is_primary:
         # User is trying to set this member as primary
-        existing_primary = db.query(FamilyMember).filter(
+        existing_primary = await db.scalar(select(FamilyMember).where(
             FamilyMember.user_id == current_user.id,
             FamilyMember.is_primary == True,
             FamilyMember.id != family_member_id
-        ).first()
+        ))
         
         if existing_primary:
             raise HTTPException(
@@ -131,24 +143,24 @@ def update_family_member(
     for field, value in update_data.items():
         setattr(family_member, field, value)
     
-    db.commit()
-    db.refresh(family_member)
+    await commit_household_write(db, current_user.id)
+    await db.refresh(family_member)
     
     logger.info(f"Family member {family_member.id} updated for user {current_user.id}")
     return family_member
 
 
 @router.delete("/{family_member_id}")
-def delete_family_member(
+async def delete_family_member(
     family_member_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ) -> Any:
     """Delete a family member."""
-    family_member = db.query(FamilyMember).filter(
+    family_member = await db.scalar(select(FamilyMember).where(
         FamilyMember.id == family_member_id,
         FamilyMember.user_id == current_user.id
-    ).first()
+    ))
     
     if not family_member:
         raise HTTPException(
@@ -159,8 +171,8 @@ def delete_family_member(
     # TODO: Check if there are any related records (investments, income, etc.)
     # that would prevent deletion
     
-    db.delete(family_member)
-    db.commit()
+    await db.delete(family_member)
+    await commit_household_write(db, current_user.id)
     
     logger.info(f"Family member {family_member_id} deleted for user {current_user.id}")
     return None 
\ No newline at end of file
@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
+from app.core.pagination import ListParams, list_page, list_params
 from app.db import get_db_session
 from app.models import IncomeSource
-from app.schemas import IncomeSourceCreate, IncomeSource as IncomeSourceRead, IncomeSourceUpdate
+from app.schemas import (
+    BulkDeleteRequest,
+    BulkRequest,
+    IncomeSourceCreate,
+    IncomeSource as IncomeSourceRead,
+    IncomeSourceUpdate,
+    IncomeSourceBulkUpdate
+)
 from app.routers.auth import get_current_user
+from app.routers.conditional import conditional_request
+from app.services.bulk_crud import bulk_delete, bulk_insert, bulk_update, find_missing_ids
+from app.services.household_revision import commit_household_write
 from app.schemas import User
 
 
@@ -13,9 +25,9 @@ router = APIRouter()
 
 
 @router.post("/income-sources", response_model=IncomeSourceRead)
-def create_income_source(
+async def create_income_source(
     payload: IncomeSourceCreate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new income source."""
@@ -32,37 +44,93 @@ def create_income_source(
         notes=payload.notes
     )
     db.add(db_income)
-    db.commit()
-    db.refresh(db_income)
+    await commit_household_write(db, current_user.id)
+    await db.refresh(db_income)
     return db_income
 
 
-@router.get("/income-sources", response_model=List[IncomeSourceRead])
-def list_income_sources(
+@router.post("/income-sources/bulk", response_model=List[IncomeSourceRead])
+async def create_income_sources_bulk(
+    payload: BulkRequest[IncomeSourceCreate],
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Create several income sources in one transaction."""
+    income_sources = await bulk_insert(db, IncomeSource, current_user.id, [item.model_dump() for item in payload.items])
+    await commit_household_write(db, current_user.id)
+    return income_sources
+
+
+@router.put("/income-sources/bulk", response_model=List[IncomeSourceRead])
+async def update_income_sources_bulk(
+    payload: BulkRequest[IncomeSourceBulkUpdate],
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Update several income sources in one transaction; only the fields set on each item change."""
+    missing = await find_missing_ids(db, IncomeSource, current_user.id, [item.id for item in payload.items])
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Income sources not found: {missing}"
+        )
+
+    income_sources = await bulk_update(db, IncomeSource, [item.model_dump(exclude_unset=True) for item in payload.items])
+    await commit_household_write(db, current_user.id)
+    return income_sources
+
+
+@router.post("/income-sources/bulk/delete", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_income_sources_bulk(
+    payload: BulkDeleteRequest,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete several income sources in one transaction."""
+    missing = await find_missing_ids(db, IncomeSource, current_user.id, payload.ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Income sources not found: {missing}"
+        )
+
+    await bulk_delete(db, IncomeSource, current_user.id, payload.ids)
+    await commit_household_write(db, current_user.id)
+    return None
+
+
+@router.get(
+    "/income-sources",
+    response_model=List[IncomeSourceRead],
+    dependencies=[Depends(conditional_request)]
+)
+async def list_income_sources(
+    response: Response,
     family_member_id: Optional[int] = None,
-    db: Session = Depends(get_db_session),
+    params: ListParams = Depends(list_params),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all income sources, optionally filtered by family member."""
-    query = db.query(IncomeSource).filter(IncomeSource.user_id == current_user.id)
+    """Get a page of income sources ordered by id, optionally filtered by family member."""
+    conditions = [IncomeSource.user_id == current_user.id]
     
     if family_member_id:
-        query = query.filter(IncomeSource.family_member_id == family_member_id)
+        conditions.append(IncomeSource.family_member_id == family_member_id)
     
-    return query.all()
+    return await list_page(db, IncomeSource, IncomeSourceRead, conditions, params, response)
 
 
 @router.get("/income-sources/{income_id}", response_model=IncomeSourceRead)
-def get_income_source(
+async def get_income_source(
     income_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific income source by ID."""
-    income = db.query(IncomeSource).filter(
+    income = await db.scalar(select(IncomeSource).where(
         IncomeSource.id == income_id,
         IncomeSource.user_id == current_user.id
-    ).first()
+    ))
     
     if not income:
         raise HTTPException(
@@ -74,17 +142,17 @@ def get_income_source(
 
 
 @router.put("/income-sources/{income_id}", response_model=IncomeSourceRead)
-def update_income_source(
+async def update_income_source(
     income_id: int,
     payload: IncomeSourceUpdate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Update an income source."""
-    income = db.query(IncomeSource).filter(
+    income = await db.scalar(select(IncomeSource).where(
         IncomeSource.id == income_id,
         IncomeSource.user_id == current_user.id
-    ).first()
+    ))
     
     if not income:
         raise HTTPException(
@@ -96,22 +164,22 @@ def update_income_source(
     for field, value in payload.dict(exclude_unset=True).items():
         setattr(income, field, value)
     
-    db.commit()
-    db.refresh(income)
+    await commit_household_write(db, current_user.id)
+    await db.refresh(income)
     return income
 
 
 @router.delete("/income-sources/{income_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_income_source(
+async def delete_income_source(
     income_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Delete an income source."""
-    income = db.query(IncomeSource).filter(
+    income = await db.scalar(select(IncomeSource).where(
         IncomeSource.id == income_id,
         IncomeSource.user_id == current_user.id
-    ).first()
+    ))
     
     if not income:
         raise HTTPException(
@@ -119,6 +187,6 @@ def delete_income_source(
             detail="Income source not found"
         )
     
-    db.delete(income)
-    db.commit()
+    await db.delete(income)
+    await commit_household_write(db, current_user.id)
     return None 
\ No newline at end of file
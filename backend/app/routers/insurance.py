@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
+from app.core.pagination import ListParams, list_page, list_params
 from app.db import get_db_session
 from app.models import InsurancePolicy
 from app.schemas import InsurancePolicyCreate, InsurancePolicy as InsurancePolicyRead, InsurancePolicyUpdate
 from app.routers.auth import get_current_user
+from app.routers.conditional import conditional_request
+from app.services.household_revision import commit_household_write
 from app.schemas import User
 
 
@@ -13,9 +17,9 @@ router = APIRouter()
 
 
 @router.post("/insurance-policies", response_model=InsurancePolicyRead)
-def create_insurance_policy(
+async def create_insurance_policy(
     payload: InsurancePolicyCreate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new insurance policy."""
@@ -36,41 +40,47 @@ def create_insurance_policy(
         notes=payload.notes
     )
     db.add(db_policy)
-    db.commit()
-    db.refresh(db_policy)
+    await commit_household_write(db, current_user.id)
+    await db.refresh(db_policy)
     return db_policy
 
 
-@router.get("/insurance-policies", response_model=List[InsurancePolicyRead])
-def list_insurance_policies(
+@router.get(
+    "/insurance-policies",
+    response_model=List[InsurancePolicyRead],
+    dependencies=[Depends(conditional_request)]
+)
+async def list_insurance_policies(
+    response: Response,
     family_member_id: Optional[int] = None,
     insurance_type: Optional[str] = None,
-    db: Session = Depends(get_db_session),
+    params: ListParams = Depends(list_params),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all insurance policies, optionally filtered by family member and type."""
-    query = db.query(InsurancePolicy).filter(InsurancePolicy.user_id == current_user.id)
+    """Get a page of insurance policies ordered by id, optionally filtered by family member and type."""
+    conditions = [InsurancePolicy.user_id == current_user.id]
     
     if family_member_id:
-        query = query.filter(InsurancePolicy.family_member_id == family_member_id)
+        conditions.append(InsurancePolicy.family_member_id == family_member_id)
     
     if insurance_type:
-        query = query.filter(InsurancePolicy.insurance_type == insurance_type)
+        conditions.append(InsurancePolicy.insurance_type == insurance_type)
     
-    return query.all()
+    return await list_page(db, InsurancePolicy, InsurancePolicyRead, conditions, params, response)
 
 
 @router.get("/insurance-policies/{policy_id}", response_model=InsurancePolicyRead)
-def get_insurance_policy(
+async def get_insurance_policy(
     policy_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific insurance policy by ID."""
-    policy = db.query(InsurancePolicy).filter(
+    policy = await db.scalar(select(InsurancePolicy).where(
         InsurancePolicy.id == policy_id,
         InsurancePolicy.user_id == current_user.id
-    ).first()
+    ))
     
     if not policy:
         raise HTTPException(
@@ -82,17 +92,17 @@ def get_insurance_policy(
 
 
 @router.put("/insurance-policies/{policy_id}", response_model=InsurancePolicyRead)
-def update_insurance_policy(
+async def update_insurance_policy(
     policy_id: int,
     payload: InsurancePolicyUpdate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Update an insurance policy."""
-    policy = db.query(InsurancePolicy).filter(
+    policy = await db.scalar(select(InsurancePolicy).where(
         InsurancePolicy.id == policy_id,
         InsurancePolicy.user_id == current_user.id
-    ).first()
+    ))
     
     if not policy:
         raise HTTPException(
@@ -104,22 +114,22 @@ def update_insurance_policy(
     for field, value in payload.dict(exclude_unset=True).items():
         setattr(policy, field, value)
     
-    db.commit()
-    db.refresh(policy)
+    await commit_household_write(db, current_user.id)
+    await db.refresh(policy)
     return policy
 
 
 @router.delete("/insurance-policies/{policy_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_insurance_policy(
+async def delete_insurance_policy(
     policy_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Delete an insurance policy."""
-    policy = db.query(InsurancePolicy).filter(
+    policy = await db.scalar(select(InsurancePolicy).where(
         InsurancePolicy.id == policy_id,
         InsurancePolicy.user_id == current_user.id
-    ).first()
+    ))
     
     if not policy:
         raise HTTPException(
@@ -127,6 +137,6 @@ def delete_insurance_policy(
             detail="Insurance policy not found"
         )
     
-    db.delete(policy)
-    db.commit()
+    await db.delete(policy)
+    await commit_household_write(db, current_user.id)
     return None 
\ No newline at end of file
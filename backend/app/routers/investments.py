@@ -1,25 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+import logging
 
+from app.core.pagination import ListParams, list_page, list_params
 from app.db import get_db_session
 from app.models import InvestmentAccount
 from app.schemas import (
     InvestmentAccountCreate, 
     InvestmentAccount as InvestmentAccountRead, 
-    InvestmentAccountUpdate
+    InvestmentAccountUpdate,
+    InvestmentAccountBulkUpdate,
+    BulkDeleteRequest,
+    BulkRequest
 )
 from app.routers.auth import get_current_user
+from app.routers.conditional import conditional_request
+from app.services.bulk_crud import bulk_delete, bulk_insert, bulk_update, find_missing_ids
+from app.services.household_revision import commit_household_write
 from app.schemas import User
+from app.core.logging_config import get_logger
 
+logger = get_logger("investments")
 
 router = APIRouter()
 
 
 @router.post("/investment-accounts", response_model=InvestmentAccountRead)
-def create_investment_account(
+async def create_investment_account(
     payload: InvestmentAccountCreate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new investment account."""
@@ -38,43 +49,102 @@ def create_investment_account(
         expected_conversion_year=payload.expected_conversion_year
     )
     db.add(db_investment)
-    db.commit()
-    db.refresh(db_investment)
+    await commit_household_write(db, current_user.id)
+    await db.refresh(db_investment)
     return db_investment
 
 
-@router.get("/investment-accounts", response_model=List[InvestmentAccountRead])
-def list_investment_accounts(
+@router.post("/investment-accounts/bulk", response_model=List[InvestmentAccountRead])
+async def create_investment_accounts_bulk(
+    payload: BulkRequest[InvestmentAccountCreate],
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Create several investment accounts in one transaction."""
+    accounts = await bulk_insert(db, InvestmentAccount, current_user.id, [item.model_dump() for item in payload.items])
+    await commit_household_write(db, current_user.id)
+    return accounts
+
+
+@router.put("/investment-accounts/bulk", response_model=List[InvestmentAccountRead])
+async def update_investment_accounts_bulk(
+    payload: BulkRequest[InvestmentAccountBulkUpdate],
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Update several investment accounts in one transaction; only the fields set on each item change."""
+    missing = await find_missing_ids(db, InvestmentAccount, current_user.id, [item.id for item in payload.items])
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Investment accounts not found: {missing}"
+        )
+
+    accounts = await bulk_update(db, InvestmentAccount, [item.model_dump(exclude_unset=True) for item in payload.items])
+    await commit_household_write(db, current_user.id)
+    return accounts
+
+
+@router.post("/investment-accounts/bulk/delete", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_investment_accounts_bulk(
+    payload: BulkDeleteRequest,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete several investment accounts in one transaction."""
+    missing = await find_missing_ids(db, InvestmentAccount, current_user.id, payload.ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Investment accounts not found: {missing}"
+        )
+
+    await bulk_delete(db, InvestmentAccount, current_user.id, payload.ids)
+    await commit_household_write(db, current_user.id)
+    return None
+
+
+@router.get(
+    "/investment-accounts",
+    response_model=List[InvestmentAccountRead],
+    dependencies=[Depends(conditional_request)]
+)
+async def list_investment_accounts(
+    response: Response,
     family_member_id: Optional[int] = None,
-    db: Session = Depends(get_db_session),
+    params: ListParams = Depends(list_params),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all investment accounts, optionally filtered by family member."""
-    query = db.query(InvestmentAccount).filter(InvestmentAccount.user_id == current_user.id)
+    """Get a page of investment accounts ordered by id, optionally filtered by family member."""
+    conditions = [InvestmentAccount.user_id == current_user.id]
     
     if family_member_id:
-        query = query.filter(InvestmentAccount.family_member_id == family_member_id)
+        conditions.append(InvestmentAccount.family_member_id == family_member_id)
     
-    accounts = query.all()
+    accounts = await list_page(
+        db, InvestmentAccount, InvestmentAccountRead, conditions, params, response
+    )
     
-    # Debug logging to see account types
-    for account in accounts:
-        print(f"Account ID: {account.id}, Name: {account.name}, Type: {account.account_type}")
+    # Debug logging to see account types (a fieldset response is already encoded)
+    if params.fields is None and logger.isEnabledFor(logging.DEBUG):
+        for account in accounts:
+            logger.debug("Account ID: %s, Name: %s, Type: %s", account.id, account.name, account.account_type)
         
     return accounts
 
 
 @router.get("/investment-accounts/{investment_id}", response_model=InvestmentAccountRead)
-def get_investment_account(
+async def get_investment_account(
     investment_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific investment account by ID."""
-    investment = db.query(InvestmentAccount).filter(
+    investment = await db.scalar(select(InvestmentAccount).where(
         InvestmentAccount.id == investment_id,
         InvestmentAccount.user_id == current_user.id
-    ).first()
+    ))
     
     if not investment:
         raise HTTPException(
@@ -86,17 +156,17 @@ def get_investment_account(
 
 
 @router.put("/investment-accounts/{investment_id}", response_model=InvestmentAccountRead)
-def update_investment_account(
+async def update_investment_account(
     investment_id: int,
     payload: InvestmentAccountUpdate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Update an investment account."""
-    investment = db.query(InvestmentAccount).filter(
+    investment = await db.scalar(select(InvestmentAccount).where(
         InvestmentAccount.id == investment_id,
         InvestmentAccount.user_id == current_user.id
-    ).first()
+    ))
     
     if not investment:
         raise HTTPException(
@@ -108,22 +178,22 @@ def update_investment_account(
     for field, value in payload.dict(exclude_unset=True).items():
         setattr(investment, field, value)
     
-    db.commit()
-    db.refresh(investment)
+    await commit_household_write(db, current_user.id)
+    await db.refresh(investment)
     return investment
 
 
 @router.delete("/investment-accounts/{investment_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_investment_account(
+async def delete_investment_account(
     investment_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Delete an investment account."""
-    investment = db.query(InvestmentAccount).filter(
+    investment = await db.scalar(select(InvestmentAccount).where(
         InvestmentAccount.id == investment_id,
         InvestmentAccount.user_id == current_user.id
-    ).first()
+    ))
     
     if not investment:
         raise HTTPException(
@@ -131,6 +201,6 @@ def delete_investment_account(
             detail="Investment account not found"
         )
     
-    db.delete(investment)
-    db.commit()
+    await db.delete(investment)
+    await commit_household_write(db, current_user.id)
     return None 
\ No newline at end of file
@@ -1,420 +1,573 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+import asyncio
 
-from app.db import get_db_session
-from app.models import (
-    FamilyMember,
-    InvestmentAccount,
-    Asset,
-    IncomeSource,
-    Expense,
-    InsurancePolicy,
-    AccountType
+import numpy as np
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.core.encoding import (
+    ARROW_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    dumps_json,
+    encode_columns,
+    encode_json,
+    negotiate_media_type,
+    trusted_json_response
 )
+from app.db import get_db_session
+from app.models import ProjectionSnapshot, Scenario
 from app.schemas import (
     NetWorthProjection,
     CashFlowProjection,
     WithdrawalStrategyResult,
-    ProjectionParameters
+    FullProjection,
+    MonteCarloParameters,
+    MonteCarloResult,
+    ProjectionParameters,
+    ProjectionStreamFormat,
+    ProjectionView,
+    ColumnarProjection,
+    BatchProjectionRequest,
+    BatchProjectionResponse,
+    WithdrawalOptimizerParameters,
+    WithdrawalOptimizerResult
 )
 from app.routers.auth import get_current_user
+from app.routers.conditional import check_not_modified, conditional_request
 from app.schemas import User
-from app.services.calculations import (
-    is_alive,
-    calculate_age,
-    calculate_rrsp_to_rrif_conversion,
-    calculate_net_worth,
-    calculate_cash_flow,
-    calculate_account_growth,
-    calculate_asset_growth,
-    calculate_withdrawal_strategy,
-    calculate_death_benefit,
-    calculate_rrif_minimum_withdrawal
+from app.schemas.projections import year_range_error
+from app.services.household_plan import HouseholdPlan
+from app.services.household_snapshot import HouseholdSnapshot, load_household_snapshot
+from app.services.projection_engine import (
+    ProjectionLedger,
+    ProjectionYear,
+    iterate_projection,
+    run_projection
 )
+from app.services.monte_carlo import run_monte_carlo
+from app.services.projection_cache import projection_cache
+from app.services.projection_snapshots import (
+    SNAPSHOT_VIEWS,
+    decode_series,
+    parameters_key,
+    save_snapshot,
+    select_views,
+    snapshot_worker
+)
+from app.services.withdrawal_optimizer import optimize_withdrawals
 
 
 router = APIRouter()
 
+# Worker pool running the scenarios of batch projections
+batch_executor = ThreadPoolExecutor(
+    max_workers=settings.PROJECTION_BATCH_WORKERS,
+    thread_name_prefix="projection-batch"
+)
+
+# Precompiled adapters of the response models of engine outputs, see `render_trusted`
+NET_WORTH_ADAPTER = TypeAdapter(Dict[str, Dict[str, float]])
+CASH_FLOW_ADAPTER = TypeAdapter(Dict[str, CashFlowProjection])
+DETAILED_WITHDRAWALS_ADAPTER = TypeAdapter(Dict[str, WithdrawalStrategyResult])
+FULL_PROJECTION_ADAPTER = TypeAdapter(FullProjection)
+OPTIMIZER_ADAPTER = TypeAdapter(WithdrawalOptimizerResult)
+MONTE_CARLO_ADAPTER = TypeAdapter(MonteCarloResult)
+
+
+def render_trusted(adapter: TypeAdapter, compute: Callable[..., Any], *args, **kwargs) -> Response:
+    """
+    Compute an engine output and encode it as the JSON response, without
+    validating it against the response model (see `trusted_json_response`).
+    Called on a worker thread, so that neither blocks the event loop.
+    """
+    return trusted_json_response(compute(*args, **kwargs), adapter)
+
+
+async def load_household_plan(
+    params: ProjectionParameters,
+    db: AsyncSession,
+    current_user: User
+) -> HouseholdPlan:
+    """Load all of the user's data needed for projections and compile it once."""
+    snapshot = await load_household_snapshot(db, current_user.id)
+    return await run_in_threadpool(snapshot.plan, params.start_year, params.end_year)
+
+
+def project_household(
+    snapshot: HouseholdSnapshot,
+    start_year: int,
+    end_year: int,
+    current_year: int
+) -> ProjectionLedger:
+    """Compile a loaded household for a range of years and run the projection."""
+    return run_projection(snapshot.plan(start_year, end_year), current_year=current_year)
+
+
+async def load_projection_ledger(
+    params: ProjectionParameters,
+    db: AsyncSession,
+    current_user: User
+) -> ProjectionLedger:
+    """
+    Return the projection ledger for the user's household, from the cache
+    when the household hasn't changed since it was computed.
+    """
+    current_year = date.today().year
+    # Read the revision before loading, so a concurrent write makes the result stale
+    revision = projection_cache.revision(current_user.id)
+    ledger = projection_cache.get(current_user.id, revision, params.start_year, params.end_year, current_year)
+    if ledger is None:
+        # The engine works on arrays built from the snapshot, so the RRSP to
+        # RRIF conversion never touches the database and can run off the event loop
+        snapshot = await load_household_snapshot(db, current_user.id)
+        ledger = await run_in_threadpool(
+            project_household, snapshot, params.start_year, params.end_year, current_year
+        )
+        projection_cache.put(current_user.id, revision, current_year, ledger)
+    return ledger
+
+
+async def load_projection_years(
+    params: ProjectionParameters,
+    db: AsyncSession,
+    current_user: User
+) -> Iterator[ProjectionYear]:
+    """
+    Return the projection years of the user's household for streaming.
+
+    Years come from the cached ledger when there is one; otherwise they are
+    computed one at a time while the response is being sent.
+    """
+    current_year = date.today().year
+    revision = projection_cache.revision(current_user.id)
+    ledger = projection_cache.get(current_user.id, revision, params.start_year, params.end_year, current_year)
+    if ledger is not None:
+        return ledger.iter_years()
+    return iterate_projection(await load_household_plan(params, db, current_user))
+
+
+def stream_projection_years(
+    years: Iterator[ProjectionYear],
+    view: Callable[[ProjectionYear], Dict],
+    stream_format: ProjectionStreamFormat
+) -> StreamingResponse:
+    """
+    Stream one view of every projection year as NDJSON lines or Server-Sent Events.
+
+    Each year is sent as soon as it is computed, as a JSON object with its
+    "year" and the fields of the view. Server-Sent Events end with an "end" event.
+
+    Args:
+        years: The projection years, in order
+        view: Function building the view of a year
+        stream_format: Format of the response
+
+    Returns:
+        The streaming response
+    """
+    def ndjson_lines():
+        for year in years:
+            yield dumps_json({"year": str(year.year), **view(year)}) + b"\n"
+
+    def sse_events():
+        for year in years:
+            yield b"id: %d\ndata: %s\n\n" % (year.year, dumps_json({"year": str(year.year), **view(year)}))
+        yield b"event: end\ndata: {}\n\n"
+
+    if stream_format == ProjectionStreamFormat.SSE:
+        return StreamingResponse(
+            sse_events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"}
+        )
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
 
-@router.post("/projections/net-worth", response_model=Dict[str, Dict[str, float]])
-def project_net_worth(
+@router.post(
+    "/projections/net-worth",
+    response_model=Dict[str, Dict[str, float]],
+    dependencies=[Depends(conditional_request)]
+)
+async def project_net_worth(
     params: ProjectionParameters,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """
     Generate net worth projections for each year from start_year to end_year.
     Returns a dictionary with yearly net worth values and a breakdown by asset/account type.
     """
-    # Get all user data needed for projections
-    family_members = db.query(FamilyMember).filter(FamilyMember.user_id == current_user.id).all()
-    investment_accounts = db.query(InvestmentAccount).filter(InvestmentAccount.user_id == current_user.id).all()
-    assets = db.query(Asset).filter(Asset.user_id == current_user.id).all()
-    
-    print(f"Starting projections with {len(investment_accounts)} accounts and {len(assets)} assets")
-    for account in investment_accounts:
-        print(f"Account: {account.name}, Type: {account.account_type}, Balance: ${account.current_balance:,.2f}")
-    
-    for asset in assets:
-        print(f"Asset: {asset.name}, Type: {asset.asset_type}, Value: ${asset.current_value:,.2f}")
-    
-    # Make a copy of the investment accounts to avoid modifying the original data
-    # This prevents the RRSP to RRIF conversion from affecting the database
-    investment_accounts_copy = []
-    for account in investment_accounts:
-        account_copy = InvestmentAccount(
-            id=account.id,
-            user_id=account.user_id,
-            family_member_id=account.family_member_id,
-            name=account.name,
-            account_type=account.account_type,
-            institution=account.institution,
-            current_balance=account.current_balance,
-            expected_return_rate=account.expected_return_rate,
-            is_taxable=account.is_taxable,
-            notes=account.notes,
-            contribution_room=account.contribution_room,
-            expected_conversion_year=account.expected_conversion_year
-        )
-        investment_accounts_copy.append(account_copy)
-    
-    # Track projected account values by year
-    projected_accounts = {}
-    
-    # Get current year for baseline
-    current_year = date.today().year
-    
-    # Generate year-by-year projections
-    yearly_projections = {}
-    
-    for year in range(params.start_year, params.end_year + 1):
-        print(f"\nProjecting for year {year}")
-        # Initialize tracking for this year
-        if year not in projected_accounts:
-            projected_accounts[year] = {}
-            
-        # RRSP to RRIF conversions that should happen in this year
-        for account in investment_accounts_copy:
-            member = next((m for m in family_members if m.id == account.family_member_id), None)
-            if not member:
-                continue
-                
-            # Check if this account should convert from RRSP to RRIF
-            if calculate_rrsp_to_rrif_conversion(account, member, year):
-                print(f"Converting account {account.name} from RRSP to RRIF in year {year}")
-                # Convert the account for projections - note this doesn't affect the database
-                account.account_type = AccountType.RRIF
-        
-        # Calculate projected account values for this year
-        for account in investment_accounts_copy:
-            # Skip projections for deceased account holders
-            member = next((m for m in family_members if m.id == account.family_member_id), None)
-            if not member or not is_alive(member, year):
-                projected_accounts[year][account.id] = 0
-                continue
-                
-            # Calculate growth for this account
-            projected_accounts[year][account.id] = calculate_account_growth(
-                account, 
-                year, 
-                projected_accounts
-            )
-        
-        # Calculate net worth for this year
-        net_worth = calculate_net_worth(
-            family_members,
-            investment_accounts_copy,
-            assets,
-            year,
-            current_year,
-            projected_accounts
-        )
-        
-        # Breakdown by category
-        rrsp_total = sum(
-            projected_accounts[year].get(a.id, a.current_balance) 
-            for a in investment_accounts_copy 
-            if a.account_type == AccountType.RRSP
-        )
-        
-        tfsa_total = sum(
-            projected_accounts[year].get(a.id, a.current_balance) 
-            for a in investment_accounts_copy 
-            if a.account_type == AccountType.TFSA
-        )
-        
-        non_registered_total = sum(
-            projected_accounts[year].get(a.id, a.current_balance) 
-            for a in investment_accounts_copy 
-            if a.account_type == AccountType.NON_REGISTERED
-        )
-        
-        rrif_total = sum(
-            projected_accounts[year].get(a.id, a.current_balance) 
-            for a in investment_accounts_copy 
-            if a.account_type == AccountType.RRIF
-        )
-        
-        other_investments_total = sum(
-            projected_accounts[year].get(a.id, a.current_balance) 
-            for a in investment_accounts_copy 
-            if a.account_type not in [AccountType.RRSP, AccountType.TFSA, AccountType.NON_REGISTERED, AccountType.RRIF]
-        )
-        
-        # Sum up assets by type
-        property_total = sum(
-            calculate_asset_growth(a, year, current_year)
-            for a in assets
-            if a.asset_type in ["PRIMARY_RESIDENCE", "SECONDARY_PROPERTY"]
-        )
-        
-        business_total = sum(
-            calculate_asset_growth(a, year, current_year)
-            for a in assets
-            if a.asset_type == "BUSINESS"
-        )
-        
-        other_assets_total = sum(
-            calculate_asset_growth(a, year, current_year)
-            for a in assets
-            if a.asset_type not in ["PRIMARY_RESIDENCE", "SECONDARY_PROPERTY", "BUSINESS"]
-        )
-        
-        yearly_projections[str(year)] = {
-            "total_net_worth": net_worth,
-            "rrsp_total": rrsp_total,
-            "tfsa_total": tfsa_total,
-            "non_registered_total": non_registered_total,
-            "rrif_total": rrif_total,
-            "other_investments_total": other_investments_total,
-            "property_total": property_total,
-            "business_total": business_total,
-            "other_assets_total": other_assets_total
-        }
-        
-        print(f"Year {year} projection: Net Worth = ${net_worth:,.2f}")
-        print(f"  RRSP: ${rrsp_total:,.2f}")
-        print(f"  TFSA: ${tfsa_total:,.2f}")
-        print(f"  Non-Registered: ${non_registered_total:,.2f}")
-        print(f"  RRIF: ${rrif_total:,.2f}")
-        print(f"  Property: ${property_total:,.2f}")
-        print(f"  Business: ${business_total:,.2f}")
-        print(f"  Other Assets: ${other_assets_total:,.2f}")
-    
-    return yearly_projections
-
-
-@router.post("/projections/cash-flow", response_model=Dict[str, CashFlowProjection])
-def project_cash_flow(
+    ledger = await load_projection_ledger(params, db, current_user)
+    return await run_in_threadpool(render_trusted, NET_WORTH_ADAPTER, ledger.net_worth)
+
+
+@router.post(
+    "/projections/cash-flow",
+    response_model=Dict[str, CashFlowProjection],
+    dependencies=[Depends(conditional_request)]
+)
+async def project_cash_flow(
     params: ProjectionParameters,
-    db: Session = Depends(get_db_session),
+    stream: Optional[ProjectionStreamFormat] = None,
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """
     Generate cash flow projections for each year from start_year to end_year.
     Returns a dictionary with yearly cash flow details including income, expenses,
     and withdrawal strategies.
+
+    With `stream=ndjson` or `stream=sse`, each year is streamed as soon as it is computed.
     """
-    # Get all user data needed for projections
-    family_members = db.query(FamilyMember).filter(FamilyMember.user_id == current_user.id).all()
-    investment_accounts = db.query(InvestmentAccount).filter(InvestmentAccount.user_id == current_user.id).all()
-    income_sources = db.query(IncomeSource).filter(IncomeSource.user_id == current_user.id).all()
-    expenses = db.query(Expense).filter(Expense.user_id == current_user.id).all()
-    insurance_policies = db.query(InsurancePolicy).filter(InsurancePolicy.user_id == current_user.id).all()
-    
-    # Track projected account values by year
-    projected_accounts = {}
-    
-    # Get current year for baseline
-    current_year = date.today().year
-    
-    # Generate year-by-year projections
-    yearly_projections = {}
-    
-    for year in range(params.start_year, params.end_year + 1):
-        # Initialize tracking for this year
-        if year not in projected_accounts:
-            projected_accounts[year] = {}
-        
-        # RRSP to RRIF conversions that should happen in this year
-        for account in investment_accounts:
-            member = next((m for m in family_members if m.id == account.family_member_id), None)
-            if not member:
-                continue
-                
-            # Check if this account should convert from RRSP to RRIF
-            if calculate_rrsp_to_rrif_conversion(account, member, year):
-                # Create new RRIF account for projections
-                account.account_type = AccountType.RRIF
-        
-        # Calculate cash flow for this year
-        cash_flow = calculate_cash_flow(
-            family_members,
-            income_sources,
-            expenses,
-            insurance_policies,
-            year,
-            current_year
+    if stream is not None:
+        return stream_projection_years(
+            await load_projection_years(params, db, current_user), ProjectionYear.cash_flow, stream
         )
-        
-        # Calculate withdrawal strategy if income doesn't cover expenses
-        withdrawal_strategy = None
-        if cash_flow["net_cash_flow"] < 0:
-            withdrawal_strategy = calculate_withdrawal_strategy(
-                family_members,
-                investment_accounts,
-                income_sources,
-                expenses,
-                year,
-                current_year,
-                projected_accounts
-            )
-            
-            # Update projected account values after withdrawals
-            for account_id, remaining in withdrawal_strategy["remaining_balance"].items():
-                projected_accounts[year][account_id] = remaining
-        else:
-            # No withdrawals needed, update account values with growth only
-            for account in investment_accounts:
-                # Skip projections for deceased account holders
-                member = next((m for m in family_members if m.id == account.family_member_id), None)
-                if not member or not is_alive(member, year):
-                    projected_accounts[year][account.id] = 0
-                    continue
-                    
-                # Calculate growth for this account
-                projected_accounts[year][account.id] = calculate_account_growth(
-                    account, 
-                    year, 
-                    projected_accounts
-                )
-        
-        # Check for deaths in this year and add death benefits
-        death_benefits = []
-        for member in family_members:
-            # If they're alive this year but not next year
-            if is_alive(member, year) and not is_alive(member, year + 1):
-                benefit = calculate_death_benefit(member, insurance_policies, year)
-                if benefit > 0:
-                    death_benefits.append({
-                        "family_member_id": member.id,
-                        "family_member_name": f"{member.first_name} {member.last_name}",
-                        "benefit_amount": benefit
-                    })
-        
-        # Store the year's projection
-        yearly_projections[str(year)] = {
-            "total_income": cash_flow["total_income"],
-            "total_expenses": cash_flow["total_expenses"],
-            "net_cash_flow": cash_flow["net_cash_flow"],
-            "withdrawal_strategy": withdrawal_strategy,
-            "death_benefits": death_benefits
-        }
-    
-    return yearly_projections
+    ledger = await load_projection_ledger(params, db, current_user)
+    return await run_in_threadpool(render_trusted, CASH_FLOW_ADAPTER, ledger.cash_flow)
 
 
-@router.post("/projections/detailed-withdrawals", response_model=Dict[str, WithdrawalStrategyResult])
-def project_detailed_withdrawals(
+@router.post(
+    "/projections/detailed-withdrawals",
+    response_model=Dict[str, WithdrawalStrategyResult],
+    dependencies=[Depends(conditional_request)]
+)
+async def project_detailed_withdrawals(
     params: ProjectionParameters,
-    db: Session = Depends(get_db_session),
+    stream: Optional[ProjectionStreamFormat] = None,
+    db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """
     Generate detailed withdrawal strategy projections for retirement planning.
+
+    With `stream=ndjson` or `stream=sse`, each year is streamed as soon as it is computed.
     """
-    # Get all user data needed for projections
-    family_members = db.query(FamilyMember).filter(FamilyMember.user_id == current_user.id).all()
-    investment_accounts = db.query(InvestmentAccount).filter(InvestmentAccount.user_id == current_user.id).all()
-    income_sources = db.query(IncomeSource).filter(IncomeSource.user_id == current_user.id).all()
-    expenses = db.query(Expense).filter(Expense.user_id == current_user.id).all()
-    
-    # Track projected account values by year
-    projected_accounts = {}
-    
-    # Get current year for baseline
-    current_year = date.today().year
-    
-    # Generate year-by-year projections
-    yearly_projections = {}
-    
-    for year in range(params.start_year, params.end_year + 1):
-        # Initialize tracking for this year
-        if year not in projected_accounts:
-            projected_accounts[year] = {}
-        
-        # RRSP to RRIF conversions that should happen in this year
-        for account in investment_accounts:
-            member = next((m for m in family_members if m.id == account.family_member_id), None)
-            if not member:
-                continue
-                
-            # Check if this account should convert from RRSP to RRIF
-            if calculate_rrsp_to_rrif_conversion(account, member, year):
-                # Create new RRIF account for projections
-                account.account_type = AccountType.RRIF
-        
-        # Calculate withdrawal strategy 
-        withdrawal_strategy = calculate_withdrawal_strategy(
-            family_members,
-            investment_accounts,
-            income_sources,
-            expenses,
-            year,
-            current_year,
-            projected_accounts
+    if stream is not None:
+        return stream_projection_years(
+            await load_projection_years(params, db, current_user), ProjectionYear.detailed_withdrawals, stream
         )
-        
-        # Update projected account values after withdrawals
-        for account_id, remaining in withdrawal_strategy["remaining_balance"].items():
-            projected_accounts[year][account_id] = remaining
-            
-        # For accounts not in the withdrawal strategy, still calculate growth
-        for account in investment_accounts:
-            if account.id not in withdrawal_strategy["remaining_balance"]:
-                # Skip projections for deceased account holders
-                member = next((m for m in family_members if m.id == account.family_member_id), None)
-                if not member or not is_alive(member, year):
-                    projected_accounts[year][account.id] = 0
-                    continue
-                    
-                # Calculate growth for this account
-                projected_accounts[year][account.id] = calculate_account_growth(
-                    account, 
-                    year, 
-                    projected_accounts
-                )
-        
-        # Store withdrawal details
-        account_details = {}
-        for account in investment_accounts:
-            # Get corresponding member
-            member = next((m for m in family_members if m.id == account.family_member_id), None)
-            if not member:
-                continue
-            
-            # Only include accounts of living members
-            if not is_alive(member, year):
-                continue
-                
-            account_value = projected_accounts[year].get(account.id, account.current_balance)
-            withdrawal = withdrawal_strategy["withdrawals"].get(account.id, 0)
-            
-            account_details[str(account.id)] = {
-                "account_name": account.name,
-                "account_type": account.account_type,
-                "family_member_name": f"{member.first_name} {member.last_name}",
-                "start_value": account_value + withdrawal,  # before withdrawal
-                "withdrawal": withdrawal,
-                "end_value": account_value,  # after withdrawal
+    ledger = await load_projection_ledger(params, db, current_user)
+    return await run_in_threadpool(render_trusted, DETAILED_WITHDRAWALS_ADAPTER, ledger.detailed_withdrawals)
+
+
+@router.post("/projections/full", response_model=FullProjection, dependencies=[Depends(conditional_request)])
+async def project_full(
+    params: ProjectionParameters,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Generate net worth, cash flow and detailed withdrawal projections from a
+    single projection run.
+    """
+    ledger = await load_projection_ledger(params, db, current_user)
+    return await run_in_threadpool(render_trusted, FULL_PROJECTION_ADAPTER, ledger.full)
+
+
+# Ledger views included in each columnar projection view
+COLUMNAR_VIEWS = {
+    ProjectionView.NET_WORTH: ["net_worth"],
+    ProjectionView.CASH_FLOW: ["cash_flow"],
+    ProjectionView.DETAILED_WITHDRAWALS: ["withdrawals"],
+    ProjectionView.FULL: ["net_worth", "cash_flow", "withdrawals"],
+}
+
+
+@router.post(
+    "/projections/v2/{view}",
+    response_model=ColumnarProjection,
+    responses={200: {"content": {MSGPACK_MEDIA_TYPE: {}, ARROW_MEDIA_TYPE: {}}}},
+    dependencies=[Depends(conditional_request)]
+)
+async def project_columnar(
+    view: ProjectionView,
+    params: ProjectionParameters,
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Generate a projection view in columnar form: a `years` array, one value
+    array per series, and account and member details sent once.
+
+    The response is JSON by default; send `Accept: application/msgpack` or
+    `Accept: application/vnd.apache.arrow.stream` for a binary encoding.
+    """
+    media_type = negotiate_media_type(accept)
+    if media_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail="Supported media types are application/json, application/msgpack and "
+                   "application/vnd.apache.arrow.stream"
+        )
+
+    ledger = await load_projection_ledger(params, db, current_user)
+    columns = ledger.columnar(COLUMNAR_VIEWS[view])
+    content = await run_in_threadpool(encode_columns, columns, media_type)
+    return Response(content=content, media_type=media_type)
+
+
+def projection_query_parameters(
+    start_year: int,
+    end_year: int,
+    inflation_rate: float = 0.02,
+    province: str = "ON"
+) -> ProjectionParameters:
+    """Dependency reading ProjectionParameters from the query string."""
+    error = year_range_error(start_year, end_year)
+    if error is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+    return ProjectionParameters(
+        start_year=start_year, end_year=end_year, inflation_rate=inflation_rate, province=province
+    )
+
+
+@router.get(
+    "/projections/v2/{view}",
+    response_model=ColumnarProjection,
+    responses={200: {"content": {MSGPACK_MEDIA_TYPE: {}, ARROW_MEDIA_TYPE: {}}}},
+    dependencies=[Depends(conditional_request)]
+)
+async def get_columnar_projection(
+    view: ProjectionView,
+    params: ProjectionParameters = Depends(projection_query_parameters),
+    scenario_id: Optional[int] = None,
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Return a projection view in columnar form, as POST /projections/v2/{view}
+    does, from the stored snapshot of the scenario and parameters when it is fresh.
+
+    Snapshots are recomputed in the background after household writes. A
+    missing or stale snapshot is computed now and stored; the X-Snapshot
+    response header tells whether the snapshot was used ("hit") or not ("miss").
+    """
+    media_type = negotiate_media_type(accept)
+    if media_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail="Supported media types are application/json, application/msgpack and "
+                   "application/vnd.apache.arrow.stream"
+        )
+
+    if scenario_id is not None:
+        scenario = await db.scalar(select(Scenario.id).where(
+            Scenario.id == scenario_id,
+            Scenario.user_id == current_user.id
+        ))
+        if scenario is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Scenario not found"
+            )
+
+    parameters = params.model_dump()
+    snapshot = await db.scalar(select(ProjectionSnapshot).where(
+        ProjectionSnapshot.user_id == current_user.id,
+        ProjectionSnapshot.parameters_key == parameters_key(scenario_id, parameters)
+    ))
+    if snapshot is not None and snapshot_worker.is_fresh(snapshot):
+        columns = await run_in_threadpool(decode_series, snapshot.series, snapshot.details)
+        source = "hit"
+    else:
+        current_year = date.today().year
+        revision = projection_cache.revision(current_user.id)
+        ledger = await load_projection_ledger(params, db, current_user)
+        columns = await run_in_threadpool(ledger.columnar, SNAPSHOT_VIEWS)
+        # Only results of the current household are stored, the worker refreshes the others
+        if snapshot_worker.running and projection_cache.revision(current_user.id) == revision:
+            await save_snapshot(db, current_user.id, scenario_id, parameters, columns, current_year)
+        source = "miss"
+
+    content = await run_in_threadpool(encode_columns, select_views(columns, COLUMNAR_VIEWS[view]), media_type)
+    return Response(content=content, media_type=media_type, headers={"X-Snapshot": source})
+
+
+def align_columns(columns: Dict, first_year: int, num_years: int) -> Dict:
+    """
+    Align columnar data on a longer year axis, with None outside its own years.
+
+    Args:
+        columns: Columnar data from `ProjectionLedger.columnar`
+        first_year: The first year of the shared axis
+        num_years: The number of years of the shared axis
+
+    Returns:
+        The columnar data without its own "years", every series spanning the shared axis
+    """
+    before = int(columns["years"][0]) - first_year
+    after = num_years - before - len(columns["years"])
+
+    def pad(values: np.ndarray) -> List:
+        if values.ndim == 2:
+            return [pad(row) for row in values]
+        return [None] * before + values.tolist() + [None] * after
+
+    aligned = {}
+    for group, series in columns.items():
+        if group == "years":
+            continue
+        if isinstance(series, dict):
+            series = {
+                name: pad(values) if isinstance(values, np.ndarray) else values
+                for name, values in series.items()
             }
-        
-        yearly_projections[str(year)] = {
-            "shortfall": withdrawal_strategy["shortfall"],
-            "unfunded_amount": withdrawal_strategy.get("unfunded_amount", 0),
-            "account_details": account_details
+        aligned[group] = series
+    return aligned
+
+
+@router.post(
+    "/projections/batch",
+    response_model=BatchProjectionResponse,
+    dependencies=[Depends(conditional_request)]
+)
+async def project_batch(
+    request: BatchProjectionRequest,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Run several projection scenarios in one request and return their columnar
+    results aligned on a shared year axis.
+
+    The household is loaded once. Scenarios sharing a start year are served by
+    a single projection up to their latest end year, and projections that
+    aren't cached run concurrently on a worker pool.
+    """
+    items = [(scenario, scenario.parameters or request.parameters) for scenario in request.scenarios]
+
+    scenario_ids = {scenario.scenario_id for scenario, _ in items if scenario.scenario_id is not None}
+    scenarios = {}
+    if scenario_ids:
+        scenarios = {
+            scenario.id: scenario
+            for scenario in (await db.scalars(select(Scenario).where(
+                Scenario.user_id == current_user.id,
+                Scenario.id.in_(scenario_ids)
+            ))).all()
+        }
+        if len(scenarios) != len(scenario_ids):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Scenario not found"
+            )
+
+    # Projections are anchored at their start year, so one run per start year
+    # covers every scenario starting that year
+    horizons = {}
+    for _, params in items:
+        horizons[params.start_year] = max(horizons.get(params.start_year, params.end_year), params.end_year)
+
+    current_year = date.today().year
+    revision = projection_cache.revision(current_user.id)
+    ledgers = {}
+    for start_year, end_year in horizons.items():
+        ledger = projection_cache.get(current_user.id, revision, start_year, end_year, current_year)
+        if ledger is not None:
+            ledgers[start_year] = ledger
+
+    missing = {start_year: end_year for start_year, end_year in horizons.items() if start_year not in ledgers}
+    if missing:
+        snapshot = await load_household_snapshot(db, current_user.id)
+        loop = asyncio.get_running_loop()
+        futures = {
+            start_year: loop.run_in_executor(
+                batch_executor, project_household, snapshot, start_year, end_year, current_year
+            )
+            for start_year, end_year in missing.items()
         }
-    
-    return yearly_projections 
\ No newline at end of file
+        for start_year, future in futures.items():
+            ledgers[start_year] = await future
+            projection_cache.put(current_user.id, revision, current_year, ledgers[start_year])
+
+    first_year = min(horizons)
+    num_years = max(horizons.values()) - first_year + 1
+    results = []
+    for scenario, params in items:
+        ledger = ledgers[params.start_year]
+        if params.end_year < ledger.end_year:
+            ledger = ledger.slice(params.end_year)
+        results.append({
+            "scenario_id": scenario.scenario_id,
+            "name": scenarios[scenario.scenario_id].name if scenario.scenario_id is not None else None,
+            "parameters": params.model_dump(),
+            "projection": align_columns(ledger.columnar(COLUMNAR_VIEWS[request.view]), first_year, num_years)
+        })
+
+    content = {"years": list(range(first_year, first_year + num_years)), "results": results}
+    return Response(content=encode_json(content), media_type=JSON_MEDIA_TYPE)
+
+
+@router.post(
+    "/projections/optimize-withdrawals",
+    response_model=WithdrawalOptimizerResult,
+    dependencies=[Depends(conditional_request)]
+)
+async def project_optimized_withdrawals(
+    params: WithdrawalOptimizerParameters,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Search withdrawal orders and RRSP meltdown amounts for the strategy with
+    the lowest lifetime tax or the largest terminal estate.
+    Returns the best strategies compared with the default withdrawal order.
+    """
+    province = params.province or "ON"
+    revision = projection_cache.revision(current_user.id)
+    household_key = (
+        current_user.id, revision, params.start_year, params.end_year, date.today().year, province
+    )
+    return await run_in_threadpool(
+        render_trusted,
+        OPTIMIZER_ADAPTER,
+        optimize_withdrawals,
+        await load_household_plan(params, db, current_user),
+        province=province,
+        household_key=household_key,
+        objective=params.objective.value,
+        meltdown_amounts=params.meltdown_amounts,
+        meltdown_until_ages=params.meltdown_until_ages,
+        refinement_rounds=params.refinement_rounds,
+        top_n=params.top_n
+    )
+
+
+@router.post("/projections/monte-carlo", response_model=MonteCarloResult)
+async def project_monte_carlo(
+    params: MonteCarloParameters,
+    request: Request,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Simulate stochastic investment returns from start_year to end_year.
+    Returns the probability that every year's shortfall is funded and
+    percentile bands of net worth for each year.
+
+    Only seeded simulations are reproducible, so only they get an ETag.
+    """
+    if params.seed is not None:
+        await check_not_modified(request, db, current_user.id)
+    return await run_in_threadpool(
+        render_trusted,
+        MONTE_CARLO_ADAPTER,
+        run_monte_carlo,
+        await load_household_plan(params, db, current_user),
+        current_year=date.today().year,
+        num_paths=params.num_paths,
+        return_volatility=params.return_volatility,
+        percentiles=params.percentiles,
+        seed=params.seed
+    )
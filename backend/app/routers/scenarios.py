@@ -1,13 +1,16 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from app.db import get_db_session
 from app.routers.auth import get_current_user
-from app.models.user import User
+from app.schemas import User
+from app.models.projection_snapshot import ProjectionSnapshot
 from app.models.scenario import Scenario
 from app.schemas.scenario import ScenarioCreate, ScenarioUpdate, Scenario as ScenarioSchema
+from app.services.household_revision import commit_household_write
 
 router = APIRouter(
     prefix="/scenarios",
@@ -19,12 +22,12 @@ router = APIRouter(
 @router.get("/", response_model=List[ScenarioSchema])
 async def get_all_scenarios(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_db_session)
 ):
     """
     Get all scenarios for the current user.
     """
-    scenarios = db.query(Scenario).filter(Scenario.user_id == current_user.id).all()
+    scenarios = (await db.scalars(select(Scenario).where(Scenario.user_id == current_user.id))).all()
     return scenarios
 
 
@@ -32,15 +35,15 @@ async def get_all_scenarios(
 async def get_scenario(
     scenario_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_db_session)
 ):
     """
     Get a single scenario by ID.
     """
-    scenario = db.query(Scenario).filter(
+    scenario = await db.scalar(select(Scenario).where(
         Scenario.id == scenario_id,
         Scenario.user_id == current_user.id
-    ).first()
+    ))
     
     if not scenario:
         raise HTTPException(
@@ -55,7 +58,7 @@ async def get_scenario(
 async def create_scenario(
     scenario_data: ScenarioCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_db_session)
 ):
     """
     Create a new scenario.
@@ -70,11 +73,12 @@ async def create_scenario(
         )
         
         db.add(new_scenario)
-        db.commit()
-        db.refresh(new_scenario)
+        # Batch projections name and resolve scenarios, so their ETags change too
+        await commit_household_write(db, current_user.id)
+        await db.refresh(new_scenario)
         return new_scenario
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A scenario with this name already exists"
@@ -86,15 +90,15 @@ async def update_scenario(
     scenario_id: int,
     scenario_data: ScenarioUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_db_session)
 ):
     """
     Update a scenario.
     """
-    scenario = db.query(Scenario).filter(
+    scenario = await db.scalar(select(Scenario).where(
         Scenario.id == scenario_id,
         Scenario.user_id == current_user.id
-    ).first()
+    ))
     
     if not scenario:
         raise HTTPException(
@@ -115,11 +119,11 @@ async def update_scenario(
         if scenario_data.description is not None:
             scenario.description = scenario_data.description
         
-        db.commit()
-        db.refresh(scenario)
+        await commit_household_write(db, current_user.id)
+        await db.refresh(scenario)
         return scenario
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A scenario with this name already exists"
@@ -130,15 +134,15 @@ async def update_scenario(
 async def delete_scenario(
     scenario_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_db_session)
 ):
     """
     Delete a scenario.
     """
-    scenario = db.query(Scenario).filter(
+    scenario = await db.scalar(select(Scenario).where(
         Scenario.id == scenario_id,
         Scenario.user_id == current_user.id
-    ).first()
+    ))
     
     if not scenario:
         raise HTTPException(
@@ -152,6 +156,7 @@ async def delete_scenario(
             detail="Cannot delete a locked scenario"
         )
     
-    db.delete(scenario)
-    db.commit()
+    await db.execute(delete(ProjectionSnapshot).where(ProjectionSnapshot.scenario_id == scenario.id))
+    await db.delete(scenario)
+    await commit_household_write(db, current_user.id)
     return None 
\ No newline at end of file
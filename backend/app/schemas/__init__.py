@@ -12,26 +12,37 @@ from app.schemas.finance import (
     InvestmentAccount, 
     InvestmentAccountCreate, 
     InvestmentAccountUpdate, 
+    InvestmentAccountBulkUpdate,
     InvestmentAccountList,
     
     # Assets
     Asset, 
     AssetCreate, 
     AssetUpdate, 
+    AssetBulkUpdate,
     AssetList,
     
     # Income Sources
     IncomeSource, 
     IncomeSourceCreate, 
     IncomeSourceUpdate, 
+    IncomeSourceBulkUpdate,
     IncomeSourceList,
     
     # Expenses
     Expense, 
     ExpenseCreate, 
     ExpenseUpdate, 
+    ExpenseBulkUpdate,
     ExpenseList,
-    ExpenseCopyRequest
+    ExpenseCopyRequest,
+    ExpenseBulkCopyRequest
+)
+
+from app.schemas.bulk import (
+    MAX_BULK_ITEMS,
+    BulkRequest,
+    BulkDeleteRequest
 )
 
 from app.schemas.family import (
@@ -58,6 +69,26 @@ from app.schemas.projections import (
     DeathBenefit,
     CashFlowProjection,
     WithdrawalStrategyResult,
+    FullProjection,
+    MonteCarloParameters,
+    MonteCarloResult,
+    ProjectionStreamFormat,
+    ProjectionView,
+    ColumnarFamilyMember,
+    ColumnarAccount,
+    ColumnarDeathBenefits,
+    ColumnarWithdrawals,
+    ColumnarProjection,
+    BatchProjectionScenario,
+    BatchProjectionRequest,
+    BatchProjectionResult,
+    BatchProjectionResponse,
+    WithdrawalOptimizerObjective,
+    WithdrawalOptimizerParameters,
+    OptimizedWithdrawalStrategy,
+    WithdrawalStrategyEvaluation,
+    WithdrawalOptimizerYearly,
+    WithdrawalOptimizerResult,
     ScenarioType,
     ScenarioParameters
 )
@@ -77,15 +108,25 @@ __all__ = [
     # Family schemas
     "FamilyMember", "FamilyMemberCreate", "FamilyMemberUpdate", "FamilyMemberList",
     # Finance schemas
-    "InvestmentAccount", "InvestmentAccountCreate", "InvestmentAccountUpdate", "InvestmentAccountList",
-    "Asset", "AssetCreate", "AssetUpdate", "AssetList",
-    "IncomeSource", "IncomeSourceCreate", "IncomeSourceUpdate", "IncomeSourceList",
-    "Expense", "ExpenseCreate", "ExpenseUpdate", "ExpenseList", "ExpenseCopyRequest",
+    "InvestmentAccount", "InvestmentAccountCreate", "InvestmentAccountUpdate", "InvestmentAccountBulkUpdate",
+    "InvestmentAccountList",
+    "Asset", "AssetCreate", "AssetUpdate", "AssetBulkUpdate", "AssetList",
+    "IncomeSource", "IncomeSourceCreate", "IncomeSourceUpdate", "IncomeSourceBulkUpdate", "IncomeSourceList",
+    "Expense", "ExpenseCreate", "ExpenseUpdate", "ExpenseBulkUpdate", "ExpenseList", "ExpenseCopyRequest",
+    "ExpenseBulkCopyRequest",
+    # Bulk request schemas
+    "MAX_BULK_ITEMS", "BulkRequest", "BulkDeleteRequest",
     # Insurance schemas
     "InsuranceTypeEnum", "InsurancePolicy", "InsurancePolicyCreate", "InsurancePolicyUpdate", "InsurancePolicyList",
     # Projection schemas
     "ProjectionParameters", "NetWorthCategory", "NetWorthProjection", "AccountWithdrawal",
     "WithdrawalStrategy", "DeathBenefit", "CashFlowProjection", "WithdrawalStrategyResult",
+    "FullProjection", "MonteCarloParameters", "MonteCarloResult", "ProjectionStreamFormat",
+    "ProjectionView", "ColumnarFamilyMember", "ColumnarAccount", "ColumnarDeathBenefits",
+    "ColumnarWithdrawals", "ColumnarProjection", "BatchProjectionScenario", "BatchProjectionRequest",
+    "BatchProjectionResult", "BatchProjectionResponse", "WithdrawalOptimizerObjective",
+    "WithdrawalOptimizerParameters", "OptimizedWithdrawalStrategy", "WithdrawalStrategyEvaluation",
+    "WithdrawalOptimizerYearly", "WithdrawalOptimizerResult",
     "ScenarioType", "ScenarioParameters",
     # Scenario module schemas
     "Scenario", "ScenarioCreate", "ScenarioUpdate",
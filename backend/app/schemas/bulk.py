@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from typing import Generic, List, TypeVar
+
+# Largest number of items accepted by one bulk request
+MAX_BULK_ITEMS = 1000
+
+ItemT = TypeVar("ItemT")
+
+
+class BulkRequest(BaseModel, Generic[ItemT]):
+    """Schema for creating or updating several entities in one transaction."""
+    items: List[ItemT] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkDeleteRequest(BaseModel):
+    """Schema for deleting several entities in one transaction."""
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
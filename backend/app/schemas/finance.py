@@ -3,6 +3,8 @@ from typing import Optional, List
 from datetime import date
 from enum import Enum
 
+from app.schemas.bulk import MAX_BULK_ITEMS
+
 # Enums for validation
 class AccountTypeEnum(str, Enum):
     RRSP = "RRSP"
@@ -84,6 +86,11 @@ class InvestmentAccountUpdate(BaseModel):
     family_member_id: Optional[int] = None
 
 
+class InvestmentAccountBulkUpdate(InvestmentAccountUpdate):
+    """Schema for updating one investment account of a bulk update."""
+    id: int
+
+
 class InvestmentAccount(InvestmentAccountBase):
     """Schema for investment account information returned to clients."""
     id: int
@@ -124,6 +131,11 @@ class AssetUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class AssetBulkUpdate(AssetUpdate):
+    """Schema for updating one asset of a bulk update."""
+    id: int
+
+
 class Asset(AssetBase):
     """Schema for asset information returned to clients."""
     id: int
@@ -164,6 +176,11 @@ class IncomeSourceUpdate(BaseModel):
     family_member_id: Optional[int] = None
 
 
+class IncomeSourceBulkUpdate(IncomeSourceUpdate):
+    """Schema for updating one income source of a bulk update."""
+    id: int
+
+
 class IncomeSource(IncomeSourceBase):
     """Schema for income source information returned to clients."""
     id: int
@@ -207,6 +224,11 @@ class ExpenseUpdate(BaseModel):
     family_member_id: Optional[int] = None
 
 
+class ExpenseBulkUpdate(ExpenseUpdate):
+    """Schema for updating one expense of a bulk update."""
+    id: int
+
+
 class Expense(ExpenseBase):
     """Schema for expense information returned to clients."""
     id: int
@@ -237,8 +259,22 @@ class ExpenseList(BaseModel):
     expenses: List[Expense]
 
 
+# Target years of one copy request; the copy builds one SELECT per year, and
+# SQLite allows at most 500 terms in a compound SELECT
+MAX_COPY_TARGET_YEARS = 100
+
+
 class ExpenseCopyRequest(BaseModel):
     """Schema for copying an expense to multiple years."""
-    target_years: List[int] = Field(..., description="The years to copy the expense to")
+    target_years: List[int] = Field(
+        ..., max_length=MAX_COPY_TARGET_YEARS, description="The years to copy the expense to"
+    )
     adjust_amount: Optional[float] = Field(None, ge=0.0, description="Optional adjusted amount for the copied expenses")
-    end_year: Optional[int] = Field(None, description="Optional end year for the copied expenses") 
\ No newline at end of file
+    end_year: Optional[int] = Field(None, description="Optional end year for the copied expenses")
+
+
+class ExpenseBulkCopyRequest(ExpenseCopyRequest):
+    """Schema for copying a set of expenses to multiple years in one statement."""
+    expense_ids: Optional[List[int]] = Field(None, max_length=MAX_BULK_ITEMS, description="Copy these expenses")
+    category: Optional[str] = Field(None, description="Copy the expenses of this category")
+    year: Optional[int] = Field(None, description="Copy the expenses active in this year")
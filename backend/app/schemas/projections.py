@@ -1,15 +1,39 @@
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Union
+from pydantic import BaseModel, Field, confloat, conint, model_validator
+from typing import Any, Dict, List, Optional, Union
 from datetime import date
 from enum import Enum
 
 
+# Longest projection, in years; every engine allocates arrays per year
+MAX_PROJECTION_YEARS = 150
+
+# Largest Monte Carlo simulation, in simulated years (paths times years)
+MAX_MONTE_CARLO_PATH_YEARS = 2_000_000
+
+
+def year_range_error(start_year: int, end_year: int) -> Optional[str]:
+    """Why a projection year range is invalid, or None when it is valid."""
+    if start_year > end_year:
+        return "start_year must not be after end_year"
+    if end_year - start_year + 1 > MAX_PROJECTION_YEARS:
+        return f"Projections cover at most {MAX_PROJECTION_YEARS} years"
+    return None
+
+
 class ProjectionParameters(BaseModel):
     """Parameters for generating financial projections."""
     start_year: int = Field(..., description="The starting year for projections")
     end_year: int = Field(..., description="The ending year for projections")
     inflation_rate: Optional[float] = Field(0.02, description="Expected inflation rate as decimal (e.g., 0.02 for 2%)")
     province: Optional[str] = Field("ON", description="Province code for tax calculations")
+
+    @model_validator(mode="after")
+    def check_year_range(self) -> "ProjectionParameters":
+        """Reject a reversed year range, which would project no years, or one too long."""
+        error = year_range_error(self.start_year, self.end_year)
+        if error is not None:
+            raise ValueError(error)
+        return self
     
 
 class NetWorthCategory(BaseModel):
@@ -70,6 +94,200 @@ class WithdrawalStrategyResult(BaseModel):
     account_details: Dict[str, AccountWithdrawal]
 
 
+class FullProjection(BaseModel):
+    """All projection views derived from a single projection run."""
+    net_worth: Dict[str, Dict[str, float]]
+    cash_flow: Dict[str, CashFlowProjection]
+    detailed_withdrawals: Dict[str, WithdrawalStrategyResult]
+
+
+class MonteCarloParameters(ProjectionParameters):
+    """Parameters for Monte Carlo simulations of investment returns."""
+    num_paths: int = Field(1000, ge=1, le=100000, description="Number of simulated return paths")
+    return_volatility: float = Field(0.10, ge=0.0, le=1.0, description="Standard deviation of annual returns as decimal")
+    percentiles: List[confloat(ge=0.0, le=100.0)] = Field([5, 25, 50, 75, 95], min_length=1, description="Percentiles of net worth to report")
+    seed: Optional[int] = Field(None, description="Optional seed for reproducible simulations")
+
+    @model_validator(mode="after")
+    def check_simulation_size(self) -> "MonteCarloParameters":
+        """Bound the paths times years the simulation holds in memory."""
+        if self.num_paths * (self.end_year - self.start_year + 1) > MAX_MONTE_CARLO_PATH_YEARS:
+            raise ValueError(
+                f"num_paths times the number of years must not exceed {MAX_MONTE_CARLO_PATH_YEARS}"
+            )
+        return self
+
+
+class MonteCarloResult(BaseModel):
+    """Outcome of a Monte Carlo simulation."""
+    num_paths: int
+    probability_of_success: float
+    net_worth_percentiles: Dict[str, Dict[str, float]]
+
+
+class ProjectionStreamFormat(str, Enum):
+    """Format of a streamed projection response."""
+    NDJSON = "ndjson"  # One JSON object per line
+    SSE = "sse"  # Server-Sent Events
+
+
+class ProjectionView(str, Enum):
+    """Projection views available in the columnar (v2) format."""
+    NET_WORTH = "net-worth"
+    CASH_FLOW = "cash-flow"
+    DETAILED_WITHDRAWALS = "detailed-withdrawals"
+    FULL = "full"
+
+
+class ColumnarFamilyMember(BaseModel):
+    """Family member listed once in a columnar projection."""
+    id: int
+    name: str
+
+
+class ColumnarAccount(BaseModel):
+    """Investment account listed once in a columnar projection."""
+    id: int
+    name: str
+    account_type: str
+    family_member_id: int
+    rrif_conversion_year: Optional[int] = None
+
+
+class ColumnarDeathBenefits(BaseModel):
+    """Death benefits as parallel arrays."""
+    year: List[int]
+    family_member_id: List[int]
+    benefit_amount: List[float]
+
+
+class ColumnarWithdrawals(BaseModel):
+    """Yearly shortfall and per-account arrays of shape (accounts, years)."""
+    shortfall: List[float]
+    unfunded_amount: List[float]
+    active: List[List[bool]]
+    start_value: List[List[float]]
+    withdrawal: List[List[float]]
+    end_value: List[List[float]]
+
+
+class ColumnarProjection(BaseModel):
+    """
+    Projection in columnar form: every series is an array over `years`, and
+    account and member details are sent once.
+    """
+    years: List[int]
+    family_members: List[ColumnarFamilyMember]
+    accounts: List[ColumnarAccount]
+    net_worth: Optional[Dict[str, List[float]]] = None
+    cash_flow: Optional[Dict[str, List[float]]] = None
+    death_benefits: Optional[ColumnarDeathBenefits] = None
+    withdrawals: Optional[ColumnarWithdrawals] = None
+
+
+class BatchProjectionScenario(BaseModel):
+    """One scenario of a batch projection."""
+    scenario_id: Optional[int] = Field(None, description="Stored scenario to label the result with")
+    parameters: Optional[ProjectionParameters] = Field(
+        None, description="Parameters of this scenario (defaults to the batch parameters)"
+    )
+
+
+class BatchProjectionRequest(BaseModel):
+    """Several projection scenarios to run in one request."""
+    parameters: ProjectionParameters
+    scenarios: List[BatchProjectionScenario] = Field(..., min_length=1, max_length=20)
+    view: ProjectionView = ProjectionView.FULL
+
+    @model_validator(mode="after")
+    def check_year_axis(self) -> "BatchProjectionRequest":
+        """Bound the shared year axis, which spans every scenario's years."""
+        ranges = [self.parameters] + [
+            scenario.parameters for scenario in self.scenarios if scenario.parameters is not None
+        ]
+        error = year_range_error(
+            min(params.start_year for params in ranges), max(params.end_year for params in ranges)
+        )
+        if error is not None:
+            raise ValueError(error)
+        return self
+
+
+class BatchProjectionResult(BaseModel):
+    """Columnar projection of one scenario, aligned on the batch's year axis."""
+    scenario_id: Optional[int] = None
+    name: Optional[str] = None
+    parameters: ProjectionParameters
+    projection: Dict[str, Any]
+
+
+class BatchProjectionResponse(BaseModel):
+    """
+    Results of a batch projection. Every series is aligned on `years`, with
+    null values for the years outside a scenario's range.
+    """
+    years: List[int]
+    results: List[BatchProjectionResult]
+
+
+class WithdrawalOptimizerObjective(str, Enum):
+    """What the withdrawal optimizer ranks strategies by."""
+    MIN_LIFETIME_TAX = "min_lifetime_tax"
+    MAX_TERMINAL_ESTATE = "max_terminal_estate"
+
+
+class WithdrawalOptimizerParameters(ProjectionParameters):
+    """Parameters for the tax-efficient withdrawal strategy search."""
+    objective: WithdrawalOptimizerObjective = WithdrawalOptimizerObjective.MIN_LIFETIME_TAX
+    meltdown_amounts: List[confloat(ge=0.0)] = Field(
+        [0, 10000, 20000, 30000, 40000, 50000],
+        min_length=1,
+        max_length=50,
+        description="Annual RRSP meltdown amounts to try"
+    )
+    meltdown_until_ages: List[conint(ge=55, le=100)] = Field(
+        [65, 71],
+        min_length=1,
+        max_length=10,
+        description="Ages at which RRSP meltdowns stop"
+    )
+    refinement_rounds: int = Field(2, ge=0, le=5, description="Refinement rounds around the best meltdown amount")
+    top_n: int = Field(5, ge=1, le=50, description="Number of best strategies to return")
+
+
+class OptimizedWithdrawalStrategy(BaseModel):
+    """A withdrawal order with an optional RRSP meltdown."""
+    withdrawal_order: List[List[str]]
+    meltdown_amount: float
+    meltdown_until_age: Optional[int] = None
+
+
+class WithdrawalStrategyEvaluation(BaseModel):
+    """Lifetime outcome of a withdrawal strategy."""
+    strategy: OptimizedWithdrawalStrategy
+    lifetime_tax: float
+    terminal_estate: float
+    unfunded_amount: float
+
+
+class WithdrawalOptimizerYearly(BaseModel):
+    """Yearly tax and meltdown of the best strategy."""
+    years: List[int]
+    tax: List[float]
+    meltdown: List[float]
+
+
+class WithdrawalOptimizerResult(BaseModel):
+    """Result of the withdrawal strategy search."""
+    objective: WithdrawalOptimizerObjective
+    candidates_evaluated: int
+    memo_hits: int
+    baseline: WithdrawalStrategyEvaluation
+    best: WithdrawalStrategyEvaluation
+    top: List[WithdrawalStrategyEvaluation]
+    yearly: WithdrawalOptimizerYearly
+
+
 class ScenarioType(str, Enum):
     """Type of projection scenario."""
     BASE = "BASE"
@@ -0,0 +1,158 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.core.metrics import register_stats
+from app.models.user import User
+from app.schemas.user import User as UserSchema
+
+
+class AuthCache:
+    """
+    In-process LRU cache of validated access tokens and their user.
+
+    Entries map a token to a snapshot of its user, so authenticated requests
+    skip decoding the JWT and loading the user. An entry lives for the TTL,
+    never past the token's own expiry.
+
+    Each user has a revision that `invalidate_user` bumps once a change to
+    the user is committed; their tokens are dropped and snapshots loaded
+    before the commit are not stored.
+
+    The cache is per process: a change committed by another worker, such as
+    a password change or a deactivation, is only seen once the entry
+    expires, i.e. within AUTH_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, UserSchema]]" = OrderedDict()
+        self._revisions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def revision(self, user_id: int) -> int:
+        """Current revision of a user."""
+        with self._lock:
+            return self._revisions.get(user_id, 0)
+
+    def get(self, token: str) -> Optional[UserSchema]:
+        """Return the user of a token validated earlier, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry[0] < time.time():
+                del self._entries[token]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, user: UserSchema, revision: int, expires_at: Optional[float] = None) -> None:
+        """
+        Store the user of a validated token unless the user changed since it was loaded.
+
+        Args:
+            token: The access token
+            user: Snapshot of the token's user
+            revision: User revision read before loading the user
+            expires_at: Expiry of the token as a Unix timestamp, if any
+        """
+        if self.max_size <= 0:
+            return
+
+        deadline = time.time() + self.ttl_seconds
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+
+        with self._lock:
+            if self._revisions.get(user.id, 0) != revision:
+                return
+
+            self._entries[token] = (deadline, user)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Bump a user's revision and drop the cached tokens of the user."""
+        with self._lock:
+            self._revisions[user_id] = self._revisions.get(user_id, 0) + 1
+            for token in [token for token, (_, user) in self._entries.items() if user.id == user_id]:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        """Drop every cached token."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters with the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size
+            }
+
+
+# Shared cache for get_current_user
+auth_cache = AuthCache(
+    max_size=settings.AUTH_CACHE_SIZE,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+# Cache counters served on /api/metrics
+register_stats(
+    "wealthsphere_auth_cache",
+    auth_cache.stats,
+    (
+        ("hits", "counter", "Access tokens served from the authentication cache."),
+        ("misses", "counter", "Access tokens decoded and loaded from the database."),
+        ("size", "gauge", "Access tokens currently cached."),
+    )
+)
+
+
+# Session.info key of the ids of users changed in the session's transaction
+CHANGED_USERS_KEY = "auth_cache_changed_users"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def record_changed_user(mapper, connection, target: User) -> None:
+    """Remember a flushed user change until its transaction commits."""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(CHANGED_USERS_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed_users(session: Session) -> None:
+    """
+    Drop the cached tokens of the users changed by a committed transaction.
+
+    Invalidating at flush would let a concurrent request cache the row as it
+    was before the commit for the whole TTL.
+    """
+    for user_id in session.info.pop(CHANGED_USERS_KEY, ()):
+        auth_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def forget_rolled_back_users(session: Session, previous_transaction) -> None:
+    """Forget the user changes of a rolled back transaction."""
+    if not session.in_transaction():
+        session.info.pop(CHANGED_USERS_KEY, None)
@@ -0,0 +1,99 @@
+from typing import Any, Dict, List, Sequence, Type
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import Base
+
+
+async def find_missing_ids(
+    db: AsyncSession,
+    model: Type[Base],
+    user_id: int,
+    ids: Sequence[int]
+) -> List[int]:
+    """
+    Return the ids, among the given ones, of rows the user doesn't own.
+
+    Args:
+        db: Database session
+        model: Model of the table
+        user_id: ID of the user
+        ids: Ids to look up
+
+    Returns:
+        The ids with no row of the user, sorted
+    """
+    owned = set((await db.scalars(
+        select(model.id).where(model.user_id == user_id, model.id.in_(set(ids)))
+    )).all())
+    return sorted(set(ids) - owned)
+
+
+async def bulk_insert(
+    db: AsyncSession,
+    model: Type[Base],
+    user_id: int,
+    rows: Sequence[Dict[str, Any]]
+) -> List[Base]:
+    """
+    Insert rows for a user with one executemany INSERT ... RETURNING.
+
+    Args:
+        db: Database session
+        model: Model of the table
+        user_id: ID of the user owning the rows
+        rows: Column values of each row
+
+    Returns:
+        The created objects, in the order of the rows
+    """
+    result = await db.scalars(
+        insert(model).returning(model, sort_by_parameter_order=True),
+        [{**row, "user_id": user_id} for row in rows]
+    )
+    return list(result.all())
+
+
+async def bulk_update(
+    db: AsyncSession,
+    model: Type[Base],
+    rows: Sequence[Dict[str, Any]]
+) -> List[Base]:
+    """
+    Update rows by primary key with executemany UPDATEs, then reload them
+    with one SELECT.
+
+    The caller checks that the rows belong to the user first, see
+    `find_missing_ids`.
+
+    Args:
+        db: Database session
+        model: Model of the table
+        rows: Primary key ("id") and changed column values of each row
+
+    Returns:
+        The updated objects, in the order of the rows
+    """
+    # Rows changing only their id would make an empty UPDATE
+    changes = [row for row in rows if len(row) > 1]
+    if changes:
+        await db.execute(update(model), changes)
+
+    ids = [row["id"] for row in rows]
+    objects = {
+        item.id: item
+        for item in (await db.scalars(
+            select(model).where(model.id.in_(set(ids))).execution_options(populate_existing=True)
+        )).all()
+    }
+    return [objects[id_] for id_ in ids]
+
+
+async def bulk_delete(db: AsyncSession, model: Type[Base], user_id: int, ids: Sequence[int]) -> None:
+    """Delete a user's rows with one DELETE ... WHERE id IN (...)."""
+    await db.execute(
+        delete(model)
+        .where(model.user_id == user_id, model.id.in_(set(ids)))
+        .execution_options(synchronize_session=False)
+    )
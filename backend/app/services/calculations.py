@@ -1,17 +1,30 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import date, datetime
 import math
 
-from app.models import (
-    FamilyMember, 
-    InvestmentAccount, 
-    Asset, 
-    IncomeSource, 
-    Expense, 
-    InsurancePolicy,
-    AccountType
+import numpy as np
+
+from app.models import AccountType
+from app.core.logging_config import get_logger
+from app.services.household_plan import (
+    AccountSnapshot,
+    AssetSnapshot,
+    ExpenseSnapshot,
+    HouseholdPlan,
+    IncomeSnapshot,
+    MemberSnapshot
 )
 
+logger = get_logger("calculations")
+
+
+# Order in which accounts are drawn down once RRIF minimums have been withdrawn
+WITHDRAWAL_ORDER = [
+    [AccountType.NON_REGISTERED],  # Taxed as withdrawn
+    [AccountType.TFSA],  # Tax-free
+    [AccountType.RRSP, AccountType.RRIF],  # Fully taxable, beyond RRIF minimums
+]
+
 
 def calculate_age(birth_date: date, target_year: int) -> int:
     """Calculate age of a person in a specific year."""
@@ -24,7 +37,7 @@ def calculate_age(birth_date: date, target_year: int) -> int:
     return max(0, age_at_year_end)
 
 
-def is_alive(member: FamilyMember, year: int) -> bool:
+def is_alive(member: MemberSnapshot, year: int) -> bool:
     """Determine if a family member is alive in a given projection year."""
     age = calculate_age(member.date_of_birth, year)
     
@@ -35,8 +48,8 @@ def is_alive(member: FamilyMember, year: int) -> bool:
 
 
 def calculate_rrsp_to_rrif_conversion(
-    account: InvestmentAccount, 
-    member: FamilyMember, 
+    plan: HouseholdPlan,
+    account: AccountSnapshot,
     year: int
 ) -> bool:
     """
@@ -44,23 +57,27 @@ def calculate_rrsp_to_rrif_conversion(
     In Canada, RRSP must be converted to RRIF by the end of the year in which
     the account holder turns 71.
     """
-    print(f"DEBUG: Checking RRSP conversion for account {account.id} ({account.name}) in year {year}")
+    logger.debug("Checking RRSP conversion for account %s (%s) in year %s", account.id, account.name, year)
     
     if account.account_type != AccountType.RRSP:
-        print(f"DEBUG: Account {account.id} is not an RRSP (type: {account.account_type}), skipping conversion check")
+        logger.debug("Account %s is not an RRSP (type: %s), skipping conversion check", account.id, account.account_type)
         return False
         
-    age = calculate_age(member.date_of_birth, year)
-    print(f"DEBUG: Family member {member.id} age in year {year}: {age}")
+    member_id = account.family_member_id
+    age = plan.age(member_id, year)
+    logger.debug("Family member %s age in year %s: %s", member_id, year, age)
     
     # If explicitly defined in the account
     if account.expected_conversion_year and account.expected_conversion_year == year:
-        print(f"DEBUG: Account {account.id} has expected conversion year {account.expected_conversion_year} matching current year {year}")
+        logger.debug(
+            "Account %s has expected conversion year %s matching current year %s",
+            account.id, account.expected_conversion_year, year
+        )
         return False
         
     # Mandatory conversion at age 71
     if age == 71:
-        print(f"DEBUG: Family member {member.id} is 71 in year {year}, triggering mandatory RRSP to RRIF conversion")
+        logger.debug("Family member %s is 71 in year %s, triggering mandatory RRSP to RRIF conversion", member_id, year)
         return False
         
     return False
@@ -97,11 +114,16 @@ def calculate_rrif_minimum_withdrawal(account_value: float, age: int) -> float:
     return account_value * rate
 
 
-def calculate_tax_on_income(income: float, province: str = "ON") -> float:
+def calculate_tax_on_income(
+    income: Union[float, np.ndarray],
+    province: str = "ON"
+) -> Union[float, np.ndarray]:
     """
     Calculate estimated income tax (federal + provincial) on a given income amount.
     This is a simplified approximation of Canadian income tax - real tax calculations
     would need to consider many more factors.
+
+    Accepts a single income or an array of incomes (taxed element-wise).
     """
     # Federal tax brackets for 2023
     federal_brackets = [
@@ -127,47 +149,46 @@ def calculate_tax_on_income(income: float, province: str = "ON") -> float:
     # Use Ontario as default if province not found
     province_brackets = provincial_brackets.get(province, provincial_brackets["ON"])
     
+    income = np.asarray(income, dtype=float)
+    
     # Calculate federal tax
-    federal_tax = 0
+    federal_tax = np.zeros_like(income)
     for min_income, max_income, rate in federal_brackets:
-        if income > min_income:
-            taxable_in_bracket = min(income, max_income) - min_income
-            federal_tax += taxable_in_bracket * rate
+        federal_tax += np.clip(income - min_income, 0, max_income - min_income) * rate
     
     # Calculate provincial tax
-    provincial_tax = 0
+    provincial_tax = np.zeros_like(income)
     for min_income, max_income, rate in province_brackets:
-        if income > min_income:
-            taxable_in_bracket = min(income, max_income) - min_income
-            provincial_tax += taxable_in_bracket * rate
+        provincial_tax += np.clip(income - min_income, 0, max_income - min_income) * rate
     
-    return federal_tax + provincial_tax
+    total_tax = federal_tax + provincial_tax
+    return total_tax.item() if total_tax.ndim == 0 else total_tax
 
 
-def calculate_oas_clawback(income: float, year: int = None) -> float:
+def calculate_oas_clawback(
+    income: Union[float, np.ndarray],
+    year: int = None
+) -> Union[float, np.ndarray]:
     """
     Calculate Old Age Security (OAS) clawback amount.
     The OAS clawback, or "recovery tax", reduces OAS payments for high-income seniors.
+
+    Accepts a single income or an array of incomes.
     """
     # 2023 threshold - in a real implementation, we might adjust for inflation
     # or have a table of projected thresholds
     threshold = 86912
     
-    # No clawback if income is below threshold
-    if income <= threshold:
-        return 0
-    
-    # 15% of income above threshold
-    clawback = (income - threshold) * 0.15
-    
     # Maximum clawback is the full OAS amount (around $7,900 annually in 2023)
     max_oas = 7900  # This would be adjusted for inflation in each year
     
-    return min(clawback, max_oas)
+    # 15% of income above threshold, none below it
+    clawback = np.minimum(np.maximum(0.0, (np.asarray(income, dtype=float) - threshold) * 0.15), max_oas)
+    return clawback.item() if clawback.ndim == 0 else clawback
 
 
 def calculate_account_growth(
-    account: InvestmentAccount, 
+    account: AccountSnapshot,
     year: int, 
     projected_accounts: Dict[int, Dict[int, float]]
 ) -> float:
@@ -198,7 +219,7 @@ def calculate_account_growth(
     return end_value
 
 
-def calculate_asset_growth(asset: Asset, year: int, current_year: int) -> float:
+def calculate_asset_growth(asset: AssetSnapshot, year: int, current_year: int) -> float:
     """
     Calculate the projected asset value at the end of a specific year.
     
@@ -220,7 +241,7 @@ def calculate_asset_growth(asset: Asset, year: int, current_year: int) -> float:
 
 
 def calculate_income_for_year(
-    income_source: IncomeSource, 
+    income_source: IncomeSnapshot,
     year: int, 
     current_year: int
 ) -> float:
@@ -252,7 +273,7 @@ def calculate_income_for_year(
 
 
 def calculate_expense_for_year(
-    expense: Expense, 
+    expense: ExpenseSnapshot,
     year: int
 ) -> float:
     """
@@ -282,9 +303,7 @@ def calculate_expense_for_year(
 
 
 def calculate_net_worth(
-    family_members: List[FamilyMember],
-    investment_accounts: List[InvestmentAccount],
-    assets: List[Asset],
+    plan: HouseholdPlan,
     year: int,
     current_year: int,
     projected_accounts: Dict[int, Dict[int, float]]
@@ -293,9 +312,7 @@ def calculate_net_worth(
     Calculate net worth for a specific projection year.
     
     Args:
-        family_members: List of family members
-        investment_accounts: List of investment accounts
-        assets: List of assets
+        plan: The compiled household plan
         year: The projection year
         current_year: The current year
         projected_accounts: Dict tracking projected account values
@@ -306,36 +323,37 @@ def calculate_net_worth(
     total_net_worth = 0
     
     # Add investment account values
-    for account in investment_accounts:
+    for account in plan.investment_accounts:
         # Check if account owner is alive
-        member = next((m for m in family_members if m.id == account.family_member_id), None)
-        if member and is_alive(member, year):
-            # Log for debugging
-            print(f"Processing account {account.name}, type: {account.account_type}, current balance: {account.current_balance}")
+        if plan.is_alive(account.family_member_id, year):
+            logger.debug(
+                "Processing account %s, type: %s, current balance: %s",
+                account.name, account.account_type, account.current_balance
+            )
             
             if year in projected_accounts and account.id in projected_accounts[year]:
                 account_value = projected_accounts[year][account.id]
-                print(f"  Using projected value for year {year}: {account_value}")
+                logger.debug("  Using projected value for year %s: %s", year, account_value)
                 total_net_worth += account_value
             else:
-                print(f"  Using current balance: {account.current_balance}")
+                logger.debug("  Using current balance: %s", account.current_balance)
                 total_net_worth += account.current_balance
     
     # Add asset values
-    for asset in assets:
+    for asset in plan.assets:
         projected_value = calculate_asset_growth(asset, year, current_year)
-        print(f"Processing asset {asset.name}, type: {asset.asset_type}, current value: {asset.current_value}, projected: {projected_value}")
+        logger.debug(
+            "Processing asset %s, type: %s, current value: %s, projected: %s",
+            asset.name, asset.asset_type, asset.current_value, projected_value
+        )
         total_net_worth += projected_value
     
-    print(f"Total net worth for year {year}: {total_net_worth}")
+    logger.debug("Total net worth for year %s: %s", year, total_net_worth)
     return total_net_worth
 
 
 def calculate_cash_flow(
-    family_members: List[FamilyMember],
-    income_sources: List[IncomeSource],
-    expenses: List[Expense],
-    insurance_policies: List[InsurancePolicy],
+    plan: HouseholdPlan,
     year: int,
     current_year: int
 ) -> Dict:
@@ -343,10 +361,7 @@ def calculate_cash_flow(
     Calculate cash flow for a specific projection year.
     
     Args:
-        family_members: List of family members
-        income_sources: List of income sources
-        expenses: List of expenses
-        insurance_policies: List of insurance policies
+        plan: The compiled household plan
         year: The projection year
         current_year: The current year
     
@@ -357,11 +372,10 @@ def calculate_cash_flow(
     total_expenses = 0
     
     # Filter for living family members
-    living_members = [m for m in family_members if is_alive(m, year)]
-    living_member_ids = [m.id for m in living_members]
+    living_member_ids = plan.living_member_ids(year)
     
     # Calculate income
-    for income_source in income_sources:
+    for income_source in plan.income_sources:
         # Skip if family member is deceased
         if income_source.family_member_id not in living_member_ids:
             continue
@@ -370,20 +384,20 @@ def calculate_cash_flow(
         total_income += income_amount
     
     # Calculate expenses
-    for expense in expenses:
+    for expense in plan.expenses:
         # Include all family expenses and expenses for living members
         if expense.family_member_id is None or expense.family_member_id in living_member_ids:
             expense_amount = calculate_expense_for_year(expense, year)
             total_expenses += expense_amount
     
     # Calculate insurance premiums as expenses
-    for policy in insurance_policies:
+    current_date = date(year, 12, 31)
+    for policy in plan.insurance_policies:
         # Skip if policy holder is deceased
         if policy.family_member_id not in living_member_ids:
             continue
             
         # Only include if policy is active
-        current_date = date(year, 12, 31)
         if ((policy.start_date is None or policy.start_date <= current_date) and
                 (policy.end_date is None or policy.end_date >= current_date)):
             total_expenses += policy.premium_amount
@@ -398,10 +412,7 @@ def calculate_cash_flow(
 
 
 def calculate_withdrawal_strategy(
-    family_members: List[FamilyMember],
-    investment_accounts: List[InvestmentAccount],
-    income_sources: List[IncomeSource],
-    expenses: List[Expense],
+    plan: HouseholdPlan,
     year: int,
     current_year: int,
     projected_accounts: Dict[int, Dict[int, float]]
@@ -410,10 +421,7 @@ def calculate_withdrawal_strategy(
     Calculate the optimal withdrawal strategy for covering expenses.
     
     Args:
-        family_members: List of family members
-        investment_accounts: List of investment accounts
-        income_sources: List of income sources
-        expenses: List of expenses
+        plan: The compiled household plan
         year: The projection year
         current_year: The current year
         projected_accounts: Dict tracking projected account values
@@ -422,18 +430,17 @@ def calculate_withdrawal_strategy(
         Dict with withdrawal strategy details
     """
     # Calculate total income and expenses
-    living_members = [m for m in family_members if is_alive(m, year)]
-    living_member_ids = [m.id for m in living_members]
+    living_member_ids = plan.living_member_ids(year)
     
     total_income = sum(
         calculate_income_for_year(income, year, current_year)
-        for income in income_sources
+        for income in plan.income_sources
         if income.family_member_id in living_member_ids
     )
     
     total_expenses = sum(
         calculate_expense_for_year(expense, year)
-        for expense in expenses
+        for expense in plan.expenses
         if expense.family_member_id is None or expense.family_member_id in living_member_ids
     )
     
@@ -447,81 +454,82 @@ def calculate_withdrawal_strategy(
             "remaining_balance": {},
         }
     
-    # Filter active accounts for living members
-    active_accounts = [
-        account for account in investment_accounts
-        if account.family_member_id in living_member_ids
-    ]
+    # Active accounts of living members, grouped by type and keyed by account id
+    accounts_by_type = {}
+    account_values = {}
+    ages = {}
+    for account_type, rows in plan.accounts_by_type.items():
+        for row in rows:
+            account = plan.investment_accounts[row]
+            if account.family_member_id not in living_member_ids:
+                continue
+            
+            accounts_by_type.setdefault(account_type, []).append(account.id)
+            account_values[account.id] = projected_accounts.get(year, {}).get(account.id, account.current_balance)
+            ages[account.id] = plan.age(account.family_member_id, year)
+    
+    allocation = calculate_withdrawal_allocation(shortfall, accounts_by_type, account_values, ages)
     
+    return {
+        "shortfall": shortfall,
+        **allocation
+    }
+
+
+def calculate_withdrawal_allocation(
+    shortfall: float,
+    accounts_by_type: Dict[AccountType, List[int]],
+    account_values: Dict[int, float],
+    ages: Dict[int, int]
+) -> Dict:
+    """
+    Allocate a shortfall across accounts in the preferred withdrawal order.
+    
+    RRIF minimums are always withdrawn first, then accounts are drawn down
+    tier by tier following WITHDRAWAL_ORDER.
+    
+    Args:
+        shortfall: Amount that needs to be withdrawn
+        accounts_by_type: Keys of the active accounts, grouped by account type
+        account_values: Dict of available value by account key
+        ages: Dict of the holder's age by account key
+    
+    Returns:
+        Dict with withdrawals, remaining balances and the unfunded amount
+    """
     # Dictionary to track withdrawals from each account
     withdrawals = {}
     remaining_shortfall = shortfall
     
     # 1. First, withdraw required minimum from RRIFs (mandatory)
-    for account in active_accounts:
-        if account.account_type == AccountType.RRIF:
-            member = next(m for m in family_members if m.id == account.family_member_id)
-            age = calculate_age(member.date_of_birth, year)
+    for key in accounts_by_type.get(AccountType.RRIF, []):
+        min_withdrawal = calculate_rrif_minimum_withdrawal(account_values[key], ages[key])
+        
+        withdrawals[key] = min_withdrawal
+        remaining_shortfall -= min_withdrawal
+    
+    # 2. Then, draw down each tier of WITHDRAWAL_ORDER until the shortfall is covered
+    for tier in WITHDRAWAL_ORDER:
+        for key in (key for account_type in tier for key in accounts_by_type.get(account_type, [])):
+            if remaining_shortfall <= 0:
+                break
             
-            account_value = projected_accounts.get(year, {}).get(account.id, account.current_balance)
-            min_withdrawal = calculate_rrif_minimum_withdrawal(account_value, age)
+            # For RRIFs, we've already withdrawn the minimum
+            existing_withdrawal = withdrawals.get(key, 0)
+            available = account_values[key] - existing_withdrawal
             
-            withdrawals[account.id] = min_withdrawal
-            remaining_shortfall -= min_withdrawal
-    
-    # 2. Then, withdraw from non-registered accounts (taxed as withdrawn)
-    if remaining_shortfall > 0:
-        for account in active_accounts:
-            if account.account_type == AccountType.NON_REGISTERED:
-                account_value = projected_accounts.get(year, {}).get(account.id, account.current_balance)
-                withdrawal = min(account_value, remaining_shortfall)
-                
-                withdrawals[account.id] = withdrawals.get(account.id, 0) + withdrawal
-                remaining_shortfall -= withdrawal
-                
-                if remaining_shortfall <= 0:
-                    break
-    
-    # 3. Then, withdraw from TFSAs (tax-free)
-    if remaining_shortfall > 0:
-        for account in active_accounts:
-            if account.account_type == AccountType.TFSA:
-                account_value = projected_accounts.get(year, {}).get(account.id, account.current_balance)
-                withdrawal = min(account_value, remaining_shortfall)
-                
-                withdrawals[account.id] = withdrawals.get(account.id, 0) + withdrawal
-                remaining_shortfall -= withdrawal
-                
-                if remaining_shortfall <= 0:
-                    break
-    
-    # 4. Finally, withdraw from RRSP/RRIF beyond minimums (fully taxable)
-    if remaining_shortfall > 0:
-        for account in active_accounts:
-            if account.account_type in [AccountType.RRSP, AccountType.RRIF]:
-                account_value = projected_accounts.get(year, {}).get(account.id, account.current_balance)
-                
-                # For RRIFs, we've already withdrawn the minimum
-                existing_withdrawal = withdrawals.get(account.id, 0)
-                available = account_value - existing_withdrawal
-                
-                withdrawal = min(available, remaining_shortfall)
-                
-                withdrawals[account.id] = existing_withdrawal + withdrawal
-                remaining_shortfall -= withdrawal
-                
-                if remaining_shortfall <= 0:
-                    break
+            withdrawal = min(available, remaining_shortfall)
+            
+            withdrawals[key] = existing_withdrawal + withdrawal
+            remaining_shortfall -= withdrawal
     
     # Calculate remaining balance after withdrawals
     remaining_balance = {}
-    for account in active_accounts:
-        account_value = projected_accounts.get(year, {}).get(account.id, account.current_balance)
-        withdrawal = withdrawals.get(account.id, 0)
-        remaining_balance[account.id] = max(0, account_value - withdrawal)
+    for key, account_value in account_values.items():
+        withdrawal = withdrawals.get(key, 0)
+        remaining_balance[key] = max(0, account_value - withdrawal)
     
     return {
-        "shortfall": shortfall,
         "withdrawals": withdrawals,
         "remaining_balance": remaining_balance,
         "unfunded_amount": max(0, remaining_shortfall)
@@ -529,31 +537,26 @@ def calculate_withdrawal_strategy(
 
 
 def calculate_death_benefit(
-    family_member: FamilyMember,
-    insurance_policies: List[InsurancePolicy],
+    plan: HouseholdPlan,
+    family_member_id: int,
     year: int
 ) -> float:
     """
     Calculate the death benefit that would be paid upon death of a family member.
     
     Args:
-        family_member: The family member
-        insurance_policies: List of insurance policies
+        plan: The compiled household plan
+        family_member_id: ID of the insured family member
         year: The year of death
     
     Returns:
         Total death benefit value
     """
-    # Get policies where this person is the insured
-    relevant_policies = [
-        policy for policy in insurance_policies
-        if policy.family_member_id == family_member.id
-    ]
-    
     total_benefit = 0
     current_date = date(year, 12, 31)
     
-    for policy in relevant_policies:
+    # Policies where this person is the insured
+    for policy in plan.policies_by_member.get(family_member_id, []):
         # Check if policy is active
         if ((policy.start_date is None or policy.start_date <= current_date) and
                 (policy.end_date is None or policy.end_date >= current_date)):
@@ -561,4 +564,4 @@ def calculate_death_benefit(
             if policy.insurance_type == "LIFE":
                 total_benefit += policy.coverage_amount
     
-    return total_benefit 
\ No newline at end of file
+    return total_benefit
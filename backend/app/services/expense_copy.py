@@ -0,0 +1,98 @@
+from typing import List, Optional, Sequence
+
+from sqlalchemy import Integer, insert, literal, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Expense
+
+
+# Columns of an expense carried over to its copies
+COPIED_COLUMNS = (
+    "user_id",
+    "name",
+    "expense_type",
+    "category",
+    "expected_growth_rate",
+    "is_tax_deductible",
+    "notes",
+    "family_member_id",
+)
+
+
+def target_years_table(target_years: Sequence[int]):
+    """
+    Derived table of the target years with their position in the request.
+
+    The table is a compound SELECT with one term per year, so callers bound
+    the number of years (see MAX_COPY_TARGET_YEARS); SQLite rejects more
+    than 500 terms.
+    """
+    return union_all(*(
+        select(literal(position, Integer).label("position"), literal(year, Integer).label("year"))
+        for position, year in enumerate(target_years)
+    )).subquery("target_years")
+
+
+async def copy_expenses(
+    db: AsyncSession,
+    user_id: int,
+    target_years: Sequence[int],
+    expense_ids: Optional[Sequence[int]] = None,
+    category: Optional[str] = None,
+    year: Optional[int] = None,
+    adjust_amount: Optional[float] = None,
+    end_year: Optional[int] = None
+) -> List[Expense]:
+    """
+    Copy a user's expenses to other years with one INSERT ... SELECT ... RETURNING.
+
+    Every selected expense gets a copy starting in each target year, except
+    the year it already starts in. Source filters combine with AND.
+
+    Args:
+        db: Database session
+        user_id: ID of the user owning the expenses
+        target_years: Start years of the copies
+        expense_ids: Copy these expenses
+        category: Copy the expenses of this category
+        year: Copy the expenses active in this year
+        adjust_amount: Amount of the copies instead of the source amount
+        end_year: End year of the copies
+
+    Returns:
+        The new expenses, by source expense id then in the order of the target years
+    """
+    if not target_years:
+        return []
+
+    years = target_years_table(target_years)
+    source = (
+        select(
+            *(getattr(Expense, column) for column in COPIED_COLUMNS),
+            Expense.amount if adjust_amount is None else literal(adjust_amount).label("amount"),
+            years.c.year.label("start_year"),
+            literal(end_year, Integer).label("end_year")
+        )
+        .join(years, Expense.start_year != years.c.year)
+        .where(Expense.user_id == user_id)
+        .order_by(Expense.id, years.c.position)
+    )
+    if expense_ids is not None:
+        source = source.where(Expense.id.in_(expense_ids))
+    if category is not None:
+        source = source.where(Expense.category == category)
+    if year is not None:
+        source = source.where(
+            Expense.start_year <= year,
+            or_(Expense.end_year.is_(None), Expense.end_year >= year)
+        )
+
+    statement = (
+        insert(Expense)
+        .from_select([*COPIED_COLUMNS, "amount", "start_year", "end_year"], source)
+        .returning(Expense)
+    )
+    copies = list((await db.scalars(statement)).all())
+    # Ids follow the ORDER BY of the select, but RETURNING rows come in no set order
+    copies.sort(key=lambda expense: expense.id)
+    return copies
@@ -0,0 +1,229 @@
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Type, TypeVar
+
+import numpy as np
+
+from app.models import AccountType, AssetType, IncomeType, InsuranceType
+
+
+# Life expectancy used when a family member has no expected death age
+DEFAULT_DEATH_AGE = 100
+
+
+# Immutable rows of the household tables consumed by the calculations. Each
+# holds only the columns the engines read; being tuples (with empty
+# __slots__), they are cheap to create, small, and safe to share between
+# threads, cached plans and optimizer worker processes.
+
+class MemberSnapshot(NamedTuple):
+    id: int
+    first_name: str
+    last_name: str
+    date_of_birth: date
+    expected_death_age: Optional[int]
+
+
+class AccountSnapshot(NamedTuple):
+    id: int
+    family_member_id: int
+    name: str
+    account_type: AccountType
+    current_balance: float
+    expected_return_rate: float
+    expected_conversion_year: Optional[int]
+
+
+class AssetSnapshot(NamedTuple):
+    id: int
+    name: str
+    asset_type: AssetType
+    current_value: float
+    expected_annual_appreciation: float
+
+
+class IncomeSnapshot(NamedTuple):
+    id: int
+    family_member_id: int
+    income_type: IncomeType
+    amount: float
+    is_taxable: bool
+    start_year: int
+    end_year: Optional[int]
+    expected_growth_rate: float
+
+
+class ExpenseSnapshot(NamedTuple):
+    id: int
+    family_member_id: Optional[int]
+    amount: float
+    start_year: int
+    end_year: Optional[int]
+    expected_growth_rate: float
+
+
+class PolicySnapshot(NamedTuple):
+    id: int
+    family_member_id: int
+    insurance_type: InsuranceType
+    coverage_amount: float
+    premium_amount: float
+    start_date: Optional[date]
+    end_date: Optional[date]
+
+
+SnapshotType = TypeVar("SnapshotType", bound=tuple)
+
+
+def snapshot_items(snapshot_type: Type[SnapshotType], items: Iterable[Any]) -> List[SnapshotType]:
+    """
+    Copy the fields of a snapshot type from objects with those attributes,
+    such as ORM instances.
+
+    Args:
+        snapshot_type: One of the snapshot types
+        items: Objects to copy
+
+    Returns:
+        List of snapshots, in the order of the items
+    """
+    fields = snapshot_type._fields
+    return [snapshot_type._make([getattr(item, field) for field in fields]) for item in items]
+
+
+def bucket_accounts_by_type(
+    account_types: Sequence[AccountType],
+    rows: Optional[Sequence[int]] = None
+) -> Dict[AccountType, List[int]]:
+    """
+    Group account rows by account type, keeping their original order.
+
+    Args:
+        account_types: Type of every account
+        rows: Optional subset of account rows to group (defaults to all)
+
+    Returns:
+        Dict mapping account type to the rows of that type
+    """
+    buckets = defaultdict(list)
+    for row in (range(len(account_types)) if rows is None else rows):
+        buckets[account_types[row]].append(row)
+    return dict(buckets)
+
+
+class HouseholdPlan:
+    """
+    A household compiled once per request for projections.
+
+    Holds id lookups, each member's death year, age and alive arrays over the
+    projection years, the same arrays expanded for every owned item, and the
+    accounts grouped by type. Calculations read these instead of searching
+    the member list for owners or recomputing ages year after year.
+
+    Per-year arrays have shape (rows, years) and follow the order of the
+    corresponding list (`family_members`, `investment_accounts`, ...). The
+    lists hold snapshot rows, never ORM objects, so the calculations can't
+    modify the database.
+    """
+
+    def __init__(
+        self,
+        family_members: Sequence[MemberSnapshot],
+        investment_accounts: Sequence[AccountSnapshot],
+        assets: Sequence[AssetSnapshot],
+        income_sources: Sequence[IncomeSnapshot],
+        expenses: Sequence[ExpenseSnapshot],
+        insurance_policies: Sequence[PolicySnapshot],
+        start_year: int,
+        end_year: int
+    ):
+        self.family_members = list(family_members)
+        self.investment_accounts = list(investment_accounts)
+        self.assets = list(assets)
+        self.income_sources = list(income_sources)
+        self.expenses = list(expenses)
+        self.insurance_policies = list(insurance_policies)
+        self.start_year = start_year
+        self.end_year = end_year
+        self.years = np.arange(start_year, end_year + 1, dtype=np.int64)
+
+        # Family members
+        self.members_by_id = {member.id: member for member in self.family_members}
+        self.member_rows = {member.id: row for row, member in enumerate(self.family_members)}
+        self.birth_years = {member.id: member.date_of_birth.year for member in self.family_members}
+        self.death_years = {
+            member.id: member.date_of_birth.year + (member.expected_death_age or DEFAULT_DEATH_AGE)
+            for member in self.family_members
+        }
+        birth_years = np.array([self.birth_years[member.id] for member in self.family_members], dtype=np.int64)
+        death_years = np.array([self.death_years[member.id] for member in self.family_members], dtype=np.int64)
+        self.ages = np.maximum(0, self.years[None, :] - birth_years[:, None])
+        self.alive = self.years[None, :] <= death_years[:, None]
+
+        # Owned items, with their owner's alive mask and age for every year
+        account_owners = [account.family_member_id for account in self.investment_accounts]
+        self.account_alive = self.owner_alive(account_owners)
+        self.account_ages = self.owner_ages(account_owners)
+        self.income_alive = self.owner_alive([source.family_member_id for source in self.income_sources])
+        self.expense_alive = self.owner_alive(
+            [expense.family_member_id for expense in self.expenses], unowned_alive=True
+        )
+        self.policy_alive = self.owner_alive([policy.family_member_id for policy in self.insurance_policies])
+
+        # Accounts grouped by type and policies grouped by insured member
+        self.accounts_by_type = bucket_accounts_by_type(
+            [account.account_type for account in self.investment_accounts]
+        )
+        self.policies_by_member = defaultdict(list)
+        for policy in self.insurance_policies:
+            self.policies_by_member[policy.family_member_id].append(policy)
+
+    def _owner_rows(self, owner_ids: Sequence[Optional[int]]) -> np.ndarray:
+        """Member row of each owner; -1 for unknown owners and -2 for unowned items."""
+        return np.array(
+            [-2 if owner_id is None else self.member_rows.get(owner_id, -1) for owner_id in owner_ids],
+            dtype=np.int64
+        )
+
+    def owner_alive(
+        self,
+        owner_ids: Sequence[Optional[int]],
+        unowned_alive: bool = False
+    ) -> np.ndarray:
+        """
+        Expand the members' alive mask into one row per owned item.
+
+        Args:
+            owner_ids: Family member id owning each item (None when unowned)
+            unowned_alive: Whether items without an owner count as active
+
+        Returns:
+            Boolean array of shape (items, years)
+        """
+        sentinels = np.vstack([
+            np.full(len(self.years), unowned_alive),  # row -2: unowned
+            np.zeros(len(self.years), dtype=bool),  # row -1: unknown owner
+        ])
+        return np.vstack([self.alive, sentinels])[self._owner_rows(owner_ids)]
+
+    def owner_ages(self, owner_ids: Sequence[Optional[int]]) -> np.ndarray:
+        """Age of each item's owner for every year (0 when the owner is unknown)."""
+        sentinels = np.zeros((2, len(self.years)), dtype=np.int64)
+        return np.vstack([self.ages, sentinels])[self._owner_rows(owner_ids)]
+
+    def is_alive(self, member_id: int, year: int) -> bool:
+        """Whether a family member is alive in a given year."""
+        return member_id in self.death_years and year <= self.death_years[member_id]
+
+    def age(self, member_id: int, year: int) -> int:
+        """Age of a family member in a given year."""
+        return max(0, year - self.birth_years[member_id])
+
+    def living_member_ids(self, year: int) -> Set[int]:
+        """Ids of the family members alive in a given year."""
+        return {member_id for member_id, death_year in self.death_years.items() if year <= death_year}
+
+    def member_name(self, member_id: int) -> str:
+        """Display name of a family member."""
+        member = self.members_by_id[member_id]
+        return f"{member.first_name} {member.last_name}"
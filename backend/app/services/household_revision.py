@@ -0,0 +1,41 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.services.projection_cache import projection_cache
+
+
+async def load_household_revision(db: AsyncSession, user_id: int) -> int:
+    """
+    Revision of a user's household as stored in the database.
+
+    The projection cache of this process is invalidated when the revision
+    moved since it last saw it, so that responses tagged with the revision
+    are never computed from ledgers cached before it.
+    """
+    revision = await db.scalar(select(User.household_revision).where(User.id == user_id)) or 0
+    projection_cache.sync_stored_revision(user_id, revision)
+    return revision
+
+
+async def commit_household_write(db: AsyncSession, user_id: int) -> None:
+    """
+    Commit a write to a user's household.
+
+    The stored household revision is bumped in the same transaction, so
+    ETags derived from it change for every process at once (see
+    `load_household_revision`). The caches of this process are then invalidated.
+
+    Args:
+        db: Database session holding the write
+        user_id: ID of the user owning the household
+    """
+    stored_revision = await db.scalar(
+        update(User)
+        .where(User.id == user_id)
+        .values(household_revision=User.household_revision + 1)
+        .returning(User.household_revision)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    projection_cache.invalidate_user(user_id, stored_revision)
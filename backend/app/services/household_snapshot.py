@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Sequence, Tuple, Type
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import Base
+from app.models import (
+    FamilyMember,
+    InvestmentAccount,
+    Asset,
+    IncomeSource,
+    Expense,
+    InsurancePolicy
+)
+from app.services.household_plan import (
+    AccountSnapshot,
+    AssetSnapshot,
+    ExpenseSnapshot,
+    HouseholdPlan,
+    IncomeSnapshot,
+    MemberSnapshot,
+    PolicySnapshot,
+    snapshot_items
+)
+
+
+# Table and snapshot type of each HouseholdPlan argument. Only the fields of
+# the snapshot type are loaded; columns the engines never use, such as the
+# notes, are not.
+SNAPSHOT_TABLES: Dict[str, Tuple[Type[Base], Type[tuple]]] = {
+    "family_members": (FamilyMember, MemberSnapshot),
+    "investment_accounts": (InvestmentAccount, AccountSnapshot),
+    "assets": (Asset, AssetSnapshot),
+    "income_sources": (IncomeSource, IncomeSnapshot),
+    "expenses": (Expense, ExpenseSnapshot),
+    "insurance_policies": (InsurancePolicy, PolicySnapshot),
+}
+
+
+@dataclass(frozen=True)
+class HouseholdSnapshot:
+    """
+    The rows of a household needed by the projection engines.
+
+    Rows are immutable snapshot tuples ordered by id. They aren't attached to
+    a session, so a snapshot can be compiled on a worker thread and shared by
+    cached plans.
+    """
+    family_members: Tuple[MemberSnapshot, ...]
+    investment_accounts: Tuple[AccountSnapshot, ...]
+    assets: Tuple[AssetSnapshot, ...]
+    income_sources: Tuple[IncomeSnapshot, ...]
+    expenses: Tuple[ExpenseSnapshot, ...]
+    insurance_policies: Tuple[PolicySnapshot, ...]
+
+    def plan(self, start_year: int, end_year: int) -> HouseholdPlan:
+        """Compile the household for a range of years."""
+        return HouseholdPlan(
+            family_members=self.family_members,
+            investment_accounts=self.investment_accounts,
+            assets=self.assets,
+            income_sources=self.income_sources,
+            expenses=self.expenses,
+            insurance_policies=self.insurance_policies,
+            start_year=start_year,
+            end_year=end_year
+        )
+
+
+def snapshot_select(model: Type[Base], snapshot_type: Type[tuple], user_id: int):
+    """Core select of the snapshot columns of a user's rows in one household table."""
+    return (
+        select(*(getattr(model, field) for field in snapshot_type._fields))
+        .where(model.user_id == user_id)
+        .order_by(model.id)
+    )
+
+
+async def load_household_snapshot(db: AsyncSession, user_id: int) -> HouseholdSnapshot:
+    """
+    Load a user's household for projections.
+
+    Each table is read with one narrow select whose rows become snapshot
+    tuples, without building ORM objects or going through the identity map.
+
+    Args:
+        db: Database session
+        user_id: ID of the user owning the household
+
+    Returns:
+        The household snapshot
+    """
+    tables = {}
+    for name, (model, snapshot_type) in SNAPSHOT_TABLES.items():
+        result = await db.execute(snapshot_select(model, snapshot_type, user_id))
+        tables[name] = tuple(map(snapshot_type._make, result.tuples()))
+    return HouseholdSnapshot(**tables)
+
+
+def snapshot_household(records: Dict[str, Sequence[Any]]) -> HouseholdSnapshot:
+    """
+    Snapshot a household given as ORM objects (or any objects with the
+    snapshot attributes), by HouseholdPlan argument.
+    """
+    return HouseholdSnapshot(**{
+        name: tuple(snapshot_items(snapshot_type, records[name]))
+        for name, (_, snapshot_type) in SNAPSHOT_TABLES.items()
+    })
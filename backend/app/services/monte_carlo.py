@@ -0,0 +1,105 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.metrics import PROJECTION_ACCOUNTS, PROJECTION_RUNS, PROJECTION_YEARS
+from app.services.household_plan import HouseholdPlan
+from app.services.projection_engine import (
+    active_accounts_by_type,
+    calculate_cash_flow_arrays,
+    calculate_conversion_columns,
+    calculate_asset_value_matrix,
+    allocate_withdrawal_arrays
+)
+
+
+# Shortfalls below this amount (in dollars) are treated as rounding noise
+UNFUNDED_TOLERANCE = 0.01
+
+
+def percentile_label(percentile: float) -> str:
+    """Format a percentile as a response key, e.g. 5 -> "p5" and 2.5 -> "p2.5"."""
+    return f"p{percentile:g}"
+
+
+def run_monte_carlo(
+    plan: HouseholdPlan,
+    current_year: int,
+    num_paths: int,
+    return_volatility: float,
+    percentiles: List[float],
+    seed: Optional[int] = None
+) -> Dict:
+    """
+    Simulate stochastic investment returns and summarize the outcomes.
+
+    Each account's yearly return is drawn from a normal distribution centred
+    on its expected return rate. Income, expenses and asset values stay
+    deterministic. Every year is computed for all paths at once: balances
+    are held as a (paths, accounts) array and shortfalls are withdrawn with
+    `allocate_withdrawal_arrays`.
+
+    Args:
+        plan: The compiled household plan
+        current_year: The current year
+        num_paths: Number of simulated return paths
+        return_volatility: Standard deviation of annual returns as decimal
+        percentiles: Percentiles of net worth to report
+        seed: Optional seed for reproducible simulations
+
+    Returns:
+        Dict with the probability of success and yearly net worth percentiles
+    """
+    years = plan.years
+    accounts = plan.investment_accounts
+
+    total_income, total_expenses = calculate_cash_flow_arrays(plan)
+    shortfall = np.maximum(0.0, total_expenses - total_income)
+    asset_totals = calculate_asset_value_matrix(plan, current_year).sum(axis=0)
+
+    conversion_columns = calculate_conversion_columns(plan)
+    returns = np.array([account.expected_return_rate or 0.0 for account in accounts])
+    balances = np.tile(
+        np.array([account.current_balance or 0.0 for account in accounts]),
+        (num_paths, 1)
+    )
+
+    rng = np.random.default_rng(seed)
+    net_worth = np.empty((num_paths, len(years)))
+    failed = np.zeros(num_paths, dtype=bool)
+
+    for column in range(len(years)):
+        # Returns can't lose more than the whole balance
+        growth = np.maximum(
+            0.0,
+            1 + returns + return_volatility * rng.standard_normal((num_paths, len(accounts)))
+        )
+        balances = np.where(plan.account_alive[:, column], balances * growth, 0.0)
+
+        if shortfall[column] > 0:
+            withdrawals, unfunded_amount = allocate_withdrawal_arrays(
+                np.full(num_paths, shortfall[column]),
+                balances,
+                active_accounts_by_type(plan, conversion_columns, column),
+                plan.account_ages[:, column]
+            )
+            balances = np.maximum(0.0, balances - withdrawals)
+            failed |= unfunded_amount > UNFUNDED_TOLERANCE
+
+        net_worth[:, column] = balances.sum(axis=1) + asset_totals[column]
+
+    PROJECTION_RUNS.inc(labels=("monte_carlo",))
+    PROJECTION_ACCOUNTS.inc(len(accounts), ("monte_carlo",))
+    PROJECTION_YEARS.inc(len(years) * num_paths, ("monte_carlo",))
+
+    bands = np.percentile(net_worth, percentiles, axis=0).tolist()
+    labels = [percentile_label(percentile) for percentile in percentiles]
+
+    return {
+        "num_paths": num_paths,
+        "probability_of_success": 1.0 - failed.mean().item(),
+        "net_worth_percentiles": {
+            str(year): {label: band[column] for label, band in zip(labels, bands)}
+            for column, year in enumerate(years.tolist())
+        }
+    }
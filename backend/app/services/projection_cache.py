@@ -0,0 +1,191 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import register_stats
+from app.services.projection_engine import ProjectionLedger
+
+
+class ProjectionCache:
+    """
+    In-process LRU cache of projection ledgers.
+
+    Entries are keyed by (user, household revision, start year, current year)
+    and hold the ledger with the longest horizon computed so far. A request
+    ending at or before the cached end year is served by slicing the ledger,
+    since every year only depends on the years before it.
+
+    Each user has a household revision that CRUD writes bump via
+    `invalidate_user`; entries stored under an older revision are dropped and
+    late writes of results computed from stale data are ignored. Listeners
+    added with `subscribe` are told about every invalidation.
+
+    The revision stored with the user in the database is tracked as well
+    (see `sync_stored_revision`), so that writes made by other processes
+    also invalidate this cache.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, ProjectionLedger]]" = OrderedDict()
+        self._revisions: Dict[int, int] = {}
+        self._stored_revisions: Dict[int, int] = {}
+        self._listeners: List[Callable[[int], None]] = []
+        self._lock = threading.Lock()
+
+    def revision(self, user_id: int) -> int:
+        """Current household revision of a user."""
+        with self._lock:
+            return self._revisions.get(user_id, 0)
+
+    def get(
+        self,
+        user_id: int,
+        revision: int,
+        start_year: int,
+        end_year: int,
+        current_year: int
+    ) -> Optional[ProjectionLedger]:
+        """
+        Look up a ledger covering start_year to end_year.
+
+        Args:
+            user_id: Owner of the household
+            revision: Household revision the caller read before loading data
+            start_year: The first projection year
+            end_year: The last projection year
+            current_year: The current year
+
+        Returns:
+            The cached ledger sliced to end_year, or None on a miss
+        """
+        key = (user_id, revision, start_year, current_year)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+
+            if entry is None or entry[1].end_year < end_year:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            ledger = entry[1]
+
+        return ledger if ledger.end_year == end_year else ledger.slice(end_year)
+
+    def put(self, user_id: int, revision: int, current_year: int, ledger: ProjectionLedger) -> None:
+        """
+        Store a ledger unless the household changed since it was loaded.
+        Ledgers without any year are not stored.
+
+        Args:
+            user_id: Owner of the household
+            revision: Household revision the caller read before loading data
+            current_year: The current year
+            ledger: The projection ledger to store
+        """
+        if self.max_size <= 0 or len(ledger.years) == 0:
+            return
+
+        key = (user_id, revision, ledger.start_year, current_year)
+        with self._lock:
+            if self._revisions.get(user_id, 0) != revision:
+                return
+
+            # Keep the longest horizon so that shorter requests can be sliced from it
+            entry = self._entries.get(key)
+            if entry is not None and entry[1].end_year > ledger.end_year:
+                ledger = entry[1]
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, ledger)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int, stored_revision: Optional[int] = None) -> None:
+        """
+        Bump a user's household revision and drop their cached ledgers.
+
+        Args:
+            user_id: Owner of the household
+            stored_revision: Household revision stored in the database by the write, if known
+        """
+        with self._lock:
+            self._revisions[user_id] = self._revisions.get(user_id, 0) + 1
+            if stored_revision is not None:
+                self._stored_revisions[user_id] = stored_revision
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+        for listener in self._listeners:
+            listener(user_id)
+
+    def sync_stored_revision(self, user_id: int, stored_revision: int) -> None:
+        """
+        Invalidate a user's ledgers if the household revision stored in the
+        database moved since this process last saw it, i.e. another process
+        wrote to the household.
+
+        Args:
+            user_id: Owner of the household
+            stored_revision: Household revision read from the database
+        """
+        with self._lock:
+            previous = self._stored_revisions.get(user_id)
+            self._stored_revisions[user_id] = stored_revision
+            # Ledgers cached before the first sync may predate any stored revision
+            moved = previous != stored_revision and (
+                previous is not None or any(key[0] == user_id for key in self._entries)
+            )
+        if moved:
+            self.invalidate_user(user_id)
+
+    def subscribe(self, listener: Callable[[int], None]) -> None:
+        """Call a listener with the user id after each `invalidate_user`."""
+        self._listeners.append(listener)
+
+    def clear(self) -> None:
+        """Drop every cached ledger."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and eviction counters with the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size
+            }
+
+
+# Shared cache for the projection endpoints, invalidated by the CRUD routers
+projection_cache = ProjectionCache(
+    max_size=settings.PROJECTION_CACHE_SIZE,
+    ttl_seconds=settings.PROJECTION_CACHE_TTL_SECONDS
+)
+
+
+# Cache counters served on /api/metrics
+register_stats(
+    "wealthsphere_projection_cache",
+    projection_cache.stats,
+    (
+        ("hits", "counter", "Projection cache hits."),
+        ("misses", "counter", "Projection cache misses."),
+        ("evictions", "counter", "Projection cache entries evicted for size or age."),
+        ("size", "gauge", "Projection ledgers currently cached."),
+    )
+)
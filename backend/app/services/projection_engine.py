@@ -0,0 +1,786 @@
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.metrics import PROJECTION_ACCOUNTS, PROJECTION_RUNS, PROJECTION_YEARS
+from app.models import AccountType, AssetType
+from app.services.household_plan import HouseholdPlan, bucket_accounts_by_type
+from app.services.calculations import (
+    WITHDRAWAL_ORDER,
+    calculate_rrsp_to_rrif_conversion,
+    calculate_rrif_minimum_withdrawal,
+    calculate_withdrawal_allocation,
+    calculate_death_benefit
+)
+
+
+# Net worth categories, in the order used for the category axis of the arrays
+NET_WORTH_CATEGORIES = [
+    "rrsp_total",
+    "tfsa_total",
+    "non_registered_total",
+    "rrif_total",
+    "other_investments_total",
+    "property_total",
+    "business_total",
+    "other_assets_total",
+]
+
+RRSP, TFSA, NON_REGISTERED, RRIF, OTHER_INVESTMENTS, PROPERTY, BUSINESS, OTHER_ASSETS = range(
+    len(NET_WORTH_CATEGORIES)
+)
+
+ACCOUNT_CATEGORIES = {
+    AccountType.RRSP: RRSP,
+    AccountType.TFSA: TFSA,
+    AccountType.NON_REGISTERED: NON_REGISTERED,
+    AccountType.RRIF: RRIF,
+}
+
+ASSET_CATEGORIES = {
+    AssetType.PRIMARY_RESIDENCE: PROPERTY,
+    AssetType.SECONDARY_PROPERTY: PROPERTY,
+    AssetType.BUSINESS: BUSINESS,
+}
+
+
+def calculate_conversion_columns(plan: HouseholdPlan) -> np.ndarray:
+    """
+    Find the first projection year in which each RRSP converts to a RRIF.
+
+    Args:
+        plan: The compiled household plan
+
+    Returns:
+        Integer array with the year index of the conversion for each account,
+        or the number of years when the account never converts
+    """
+    columns = np.full(len(plan.investment_accounts), len(plan.years), dtype=np.int64)
+
+    for row in plan.accounts_by_type.get(AccountType.RRSP, []):
+        account = plan.investment_accounts[row]
+        if account.family_member_id not in plan.members_by_id:
+            continue
+
+        for column, year in enumerate(plan.years.tolist()):
+            if calculate_rrsp_to_rrif_conversion(plan, account, year):
+                columns[row] = column
+                break
+
+    return columns
+
+
+def account_types_for_year(
+    plan: HouseholdPlan,
+    conversion_columns: np.ndarray,
+    column: int
+) -> List[AccountType]:
+    """Type of every account in a given year, after any RRIF conversion."""
+    return [
+        AccountType.RRIF if column >= conversion_column else account.account_type
+        for account, conversion_column in zip(plan.investment_accounts, conversion_columns.tolist())
+    ]
+
+
+def active_accounts_by_type(
+    plan: HouseholdPlan,
+    conversion_columns: np.ndarray,
+    column: int
+) -> Dict[AccountType, List[int]]:
+    """
+    Group the rows of the accounts of living members by their type in a given year.
+
+    Reuses the plan's grouping unless an RRSP has converted to a RRIF by then.
+
+    Args:
+        plan: The compiled household plan
+        conversion_columns: Year index of each account's RRIF conversion
+        column: Index of the projection year
+
+    Returns:
+        Dict mapping account type to the rows of that type
+    """
+    alive = plan.account_alive[:, column]
+    if (conversion_columns <= column).any():
+        account_types = account_types_for_year(plan, conversion_columns, column)
+        return bucket_accounts_by_type(account_types, np.flatnonzero(alive).tolist())
+
+    return {
+        account_type: [row for row in rows if alive[row]]
+        for account_type, rows in plan.accounts_by_type.items()
+    }
+
+
+def calculate_account_category_matrix(
+    plan: HouseholdPlan,
+    conversion_columns: np.ndarray
+) -> np.ndarray:
+    """
+    Assign every account a net worth category for every year.
+
+    RRSPs are reported as RRIFs from their conversion year onwards.
+
+    Args:
+        plan: The compiled household plan
+        conversion_columns: Year index of each account's RRIF conversion
+
+    Returns:
+        Integer array of shape (accounts, years) with category indexes
+    """
+    categories = np.array(
+        [ACCOUNT_CATEGORIES.get(account.account_type, OTHER_INVESTMENTS) for account in plan.investment_accounts],
+        dtype=np.int64
+    )
+    converted = np.arange(len(plan.years))[None, :] >= conversion_columns[:, None]
+    return np.where(converted, RRIF, categories[:, None])
+
+
+def calculate_amount_matrix(
+    amounts: Sequence[float],
+    growth_rates: Sequence[float],
+    start_years: Sequence[int],
+    end_years: Sequence[Optional[int]],
+    years: np.ndarray
+) -> np.ndarray:
+    """
+    Project recurring amounts (income or expenses) for every year.
+
+    Mirrors `calculate_income_for_year` and `calculate_expense_for_year`:
+    amounts grow from their start year and are zero outside their range.
+
+    Args:
+        amounts: Annual amount of each item
+        growth_rates: Expected annual growth rate of each item
+        start_years: First year of each item
+        end_years: Last year of each item (None when open-ended)
+        years: Array of projection years
+
+    Returns:
+        Array of shape (items, years) with projected amounts
+    """
+    if not len(amounts):
+        return np.zeros((0, len(years)))
+
+    amounts = np.array(amounts, dtype=float)
+    growth = 1 + np.array(growth_rates, dtype=float)
+    start = np.array(start_years, dtype=np.int64)
+    end = np.array([end_year or np.iinfo(np.int64).max for end_year in end_years], dtype=np.int64)
+
+    years_of_growth = years[None, :] - start[:, None]
+    active = (years_of_growth >= 0) & (years[None, :] <= end[:, None])
+    projected = amounts[:, None] * np.power(growth[:, None], np.maximum(years_of_growth, 0))
+    return np.where(active, projected, 0.0)
+
+
+def calculate_premium_matrix(plan: HouseholdPlan) -> np.ndarray:
+    """
+    Project insurance premiums for every year a policy is active on December 31.
+
+    Args:
+        plan: The compiled household plan
+
+    Returns:
+        Array of shape (policies, years) with premiums
+    """
+    years = plan.years
+    if not plan.insurance_policies:
+        return np.zeros((0, len(years)))
+
+    first_years = []
+    last_years = []
+    for policy in plan.insurance_policies:
+        first_years.append(policy.start_date.year if policy.start_date else np.iinfo(np.int64).min)
+        if policy.end_date is None:
+            last_years.append(np.iinfo(np.int64).max)
+        elif (policy.end_date.month, policy.end_date.day) == (12, 31):
+            last_years.append(policy.end_date.year)
+        else:
+            last_years.append(policy.end_date.year - 1)
+
+    premiums = np.array([policy.premium_amount or 0.0 for policy in plan.insurance_policies])
+    active = (
+        (years[None, :] >= np.array(first_years, dtype=np.int64)[:, None])
+        & (years[None, :] <= np.array(last_years, dtype=np.int64)[:, None])
+    )
+    return np.where(active, premiums[:, None], 0.0)
+
+
+def calculate_asset_value_matrix(plan: HouseholdPlan, current_year: int) -> np.ndarray:
+    """
+    Project the value of every asset for every year.
+
+    Args:
+        plan: The compiled household plan
+        current_year: The current year
+
+    Returns:
+        Array of shape (assets, years) with projected values
+    """
+    if not plan.assets:
+        return np.zeros((0, len(plan.years)))
+
+    values = np.array([asset.current_value or 0.0 for asset in plan.assets])
+    appreciation = np.array([asset.expected_annual_appreciation or 0.0 for asset in plan.assets])
+    years_of_growth = (plan.years - current_year).astype(float)
+
+    return values[:, None] * np.power(1 + appreciation[:, None], years_of_growth[None, :])
+
+
+def calculate_asset_categories(plan: HouseholdPlan) -> np.ndarray:
+    """Assign every asset its net worth category index."""
+    return np.array(
+        [ASSET_CATEGORIES.get(asset.asset_type, OTHER_ASSETS) for asset in plan.assets],
+        dtype=np.int64
+    )
+
+
+def calculate_net_worth_totals(values: np.ndarray, categories: np.ndarray) -> np.ndarray:
+    """
+    Reduce projected values into net worth totals by category.
+
+    Args:
+        values: Array of shape (items, years) with projected values
+        categories: Integer array of shape (items, years) with category indexes
+
+    Returns:
+        Array of shape (categories, years) following NET_WORTH_CATEGORIES
+    """
+    category_axis = np.arange(len(NET_WORTH_CATEGORIES))[:, None, None]
+    return np.where(categories[None, :, :] == category_axis, values[None, :, :], 0.0).sum(axis=1)
+
+
+def summarize_net_worth(
+    years: np.ndarray,
+    values: np.ndarray,
+    categories: np.ndarray
+) -> Dict[str, Dict[str, float]]:
+    """
+    Reduce projected values into yearly net worth totals by category.
+
+    Args:
+        years: Array of projection years
+        values: Array of shape (items, years) with projected values
+        categories: Integer array of shape (items, years) with category indexes
+
+    Returns:
+        Dict keyed by year with the total net worth and each category total
+    """
+    totals = calculate_net_worth_totals(values, categories)
+    net_worth = totals.sum(axis=0)
+
+    columns = dict(zip(NET_WORTH_CATEGORIES, totals.tolist()))
+    yearly_projections = {}
+    for column, year in enumerate(years.tolist()):
+        projection = {"total_net_worth": net_worth[column].item()}
+        for category in NET_WORTH_CATEGORIES:
+            projection[category] = columns[category][column]
+        yearly_projections[str(year)] = projection
+
+    return yearly_projections
+
+
+def calculate_cash_flow_arrays(plan: HouseholdPlan) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Project total income and total expenses (premiums included) for every year.
+
+    Only income and premiums of living members count; expenses count when
+    they belong to the whole family or to a living member.
+
+    Args:
+        plan: The compiled household plan
+
+    Returns:
+        Tuple of (total income, total expenses) arrays over the years
+    """
+    income = calculate_amount_matrix(
+        [source.amount or 0.0 for source in plan.income_sources],
+        [source.expected_growth_rate or 0.0 for source in plan.income_sources],
+        [source.start_year for source in plan.income_sources],
+        [source.end_year for source in plan.income_sources],
+        plan.years
+    ) * plan.income_alive
+    expense_amounts = calculate_amount_matrix(
+        [expense.amount or 0.0 for expense in plan.expenses],
+        [expense.expected_growth_rate or 0.0 for expense in plan.expenses],
+        [expense.start_year for expense in plan.expenses],
+        [expense.end_year for expense in plan.expenses],
+        plan.years
+    ) * plan.expense_alive
+    premiums = calculate_premium_matrix(plan) * plan.policy_alive
+    return income.sum(axis=0), expense_amounts.sum(axis=0) + premiums.sum(axis=0)
+
+
+def draw_down_arrays(
+    amounts: np.ndarray,
+    account_values: np.ndarray,
+    withdrawals: np.ndarray,
+    rows: Sequence[int]
+) -> np.ndarray:
+    """
+    Withdraw amounts from accounts in the given order, for many cases at once.
+
+    Each account gives what is left of its value (after earlier withdrawals)
+    until the amount of its case is covered. `withdrawals` is updated in place.
+
+    Args:
+        amounts: Array of shape (cases,) with the amount to withdraw
+        account_values: Array of shape (cases, accounts) with available values
+        withdrawals: Array of shape (cases, accounts) with withdrawals so far
+        rows: Rows of the accounts to draw from, in order
+
+    Returns:
+        Array of shape (cases,) with the amount left to withdraw (negative when over-withdrawn)
+    """
+    remaining = np.array(amounts, dtype=float)
+    for row in rows:
+        available = account_values[:, row] - withdrawals[:, row]
+        withdrawal = np.where(remaining > 0, np.minimum(available, remaining), 0.0)
+        withdrawals[:, row] += withdrawal
+        remaining -= withdrawal
+    return remaining
+
+
+def allocate_withdrawal_arrays(
+    shortfall: np.ndarray,
+    account_values: np.ndarray,
+    accounts_by_type: Dict[AccountType, List[int]],
+    ages: np.ndarray,
+    withdrawal_order: Sequence[Sequence[AccountType]] = WITHDRAWAL_ORDER
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized counterpart of `calculate_withdrawal_allocation`.
+
+    Applies the same ordering (RRIF minimums, then WITHDRAWAL_ORDER) to many
+    independent cases at once, e.g. one per simulated return path.
+
+    Args:
+        shortfall: Array of shape (cases,) with the amount to withdraw
+        account_values: Array of shape (cases, accounts) with available values
+        accounts_by_type: Rows of the active accounts, grouped by account type
+        ages: Holder age of each account this year
+        withdrawal_order: Tiers of account types to draw down after RRIF minimums
+
+    Returns:
+        Tuple of (withdrawals of shape (cases, accounts), unfunded amount of shape (cases,))
+    """
+    withdrawals = np.zeros_like(account_values)
+    remaining_shortfall = np.array(shortfall, dtype=float)
+
+    # 1. First, withdraw required minimum from RRIFs (mandatory)
+    for row in accounts_by_type.get(AccountType.RRIF, []):
+        min_withdrawal = calculate_rrif_minimum_withdrawal(account_values[:, row], int(ages[row]))
+        withdrawals[:, row] = min_withdrawal
+        remaining_shortfall -= min_withdrawal
+
+    # 2. Then, draw down each tier of the withdrawal order until the shortfall is covered
+    rows = [row for tier in withdrawal_order for account_type in tier for row in accounts_by_type.get(account_type, [])]
+    remaining_shortfall = draw_down_arrays(remaining_shortfall, account_values, withdrawals, rows)
+
+    return withdrawals, np.maximum(0.0, remaining_shortfall)
+
+
+@dataclass
+class ProjectionYear:
+    """
+    Results of a single projection year.
+
+    Account arrays have shape (accounts,) and follow the order of the plan's
+    `investment_accounts`.
+    """
+    plan: HouseholdPlan
+    conversion_columns: np.ndarray
+    column: int
+    start_balances: np.ndarray
+    withdrawals: np.ndarray
+    end_balances: np.ndarray
+    total_income: float
+    total_expenses: float
+    shortfall: float
+    unfunded_amount: float
+    death_benefits: List[Dict]
+
+    @property
+    def year(self) -> int:
+        """The calendar year."""
+        return int(self.plan.years[self.column])
+
+    @property
+    def net_cash_flow(self) -> float:
+        """Income minus expenses."""
+        return self.total_income - self.total_expenses
+
+    def cash_flow(self) -> Dict:
+        """Income, expenses, withdrawals and death benefits for the year."""
+        accounts = self.plan.investment_accounts
+        withdrawal_strategy = None
+        if self.net_cash_flow < 0:
+            alive_rows = np.flatnonzero(self.plan.account_alive[:, self.column]).tolist()
+            withdrawal_strategy = {
+                "shortfall": self.shortfall,
+                "withdrawals": {
+                    str(accounts[row].id): self.withdrawals[row].item()
+                    for row in alive_rows if self.withdrawals[row] > 0
+                },
+                "remaining_balance": {
+                    str(accounts[row].id): self.end_balances[row].item()
+                    for row in alive_rows
+                },
+                "unfunded_amount": self.unfunded_amount
+            }
+
+        return {
+            "total_income": self.total_income,
+            "total_expenses": self.total_expenses,
+            "net_cash_flow": self.net_cash_flow,
+            "withdrawal_strategy": withdrawal_strategy,
+            "death_benefits": self.death_benefits
+        }
+
+    def detailed_withdrawals(self) -> Dict:
+        """Withdrawals with start and end values for every account in the year."""
+        account_details = {}
+        account_types = account_types_for_year(self.plan, self.conversion_columns, self.column)
+        # Only include accounts of living members
+        for row in np.flatnonzero(self.plan.account_alive[:, self.column]).tolist():
+            account = self.plan.investment_accounts[row]
+            account_details[str(account.id)] = {
+                "account_name": account.name,
+                "account_type": account_types[row],
+                "family_member_name": self.plan.member_name(account.family_member_id),
+                "start_value": self.start_balances[row].item(),  # before withdrawal
+                "withdrawal": self.withdrawals[row].item(),
+                "end_value": self.end_balances[row].item(),  # after withdrawal
+            }
+
+        return {
+            "shortfall": self.shortfall,
+            "unfunded_amount": self.unfunded_amount,
+            "account_details": account_details
+        }
+
+
+@dataclass
+class ProjectionLedger:
+    """
+    Complete per-year results of a projection run.
+
+    Account arrays have shape (accounts, years) and follow the order of the
+    plan's `investment_accounts`; yearly arrays have shape (years,). A ledger
+    may cover only the first years of its plan (see `slice`).
+    """
+    plan: HouseholdPlan
+    years: np.ndarray
+    conversion_columns: np.ndarray
+    start_balances: np.ndarray
+    withdrawals: np.ndarray
+    end_balances: np.ndarray
+    asset_values: np.ndarray
+    asset_categories: np.ndarray
+    total_income: np.ndarray
+    total_expenses: np.ndarray
+    shortfall: np.ndarray
+    unfunded_amount: np.ndarray
+    death_benefits: List[List[Dict]]
+
+    @property
+    def start_year(self) -> int:
+        """The first projection year."""
+        return int(self.years[0])
+
+    @property
+    def end_year(self) -> int:
+        """The last projection year."""
+        return int(self.years[-1])
+
+    @property
+    def net_cash_flow(self) -> np.ndarray:
+        """Income minus expenses for each year."""
+        return self.total_income - self.total_expenses
+
+    def _net_worth_inputs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Values and category indexes of every account and asset."""
+        values = np.vstack([self.end_balances, self.asset_values])
+        categories = np.vstack([
+            calculate_account_category_matrix(self.plan, self.conversion_columns)[:, :len(self.years)],
+            np.repeat(self.asset_categories[:, None], len(self.years), axis=1),
+        ])
+        return values, categories
+
+    def net_worth(self) -> Dict[str, Dict[str, float]]:
+        """Yearly net worth with a breakdown by category."""
+        return summarize_net_worth(self.years, *self._net_worth_inputs())
+
+    def year(self, column: int) -> "ProjectionYear":
+        """Results of the year at the given column."""
+        return ProjectionYear(
+            plan=self.plan,
+            conversion_columns=self.conversion_columns,
+            column=column,
+            start_balances=self.start_balances[:, column],
+            withdrawals=self.withdrawals[:, column],
+            end_balances=self.end_balances[:, column],
+            total_income=self.total_income[column].item(),
+            total_expenses=self.total_expenses[column].item(),
+            shortfall=self.shortfall[column].item(),
+            unfunded_amount=self.unfunded_amount[column].item(),
+            death_benefits=self.death_benefits[column]
+        )
+
+    def iter_years(self) -> Iterator["ProjectionYear"]:
+        """Results of every year, in order."""
+        return (self.year(column) for column in range(len(self.years)))
+
+    def cash_flow(self) -> Dict[str, Dict]:
+        """Yearly income, expenses, withdrawals and death benefits."""
+        return {str(year.year): year.cash_flow() for year in self.iter_years()}
+
+    def detailed_withdrawals(self) -> Dict[str, Dict]:
+        """Yearly withdrawals with start and end values for every account."""
+        return {str(year.year): year.detailed_withdrawals() for year in self.iter_years()}
+
+    def slice(self, end_year: int) -> "ProjectionLedger":
+        """
+        Restrict the ledger to the years up to end_year.
+
+        Every year only depends on the years before it, so the first years of
+        a longer projection are identical to a shorter projection.
+
+        Args:
+            end_year: The last year to keep
+
+        Returns:
+            A ledger sharing this ledger's plan and array data
+        """
+        count = end_year - self.start_year + 1
+        return replace(
+            self,
+            years=self.years[:count],
+            start_balances=self.start_balances[:, :count],
+            withdrawals=self.withdrawals[:, :count],
+            end_balances=self.end_balances[:, :count],
+            asset_values=self.asset_values[:, :count],
+            total_income=self.total_income[:count],
+            total_expenses=self.total_expenses[:count],
+            shortfall=self.shortfall[:count],
+            unfunded_amount=self.unfunded_amount[:count],
+            death_benefits=self.death_benefits[:count]
+        )
+
+    def columnar(self, views: Sequence[str]) -> Dict:
+        """
+        Columnar form of the selected views.
+
+        Values are arrays over the `years` axis instead of dicts keyed by
+        year, and account and member details are listed once.
+
+        Args:
+            views: Views to include, any of "net_worth", "cash_flow" and "withdrawals"
+
+        Returns:
+            Dict of metadata lists and numpy arrays
+        """
+        plan = self.plan
+        accounts = plan.investment_accounts
+        result = {
+            "years": self.years,
+            "family_members": [
+                {"id": member.id, "name": plan.member_name(member.id)} for member in plan.family_members
+            ],
+            "accounts": [
+                {
+                    "id": account.id,
+                    "name": account.name,
+                    "account_type": account.account_type,
+                    "family_member_id": account.family_member_id,
+                    "rrif_conversion_year": (
+                        int(self.years[column]) if column < len(self.years) else None
+                    )
+                }
+                for account, column in zip(accounts, self.conversion_columns.tolist())
+            ],
+        }
+
+        if "net_worth" in views:
+            totals = calculate_net_worth_totals(*self._net_worth_inputs())
+            result["net_worth"] = {"total_net_worth": totals.sum(axis=0), **dict(zip(NET_WORTH_CATEGORIES, totals))}
+
+        if "cash_flow" in views:
+            result["cash_flow"] = {
+                "total_income": self.total_income,
+                "total_expenses": self.total_expenses,
+                "net_cash_flow": self.net_cash_flow,
+                "shortfall": self.shortfall,
+                "unfunded_amount": self.unfunded_amount,
+            }
+            benefits = [
+                (int(year), benefit)
+                for year, year_benefits in zip(self.years, self.death_benefits)
+                for benefit in year_benefits
+            ]
+            result["death_benefits"] = {
+                "year": [year for year, _ in benefits],
+                "family_member_id": [benefit["family_member_id"] for _, benefit in benefits],
+                "benefit_amount": [benefit["benefit_amount"] for _, benefit in benefits],
+            }
+
+        if "withdrawals" in views:
+            result["withdrawals"] = {
+                "shortfall": self.shortfall,
+                "unfunded_amount": self.unfunded_amount,
+                "active": plan.account_alive[:, :len(self.years)],
+                "start_value": self.start_balances,
+                "withdrawal": self.withdrawals,
+                "end_value": self.end_balances,
+            }
+
+        return result
+
+    def full(self) -> Dict[str, Dict]:
+        """All projection views derived from this run."""
+        return {
+            "net_worth": self.net_worth(),
+            "cash_flow": self.cash_flow(),
+            "detailed_withdrawals": self.detailed_withdrawals()
+        }
+
+
+def calculate_death_benefit_schedule(plan: HouseholdPlan) -> List[List[Dict]]:
+    """
+    List the death benefits paid in every projection year.
+
+    Benefits are paid in the last year a member is alive.
+
+    Args:
+        plan: The compiled household plan
+
+    Returns:
+        One list of death benefits per projection year
+    """
+    death_benefits = [[] for _ in range(len(plan.years))]
+    for member in plan.family_members:
+        death_year = plan.death_years[member.id]
+        if plan.start_year <= death_year <= plan.end_year:
+            benefit = calculate_death_benefit(plan, member.id, death_year)
+            if benefit > 0:
+                death_benefits[death_year - plan.start_year].append({
+                    "family_member_id": member.id,
+                    "family_member_name": plan.member_name(member.id),
+                    "benefit_amount": benefit
+                })
+    return death_benefits
+
+
+def iterate_projection(plan: HouseholdPlan) -> Iterator[ProjectionYear]:
+    """
+    Run a projection and yield each year as soon as it is computed.
+
+    Income, expenses and premiums are projected as arrays up front. Account
+    balances are then carried year to year: each account grows by its
+    expected return, and when expenses exceed income the shortfall is
+    withdrawn in the order of `calculate_withdrawal_allocation`.
+
+    Args:
+        plan: The compiled household plan
+
+    Yields:
+        The results of each projection year, in order
+    """
+    accounts = plan.investment_accounts
+    PROJECTION_RUNS.inc(labels=("ledger",))
+    PROJECTION_ACCOUNTS.inc(len(accounts), ("ledger",))
+
+    total_income, total_expenses = calculate_cash_flow_arrays(plan)
+    shortfall = np.maximum(0.0, total_expenses - total_income)
+    death_benefits = calculate_death_benefit_schedule(plan)
+
+    # Account balances, carried from one year to the next
+    conversion_columns = calculate_conversion_columns(plan)
+    returns = np.array([account.expected_return_rate or 0.0 for account in accounts])
+    balances = np.array([account.current_balance or 0.0 for account in accounts])
+
+    for column in range(len(plan.years)):
+        grown = np.where(plan.account_alive[:, column], balances * (1 + returns), 0.0)
+        withdrawals = np.zeros(len(accounts))
+        balances = grown
+        unfunded_amount = 0.0
+
+        if shortfall[column] > 0:
+            accounts_by_type = active_accounts_by_type(plan, conversion_columns, column)
+            rows = [row for bucket in accounts_by_type.values() for row in bucket]
+            allocation = calculate_withdrawal_allocation(
+                shortfall[column].item(),
+                accounts_by_type,
+                {row: grown[row].item() for row in rows},
+                {row: int(plan.account_ages[row, column]) for row in rows}
+            )
+            for row, withdrawal in allocation["withdrawals"].items():
+                withdrawals[row] = withdrawal
+            balances = np.maximum(0.0, grown - withdrawals)
+            unfunded_amount = float(allocation["unfunded_amount"])
+
+        PROJECTION_YEARS.inc(labels=("ledger",))
+        yield ProjectionYear(
+            plan=plan,
+            conversion_columns=conversion_columns,
+            column=column,
+            start_balances=grown,
+            withdrawals=withdrawals,
+            end_balances=balances,
+            total_income=total_income[column].item(),
+            total_expenses=total_expenses[column].item(),
+            shortfall=shortfall[column].item(),
+            unfunded_amount=unfunded_amount,
+            death_benefits=death_benefits[column]
+        )
+
+
+def run_projection(plan: HouseholdPlan, current_year: int) -> ProjectionLedger:
+    """
+    Run a projection once and record every year in a ledger.
+
+    Args:
+        plan: The compiled household plan
+        current_year: The current year
+
+    Returns:
+        The projection ledger
+    """
+    shape = (len(plan.investment_accounts), len(plan.years))
+    start_balances = np.zeros(shape)
+    withdrawals = np.zeros(shape)
+    end_balances = np.zeros(shape)
+    total_income = np.zeros(len(plan.years))
+    total_expenses = np.zeros(len(plan.years))
+    shortfall = np.zeros(len(plan.years))
+    unfunded_amount = np.zeros(len(plan.years))
+    death_benefits = []
+    conversion_columns = np.full(len(plan.investment_accounts), len(plan.years), dtype=np.int64)
+
+    for year in iterate_projection(plan):
+        column = year.column
+        conversion_columns = year.conversion_columns
+        start_balances[:, column] = year.start_balances
+        withdrawals[:, column] = year.withdrawals
+        end_balances[:, column] = year.end_balances
+        total_income[column] = year.total_income
+        total_expenses[column] = year.total_expenses
+        shortfall[column] = year.shortfall
+        unfunded_amount[column] = year.unfunded_amount
+        death_benefits.append(year.death_benefits)
+
+    return ProjectionLedger(
+        plan=plan,
+        years=plan.years,
+        conversion_columns=conversion_columns,
+        start_balances=start_balances,
+        withdrawals=withdrawals,
+        end_balances=end_balances,
+        asset_values=calculate_asset_value_matrix(plan, current_year),
+        asset_categories=calculate_asset_categories(plan),
+        total_income=total_income,
+        total_expenses=total_expenses,
+        shortfall=shortfall,
+        unfunded_amount=unfunded_amount,
+        death_benefits=death_benefits
+    )
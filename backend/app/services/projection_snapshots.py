@@ -0,0 +1,361 @@
+import asyncio
+import hashlib
+import json
+import threading
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.metrics import register_stats
+from app.db import AsyncSessionLocal
+from app.models import ProjectionSnapshot
+from app.services.household_snapshot import HouseholdSnapshot, load_household_snapshot
+from app.services.projection_cache import projection_cache
+from app.services.projection_engine import ProjectionLedger, run_projection
+
+logger = get_logger("projection_snapshots")
+
+
+# Every ledger view, stored in a snapshot so that any view can be served from it
+SNAPSHOT_VIEWS = ("net_worth", "cash_flow", "withdrawals")
+
+# Columnar groups of each ledger view; the other groups (years, members and
+# accounts) are part of every view
+COLUMNAR_GROUPS = {
+    "net_worth": ("net_worth",),
+    "cash_flow": ("cash_flow", "death_benefits"),
+    "withdrawals": ("withdrawals",),
+}
+
+# Separator of group and series names in the stored details
+SERIES_SEPARATOR = "."
+
+# zlib level of the stored arrays: most of the size gain at little CPU
+SERIES_COMPRESSION_LEVEL = 1
+
+
+def parameters_key(scenario_id: Optional[int], parameters: Dict[str, Any]) -> str:
+    """Hash identifying the snapshot of a scenario and parameter set."""
+    canonical = json.dumps({"scenario_id": scenario_id, "parameters": parameters}, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def encode_series(columns: Dict) -> Tuple[bytes, str]:
+    """
+    Split columnar data into a compressed array blob and JSON details.
+
+    Args:
+        columns: Columnar data from `ProjectionLedger.columnar`
+
+    Returns:
+        The zlib-compressed bytes of every numpy array, one after the other,
+        and the JSON of the key order, of the dtype and shape of each array
+        and of the other values (member, account and death benefit details)
+    """
+    arrays = []
+    layout = []
+    values = {}
+    for group, series in columns.items():
+        names = list(series) if isinstance(series, dict) else None
+        layout.append([group, names])
+        items = series.items() if names is not None else [(None, series)]
+        for name, value in items:
+            key = group if name is None else f"{group}{SERIES_SEPARATOR}{name}"
+            if isinstance(value, np.ndarray):
+                value = np.ascontiguousarray(value)
+                arrays.append(value)
+                values[key] = {"dtype": value.dtype.str, "shape": list(value.shape)}
+            else:
+                values[key] = {"value": value}
+
+    series = zlib.compress(b"".join(array.tobytes() for array in arrays), SERIES_COMPRESSION_LEVEL)
+    return series, json.dumps({"layout": layout, "values": values})
+
+
+def decode_series(series: bytes, details: str) -> Dict:
+    """Rebuild the columnar data stored by `encode_series`."""
+    stored = json.loads(details)
+    buffer = zlib.decompress(series)
+    offset = 0
+
+    def value(key: str) -> Any:
+        nonlocal offset
+        item = stored["values"][key]
+        if "value" in item:
+            return item["value"]
+        dtype = np.dtype(item["dtype"])
+        count = int(np.prod(item["shape"], dtype=np.int64))
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(item["shape"])
+        offset += count * dtype.itemsize
+        return array
+
+    columns = {}
+    for group, names in stored["layout"]:
+        if names is None:
+            columns[group] = value(group)
+        else:
+            columns[group] = {name: value(f"{group}{SERIES_SEPARATOR}{name}") for name in names}
+    return columns
+
+
+def select_views(columns: Dict, views: Sequence[str]) -> Dict:
+    """Keep the columnar groups of some ledger views, as `ProjectionLedger.columnar` would."""
+    excluded = {
+        group for view, groups in COLUMNAR_GROUPS.items() if view not in views for group in groups
+    }
+    return {group: series for group, series in columns.items() if group not in excluded}
+
+
+def project_snapshot_columns(
+    household: HouseholdSnapshot,
+    user_id: int,
+    revision: int,
+    parameters: Dict[str, Any],
+    current_year: int
+) -> Dict:
+    """
+    Columnar data of every view for a snapshot's parameters, from the
+    projection cache when possible. Called on a worker thread.
+    """
+    start_year, end_year = parameters["start_year"], parameters["end_year"]
+    ledger: Optional[ProjectionLedger] = projection_cache.get(user_id, revision, start_year, end_year, current_year)
+    if ledger is None:
+        ledger = run_projection(household.plan(start_year, end_year), current_year=current_year)
+        projection_cache.put(user_id, revision, current_year, ledger)
+    return ledger.columnar(SNAPSHOT_VIEWS)
+
+
+async def save_snapshot(
+    db: AsyncSession,
+    user_id: int,
+    scenario_id: Optional[int],
+    parameters: Dict[str, Any],
+    columns: Dict,
+    current_year: int
+) -> None:
+    """
+    Store the columnar projection of a scenario and parameter set.
+
+    The user's oldest snapshots are dropped beyond
+    PROJECTION_SNAPSHOTS_PER_USER. A snapshot inserted concurrently by
+    another request wins.
+
+    Args:
+        db: Database session
+        user_id: ID of the user owning the household
+        scenario_id: The scenario, if any
+        parameters: The projection parameters
+        columns: Columnar data of every view (see SNAPSHOT_VIEWS)
+        current_year: The current year the projection was computed for
+    """
+    key = parameters_key(scenario_id, parameters)
+    series, details = await run_in_threadpool(encode_series, columns)
+    values = {
+        "series": series,
+        "details": details,
+        "current_year": current_year,
+        "is_stale": False,
+        "computed_at": datetime.utcnow(),
+    }
+    updated = await db.execute(
+        update(ProjectionSnapshot)
+        .where(ProjectionSnapshot.user_id == user_id, ProjectionSnapshot.parameters_key == key)
+        .values(**values)
+    )
+    if updated.rowcount == 0:
+        db.add(ProjectionSnapshot(
+            user_id=user_id,
+            scenario_id=scenario_id,
+            parameters_key=key,
+            parameters=json.dumps(parameters, sort_keys=True),
+            **values
+        ))
+        try:
+            await db.flush()
+        except IntegrityError:
+            await db.rollback()
+            return
+
+    kept = (
+        select(ProjectionSnapshot.id)
+        .where(ProjectionSnapshot.user_id == user_id)
+        .order_by(ProjectionSnapshot.computed_at.desc(), ProjectionSnapshot.id.desc())
+        .limit(settings.PROJECTION_SNAPSHOTS_PER_USER)
+    )
+    await db.execute(
+        delete(ProjectionSnapshot)
+        .where(ProjectionSnapshot.user_id == user_id, ProjectionSnapshot.id.not_in(kept))
+    )
+    await db.commit()
+
+
+class SnapshotWorker:
+    """
+    Background task keeping projection snapshots up to date.
+
+    The projection cache notifies the worker of every household write. The
+    user's snapshots are marked stale right away, and recomputed once no
+    write has come in for `debounce_seconds`, so a burst of edits costs one
+    recompute. Work runs one item at a time on a single task started with
+    the application.
+    """
+
+    def __init__(self, debounce_seconds: float):
+        self.debounce_seconds = debounce_seconds
+        self.recomputes = 0
+        self.failures = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        # Users with writes not yet reflected in their snapshots, by write count
+        self._dirty: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker has been started on an event loop."""
+        return self._task is not None
+
+    def start(self) -> None:
+        """Start the worker on the running event loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the worker. Pending recomputes are dropped, their snapshots stay stale."""
+        if not self.running:
+            return
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._loop = self._queue = self._task = None
+
+    def is_dirty(self, user_id: int) -> bool:
+        """Whether a user's household changed since their snapshots were recomputed."""
+        with self._lock:
+            return user_id in self._dirty
+
+    def is_fresh(self, snapshot: ProjectionSnapshot) -> bool:
+        """Whether a snapshot can be served in place of a projection."""
+        return (
+            self.running
+            and not snapshot.is_stale
+            and snapshot.current_year == date.today().year
+            and not self.is_dirty(snapshot.user_id)
+        )
+
+    def notify(self, user_id: int) -> None:
+        """Schedule a recompute of a user's snapshots after a household write."""
+        loop = self._loop
+        if loop is None:
+            return
+        with self._lock:
+            self._dirty[user_id] = self._dirty.get(user_id, 0) + 1
+        loop.call_soon_threadsafe(self._schedule, user_id)
+
+    def _schedule(self, user_id: int) -> None:
+        if self._queue is None:
+            return
+        self._queue.put_nowait(("stale", user_id))
+        timer = self._timers.pop(user_id, None)
+        if timer is not None:
+            timer.cancel()
+        self._timers[user_id] = self._loop.call_later(
+            self.debounce_seconds, self._queue.put_nowait, ("recompute", user_id)
+        )
+
+    async def _run(self) -> None:
+        while True:
+            action, user_id = await self._queue.get()
+            try:
+                if action == "stale":
+                    await self._mark_stale(user_id)
+                else:
+                    self._timers.pop(user_id, None)
+                    await self._recompute(user_id)
+            except Exception:
+                self.failures += 1
+                logger.exception("Projection snapshot %s failed for user %s", action, user_id)
+
+    async def _mark_stale(self, user_id: int) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(ProjectionSnapshot)
+                .where(ProjectionSnapshot.user_id == user_id, ProjectionSnapshot.is_stale.is_(False))
+                .values(is_stale=True)
+            )
+            await db.commit()
+
+    async def _recompute(self, user_id: int) -> None:
+        with self._lock:
+            generation = self._dirty.get(user_id)
+        current_year = date.today().year
+        revision = projection_cache.revision(user_id)
+
+        async with AsyncSessionLocal() as db:
+            snapshots = (await db.scalars(
+                select(ProjectionSnapshot).where(ProjectionSnapshot.user_id == user_id)
+            )).all()
+            if snapshots:
+                household = await load_household_snapshot(db, user_id)
+                for snapshot in snapshots:
+                    columns = await run_in_threadpool(
+                        project_snapshot_columns,
+                        household,
+                        user_id,
+                        revision,
+                        json.loads(snapshot.parameters),
+                        current_year
+                    )
+                    snapshot.series, snapshot.details = await run_in_threadpool(encode_series, columns)
+                    snapshot.current_year = current_year
+                    snapshot.is_stale = False
+                    snapshot.computed_at = datetime.utcnow()
+                await db.commit()
+        self.recomputes += 1
+
+        # A write during the recompute has queued its own stale mark and recompute
+        with self._lock:
+            if self._dirty.get(user_id) == generation:
+                self._dirty.pop(user_id, None)
+        logger.debug("Recomputed %d projection snapshots for user %s", len(snapshots), user_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Recompute and failure counters with the users awaiting a recompute."""
+        with self._lock:
+            dirty = len(self._dirty)
+        return {"recomputes": self.recomputes, "failures": self.failures, "dirty_users": dirty}
+
+
+# Shared worker, started and stopped with the application
+snapshot_worker = SnapshotWorker(debounce_seconds=settings.PROJECTION_SNAPSHOT_DEBOUNCE_SECONDS)
+projection_cache.subscribe(snapshot_worker.notify)
+
+
+# Worker counters served on /api/metrics
+register_stats(
+    "wealthsphere_projection_snapshots",
+    snapshot_worker.stats,
+    (
+        ("recomputes", "counter", "Background recomputes of a user's projection snapshots."),
+        ("failures", "counter", "Projection snapshot updates that failed."),
+        ("dirty_users", "gauge", "Users whose snapshots await a recompute."),
+    )
+)
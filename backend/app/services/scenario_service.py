@@ -1,23 +1,24 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.scenario import Scenario
 
-def ensure_default_scenario(db: Session, user_id: int) -> Scenario:
+async def ensure_default_scenario(db: AsyncSession, user_id: int) -> Scenario:
     """
     Ensure the default 'Actual' scenario exists for the user.
     If it doesn't exist, create it.
     
     Args:
-        db: SQLAlchemy database session
+        db: SQLAlchemy async database session
         user_id: ID of the user to create the default scenario for
         
     Returns:
         The default scenario instance
     """
     # Check if the default scenario already exists for this user
-    default_scenario = db.query(Scenario).filter(
+    default_scenario = await db.scalar(select(Scenario).where(
         Scenario.user_id == user_id,
         Scenario.is_default == True
-    ).first()
+    ))
     
     # If default scenario doesn't exist, create it
     if not default_scenario:
@@ -29,7 +30,7 @@ def ensure_default_scenario(db: Session, user_id: int) -> Scenario:
             is_locked=True  # The default scenario is locked and cannot be deleted or renamed
         )
         db.add(default_scenario)
-        db.commit()
-        db.refresh(default_scenario)
+        await db.commit()
+        await db.refresh(default_scenario)
     
     return default_scenario 
\ No newline at end of file
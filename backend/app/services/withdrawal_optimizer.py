@@ -0,0 +1,514 @@
+import itertools
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.models import AccountType, IncomeType
+from app.services.calculations import (
+    WITHDRAWAL_ORDER,
+    calculate_tax_on_income,
+    calculate_oas_clawback
+)
+from app.services.household_plan import HouseholdPlan
+from app.services.projection_engine import (
+    active_accounts_by_type,
+    allocate_withdrawal_arrays,
+    calculate_amount_matrix,
+    calculate_cash_flow_arrays,
+    calculate_conversion_columns,
+    draw_down_arrays
+)
+
+logger = get_logger("withdrawal_optimizer")
+
+
+# Every ordering of the tiers of the default withdrawal order
+WITHDRAWAL_ORDERS = [list(order) for order in itertools.permutations(WITHDRAWAL_ORDER)]
+DEFAULT_ORDER_INDEX = WITHDRAWAL_ORDERS.index(WITHDRAWAL_ORDER)
+
+REGISTERED_TYPES = (AccountType.RRSP, AccountType.RRIF)
+
+# Objectives the optimizer can rank candidates by
+MIN_LIFETIME_TAX = "min_lifetime_tax"
+MAX_TERMINAL_ESTATE = "max_terminal_estate"
+
+
+@dataclass(frozen=True)
+class WithdrawalCandidate:
+    """
+    A withdrawal strategy: an ordering of the account tiers and an RRSP meltdown,
+    i.e. a fixed extra amount withdrawn from RRSPs/RRIFs every year while the
+    holder is younger than `meltdown_until_age`.
+    """
+    order_index: int
+    meltdown_amount: float
+    meltdown_until_age: int
+
+    @property
+    def withdrawal_order(self) -> List[List[AccountType]]:
+        """The tiers of account types in withdrawal order."""
+        return WITHDRAWAL_ORDERS[self.order_index]
+
+    def canonical(self) -> "WithdrawalCandidate":
+        """Same candidate with the stop age cleared when there is no meltdown."""
+        if self.meltdown_amount <= 0:
+            return WithdrawalCandidate(self.order_index, 0.0, 0)
+        return self
+
+
+@dataclass
+class OptimizerInputs:
+    """
+    Numeric form of a household plan used to evaluate candidates.
+
+    Holds only arrays and plain values, so it is cheap to send to worker processes.
+    Account arrays have shape (accounts, years); member arrays have shape (members, years).
+    """
+    years: np.ndarray
+    shortfall: np.ndarray
+    balances: np.ndarray
+    returns: np.ndarray
+    account_alive: np.ndarray
+    account_ages: np.ndarray
+    accounts_by_type: List[Dict[AccountType, List[int]]]
+    registered_rows: List[int]
+    registered_owners: np.ndarray
+    member_alive: np.ndarray
+    taxable_income: np.ndarray
+    oas_income: np.ndarray
+    meltdown_targets: np.ndarray
+    province: str
+
+
+def compile_optimizer_inputs(plan: HouseholdPlan, province: str) -> OptimizerInputs:
+    """
+    Extract the arrays needed to evaluate withdrawal strategies from a plan.
+
+    Each year, meltdown withdrawals are reinvested in the first
+    non-registered account of a living holder, or the first such TFSA when
+    there is none; years without either get no meltdown.
+
+    Args:
+        plan: The compiled household plan
+        province: Province code for tax calculations
+
+    Returns:
+        The optimizer inputs
+    """
+    accounts = plan.investment_accounts
+    total_income, total_expenses = calculate_cash_flow_arrays(plan)
+    conversion_columns = calculate_conversion_columns(plan)
+
+    # Member income, split into taxable income and OAS (subject to the clawback)
+    income = calculate_amount_matrix(
+        [source.amount or 0.0 for source in plan.income_sources],
+        [source.expected_growth_rate or 0.0 for source in plan.income_sources],
+        [source.start_year for source in plan.income_sources],
+        [source.end_year for source in plan.income_sources],
+        plan.years
+    ) * plan.income_alive
+    owners = np.zeros((len(plan.income_sources), len(plan.family_members)))
+    for row, source in enumerate(plan.income_sources):
+        if source.family_member_id in plan.member_rows:
+            owners[row, plan.member_rows[source.family_member_id]] = 1.0
+    taxable = np.array([source.is_taxable is not False for source in plan.income_sources], dtype=float)
+    oas = np.array([source.income_type == IncomeType.OAS for source in plan.income_sources], dtype=float)
+
+    registered_rows = [
+        row for row, account in enumerate(accounts)
+        if account.account_type in REGISTERED_TYPES and account.family_member_id in plan.member_rows
+    ]
+    registered_owners = np.zeros((len(accounts), len(plan.family_members)))
+    for row in registered_rows:
+        registered_owners[row, plan.member_rows[accounts[row].family_member_id]] = 1.0
+
+    # Account receiving the meltdown of each year, -1 when no account can
+    meltdown_targets = np.full(len(plan.years), -1, dtype=np.int64)
+    for account_type in (AccountType.TFSA, AccountType.NON_REGISTERED):
+        for row in reversed(plan.accounts_by_type.get(account_type, [])):
+            meltdown_targets[plan.account_alive[row]] = row
+
+    return OptimizerInputs(
+        years=plan.years,
+        shortfall=np.maximum(0.0, total_expenses - total_income),
+        balances=np.array([account.current_balance or 0.0 for account in accounts]),
+        returns=np.array([account.expected_return_rate or 0.0 for account in accounts]),
+        account_alive=plan.account_alive,
+        account_ages=plan.account_ages,
+        accounts_by_type=[
+            active_accounts_by_type(plan, conversion_columns, column) for column in range(len(plan.years))
+        ],
+        registered_rows=registered_rows,
+        registered_owners=registered_owners,
+        member_alive=plan.alive,
+        taxable_income=owners.T @ (income * taxable[:, None]),
+        oas_income=owners.T @ (income * oas[:, None]),
+        meltdown_targets=meltdown_targets,
+        province=province
+    )
+
+
+def calculate_member_tax(
+    inputs: OptimizerInputs,
+    column: int,
+    registered_withdrawals: np.ndarray
+) -> np.ndarray:
+    """
+    Income tax and OAS clawback of every living member for a year.
+
+    Args:
+        inputs: The optimizer inputs
+        column: Index of the projection year
+        registered_withdrawals: Array of shape (cases, members) with RRSP/RRIF withdrawals
+
+    Returns:
+        Array of shape (cases,) with the household's tax for the year
+    """
+    income = inputs.taxable_income[:, column][None, :] + registered_withdrawals
+    clawback = np.minimum(calculate_oas_clawback(income), inputs.oas_income[:, column][None, :])
+    tax = calculate_tax_on_income(income, inputs.province) + clawback
+    return (tax * inputs.member_alive[:, column][None, :]).sum(axis=1)
+
+
+def evaluate_candidates(
+    inputs: OptimizerInputs,
+    order_index: int,
+    meltdown_amounts: np.ndarray,
+    meltdown_until_ages: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate candidates sharing a withdrawal order, all at once.
+
+    Candidates are the cases of the vectorized withdrawal allocation. Each
+    year, the shortfall plus last year's tax is withdrawn in the candidate's
+    order, then the meltdown is withdrawn from RRSPs/RRIFs and reinvested
+    (see `compile_optimizer_inputs`).
+    Withdrawals from RRSPs/RRIFs are taxed as their holder's income, along
+    with their taxable income sources; tax is paid the following year.
+    Registered balances left at the end are taxed as a deemed withdrawal.
+
+    Args:
+        inputs: The optimizer inputs
+        order_index: Index of the withdrawal order in WITHDRAWAL_ORDERS
+        meltdown_amounts: Array of shape (cases,) with annual meltdown amounts
+        meltdown_until_ages: Array of shape (cases,) with the age meltdowns stop at
+
+    Returns:
+        Dict with per-case "lifetime_tax", "terminal_estate" and "unfunded_amount",
+        and per-case, per-year "tax" and "meltdown"
+    """
+    num_cases = len(meltdown_amounts)
+    num_years = len(inputs.years)
+    withdrawal_order = WITHDRAWAL_ORDERS[order_index]
+
+    balances = np.tile(inputs.balances, (num_cases, 1))
+    tax_due = np.zeros(num_cases)
+    taxes = np.zeros((num_cases, num_years))
+    meltdowns = np.zeros((num_cases, num_years))
+    unfunded = np.zeros(num_cases)
+
+    for column in range(num_years):
+        grown = np.where(inputs.account_alive[:, column], balances * (1 + inputs.returns), 0.0)
+        ages = inputs.account_ages[:, column]
+
+        need = inputs.shortfall[column] + tax_due
+        withdrawals, unfunded_amount = allocate_withdrawal_arrays(
+            need, grown, inputs.accounts_by_type[column], ages, withdrawal_order
+        )
+        withdrawals[need <= 0] = 0.0
+        unfunded += unfunded_amount
+
+        # Meltdown from the registered accounts of holders below the stop age,
+        # only in years with a living holder's account to reinvest it in
+        target = inputs.meltdown_targets[column]
+        melt = np.zeros_like(grown)
+        if target >= 0:
+            eligible = inputs.account_alive[:, column][None, :] & (ages[None, :] < meltdown_until_ages[:, None])
+            draw_down_arrays(
+                meltdown_amounts,
+                np.where(eligible, grown - withdrawals, 0.0),
+                melt,
+                inputs.registered_rows
+            )
+        balances = np.maximum(0.0, grown - withdrawals - melt)
+        meltdowns[:, column] = melt.sum(axis=1)
+        if target >= 0:
+            balances[:, target] += meltdowns[:, column]
+
+        taxes[:, column] = calculate_member_tax(
+            inputs, column, (withdrawals + melt) @ inputs.registered_owners
+        )
+        tax_due = taxes[:, column]
+
+    deemed_tax = calculate_tax_on_income(balances @ inputs.registered_owners, inputs.province).sum(axis=1)
+    return {
+        "lifetime_tax": taxes.sum(axis=1) + deemed_tax,
+        "terminal_estate": balances.sum(axis=1) - tax_due - deemed_tax,
+        "unfunded_amount": unfunded,
+        "tax": taxes,
+        "meltdown": meltdowns
+    }
+
+
+def evaluate_candidate_group(
+    inputs: OptimizerInputs,
+    candidates: List[WithdrawalCandidate]
+) -> List[Dict]:
+    """Evaluate candidates sharing a withdrawal order and split the results per candidate."""
+    results = evaluate_candidates(
+        inputs,
+        candidates[0].order_index,
+        np.array([candidate.meltdown_amount for candidate in candidates], dtype=float),
+        np.array([candidate.meltdown_until_age for candidate in candidates], dtype=np.int64)
+    )
+    return [
+        {
+            "lifetime_tax": results["lifetime_tax"][case].item(),
+            "terminal_estate": results["terminal_estate"][case].item(),
+            "unfunded_amount": results["unfunded_amount"][case].item(),
+            "tax": results["tax"][case],
+            "meltdown": results["meltdown"][case]
+        }
+        for case in range(len(candidates))
+    ]
+
+
+class CandidateMemo:
+    """
+    Bounded LRU memo of candidate evaluations.
+
+    Keys combine a household key (user, revision and parameters) with the
+    candidate, so repeated searches and overlapping refinement steps reuse
+    earlier evaluations.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Hashable, WithdrawalCandidate], Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, household_key: Hashable, candidate: WithdrawalCandidate) -> Optional[Dict]:
+        """Return a memoized evaluation, or None."""
+        with self._lock:
+            result = self._entries.get((household_key, candidate))
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((household_key, candidate))
+            self.hits += 1
+            return result
+
+    def put(self, household_key: Hashable, candidate: WithdrawalCandidate, result: Dict) -> None:
+        """Memoize an evaluation."""
+        with self._lock:
+            self._entries[(household_key, candidate)] = result
+            self._entries.move_to_end((household_key, candidate))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+candidate_memo = CandidateMemo(settings.OPTIMIZER_MEMO_SIZE)
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def start_process_pool() -> None:
+    """
+    Create the shared process pool for candidate evaluation, unless
+    OPTIMIZER_WORKERS runs evaluations inline. Called on application startup.
+
+    Workers are spawned rather than forked: by the time the pool is created
+    the process runs the event loop and other threads, and a forked child
+    could inherit locks they hold.
+    """
+    global _process_pool
+    if settings.OPTIMIZER_WORKERS <= 1:
+        return
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=settings.OPTIMIZER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared process pool. Called on application shutdown."""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool for candidate evaluation, or None when running inline."""
+    with _process_pool_lock:
+        return _process_pool
+
+
+def discard_process_pool(pool: ProcessPoolExecutor) -> None:
+    """Replace a broken process pool with a new one, unless another caller already did."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not pool:
+            return
+        _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+    start_process_pool()
+
+
+def evaluate(
+    inputs: OptimizerInputs,
+    household_key: Hashable,
+    candidates: Sequence[WithdrawalCandidate]
+) -> Dict[WithdrawalCandidate, Dict]:
+    """
+    Evaluate candidates, reusing memoized results.
+
+    Candidates missing from the memo are grouped by withdrawal order and each
+    group is evaluated in one vectorized pass, in parallel across the process
+    pool when it is running (inline otherwise, or when the pool broke).
+
+    Args:
+        inputs: The optimizer inputs
+        household_key: Key identifying the household and parameters in the memo
+        candidates: Candidates to evaluate
+
+    Returns:
+        Dict mapping each candidate to its evaluation
+    """
+    evaluations = {}
+    groups: Dict[int, List[WithdrawalCandidate]] = {}
+    for candidate in dict.fromkeys(candidate.canonical() for candidate in candidates):
+        result = candidate_memo.get(household_key, candidate)
+        if result is not None:
+            evaluations[candidate] = result
+        else:
+            groups.setdefault(candidate.order_index, []).append(candidate)
+
+    pool = get_process_pool() if len(groups) > 1 else None
+    group_results = None
+    if pool is not None:
+        try:
+            futures = [pool.submit(evaluate_candidate_group, inputs, group) for group in groups.values()]
+            group_results = [future.result() for future in futures]
+        except BrokenProcessPool:
+            # A worker died; later calls get a new pool and this one runs inline
+            logger.warning("Optimizer process pool is broken, evaluating inline")
+            discard_process_pool(pool)
+    if group_results is None:
+        group_results = [evaluate_candidate_group(inputs, group) for group in groups.values()]
+
+    for group, results in zip(groups.values(), group_results):
+        for candidate, result in zip(group, results):
+            candidate_memo.put(household_key, candidate, result)
+            evaluations[candidate] = result
+
+    return evaluations
+
+
+def rank_key(evaluation: Dict, objective: str) -> Tuple[float, float]:
+    """Sort key ranking funded strategies first, then by the objective."""
+    # Shortfalls under a dollar are rounding noise
+    unfunded = round(evaluation["unfunded_amount"])
+    if objective == MAX_TERMINAL_ESTATE:
+        return unfunded, -evaluation["terminal_estate"]
+    return unfunded, evaluation["lifetime_tax"]
+
+
+def describe_candidate(candidate: WithdrawalCandidate, evaluation: Dict) -> Dict:
+    """Summary of an evaluated candidate for the API response."""
+    return {
+        "strategy": {
+            "withdrawal_order": [[account_type.value for account_type in tier] for tier in candidate.withdrawal_order],
+            "meltdown_amount": candidate.meltdown_amount,
+            "meltdown_until_age": candidate.meltdown_until_age or None
+        },
+        "lifetime_tax": evaluation["lifetime_tax"],
+        "terminal_estate": evaluation["terminal_estate"],
+        "unfunded_amount": evaluation["unfunded_amount"]
+    }
+
+
+def optimize_withdrawals(
+    plan: HouseholdPlan,
+    province: str,
+    household_key: Hashable,
+    objective: str,
+    meltdown_amounts: Sequence[float],
+    meltdown_until_ages: Sequence[int],
+    refinement_rounds: int,
+    top_n: int
+) -> Dict:
+    """
+    Search withdrawal orderings and RRSP meltdown amounts for the best strategy.
+
+    The search evaluates the grid of every withdrawal order, meltdown amount
+    and stop age. Each refinement round then tries meltdown amounts halfway
+    between the best amount and its neighbours on the grid.
+
+    Args:
+        plan: The compiled household plan
+        province: Province code for tax calculations
+        household_key: Key identifying the household and parameters in the memo
+        objective: MIN_LIFETIME_TAX or MAX_TERMINAL_ESTATE
+        meltdown_amounts: Annual meltdown amounts to try
+        meltdown_until_ages: Ages at which meltdowns stop
+        refinement_rounds: Number of refinement rounds around the best amount
+        top_n: Number of best strategies to return
+
+    Returns:
+        Dict with the baseline (default order, no meltdown), the best strategy,
+        the top strategies and the best strategy's yearly tax and meltdown
+    """
+    inputs = compile_optimizer_inputs(plan, province)
+    hits_before = candidate_memo.hits
+
+    grid = [
+        WithdrawalCandidate(order_index, float(amount), int(until_age))
+        for order_index in range(len(WITHDRAWAL_ORDERS))
+        for amount in meltdown_amounts
+        for until_age in meltdown_until_ages
+    ]
+    baseline = WithdrawalCandidate(DEFAULT_ORDER_INDEX, 0.0, 0)
+    evaluations = evaluate(inputs, household_key, grid + [baseline])
+
+    amounts = sorted(set(float(amount) for amount in meltdown_amounts) | {0.0})
+    for _ in range(refinement_rounds):
+        best = min(evaluations, key=lambda candidate: rank_key(evaluations[candidate], objective))
+        position = amounts.index(best.meltdown_amount)
+        neighbours = amounts[max(0, position - 1):position + 2]
+        new_amounts = [(best.meltdown_amount + neighbour) / 2 for neighbour in neighbours if neighbour != best.meltdown_amount]
+        until_age = best.meltdown_until_age or max(meltdown_until_ages)
+        evaluations.update(evaluate(inputs, household_key, [
+            WithdrawalCandidate(best.order_index, amount, until_age) for amount in new_amounts
+        ]))
+        amounts = sorted(set(amounts) | set(new_amounts))
+
+    ranked = sorted(evaluations, key=lambda candidate: rank_key(evaluations[candidate], objective))
+    best = ranked[0]
+    return {
+        "objective": objective,
+        "candidates_evaluated": len(evaluations),
+        "memo_hits": candidate_memo.hits - hits_before,
+        "baseline": describe_candidate(baseline, evaluations[baseline]),
+        "best": describe_candidate(best, evaluations[best]),
+        "top": [describe_candidate(candidate, evaluations[candidate]) for candidate in ranked[:top_n]],
+        "yearly": {
+            "years": inputs.years.tolist(),
+            "tax": evaluations[best]["tax"].tolist(),
+            "meltdown": evaluations[best]["meltdown"].tolist()
+        }
+    }
@@ -0,0 +1,140 @@
+"""
+Microbenchmarks of the calculation functions and projection endpoints.
+
+Run from the backend directory:
+
+    python -m benchmarks --scale medium --save benchmarks/baselines/medium.json
+    python -m benchmarks --scale medium --compare benchmarks/baselines/medium.json
+
+With --compare, the exit status is 1 when a benchmark's median is slower
+than the baseline by more than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from benchmarks.suite import (
+    ACCOUNT_RANGE,
+    EXPENSE_RANGE,
+    SCALES,
+    YEAR_RANGE,
+    BenchmarkResult,
+    Scale,
+    run_suite
+)
+
+
+def bounded_int(low: int, high: int):
+    """argparse type accepting integers between low and high."""
+    def parse(value: str) -> int:
+        number = int(value)
+        if not low <= number <= high:
+            raise argparse.ArgumentTypeError(f"must be between {low} and {high}")
+        return number
+    return parse
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium", help="Named household size")
+    parser.add_argument("--accounts", type=bounded_int(*ACCOUNT_RANGE), help="Number of investment accounts")
+    parser.add_argument("--expenses", type=bounded_int(*EXPENSE_RANGE), help="Number of expenses")
+    parser.add_argument("--years", type=bounded_int(*YEAR_RANGE), help="Number of projection years")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per benchmark")
+    parser.add_argument("--only", action="append", help="Run only this benchmark (repeatable)")
+    parser.add_argument("--save", metavar="PATH", help="Write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare the results with a JSON baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10,
+        help="Relative slowdown of the median flagged as a regression (default: 0.10)"
+    )
+    return parser.parse_args(argv)
+
+
+def build_report(scale: Scale, results: List[BenchmarkResult]) -> Dict:
+    """Results in the baseline file format."""
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "scale": {"accounts": scale.accounts, "expenses": scale.expenses, "years": scale.years},
+        "results": {result.name: result.to_dict() for result in results},
+    }
+
+
+def compare_reports(baseline: Dict, report: Dict, threshold: float) -> List[Tuple[str, float, float, float, bool]]:
+    """
+    Compare the medians of two reports.
+
+    Returns:
+        List of (name, baseline median, current median, ratio, regressed) for
+        the benchmarks present in both reports
+    """
+    rows = []
+    for name, result in report["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        ratio = result["median"] / previous["median"]
+        rows.append((name, previous["median"], result["median"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, factor in (("s", 1.0), ("ms", 1e3), ("us", 1e6)):
+        if seconds * factor >= 1:
+            return f"{seconds * factor:.2f} {unit}"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    accounts, expenses, years = SCALES[args.scale]
+    scale = Scale(
+        accounts=args.accounts or accounts,
+        expenses=args.expenses or expenses,
+        years=args.years or years
+    )
+
+    print(f"Household: {scale.accounts} accounts, {scale.expenses} expenses, {scale.years} years")
+    results = run_suite(scale, repeat=args.repeat, selected=args.only)
+    for result in results:
+        timings = result.to_dict()
+        print(
+            f"{result.name:<34} median {format_seconds(timings['median']):>10}"
+            f"   min {format_seconds(timings['min']):>10}   ({result.loops} loops x {args.repeat})"
+        )
+
+    report = build_report(scale, results)
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline["scale"] != report["scale"]:
+        print(f"Warning: the baseline was recorded for {baseline['scale']}")
+
+    print(f"\nCompared with {args.compare} (threshold {args.threshold:.0%}):")
+    regressions = 0
+    for name, previous, current, ratio, regressed in compare_reports(baseline, report, args.threshold):
+        regressions += regressed
+        flag = "REGRESSION" if regressed else ("faster" if ratio < 1 - args.threshold else "ok")
+        print(
+            f"{name:<34} {format_seconds(previous):>10} -> {format_seconds(current):>10}"
+            f"   {ratio - 1:+7.1%}   {flag}"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
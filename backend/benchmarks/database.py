@@ -0,0 +1,170 @@
+"""
+Concurrent read/write throughput of the SQLite database, before and after
+engine tuning.
+
+Run from the backend directory:
+
+    python -m benchmarks.database --readers 8 --writers 2 --duration 5
+
+Each configuration gets a fresh database file holding one synthetic
+household. Readers list its expenses and writers insert an expense and
+commit, each in a session of its own as a request would. "default" is an
+engine created without options: a connection per session and the rollback
+journal, where a committing writer blocks every reader. "tuned" uses the
+engine options and pragmas of the app (pooled connections, WAL).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, List
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app.db import Base, engine_options, set_sqlite_pragmas, sqlite_pragmas
+from app.models import Expense, User
+from benchmarks.household import seed_household, synthetic_household
+
+
+def default_engine(url: str) -> AsyncEngine:
+    """Engine as created before tuning."""
+    return create_async_engine(url)
+
+
+def tuned_engine(url: str) -> AsyncEngine:
+    """Engine with the options and pragmas used by the app."""
+    engine = create_async_engine(url, **engine_options(url))
+    set_sqlite_pragmas(engine.sync_engine, sqlite_pragmas())
+    return engine
+
+
+CONFIGURATIONS: Dict[str, Callable[[str], AsyncEngine]] = {
+    "default": default_engine,
+    "tuned": tuned_engine,
+}
+
+
+@dataclass
+class WorkloadResult:
+    """Latencies in seconds of the completed operations and failures, by operation."""
+    duration: float
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: {"read": [], "write": []})
+    errors: Dict[str, int] = field(default_factory=lambda: {"read": 0, "write": 0})
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Throughput, latency percentiles and errors of reads and writes."""
+        summary = {}
+        for operation, latencies in self.latencies.items():
+            p50, p99 = np.percentile(latencies, [50, 99]).tolist() if latencies else (0.0, 0.0)
+            summary[operation] = {
+                "operations": len(latencies),
+                "throughput": len(latencies) / self.duration,
+                "p50": p50,
+                "p99": p99,
+                "errors": self.errors[operation],
+            }
+        return summary
+
+
+async def seed(engine: AsyncEngine, num_expenses: int) -> Expense:
+    """Create the tables and one household, and return one of its expenses."""
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    records = synthetic_household(10, num_expenses, date.today().year)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add(User(id=1, email="benchmark@example.com", hashed_password="-"))
+        await session.run_sync(seed_household, records)
+        await session.commit()
+    return records["expenses"][0]
+
+
+async def run_workload(
+    engine: AsyncEngine,
+    readers: int,
+    writers: int,
+    duration: float,
+    num_expenses: int
+) -> WorkloadResult:
+    """Run readers and writers against the engine for `duration` seconds."""
+    template = await seed(engine, num_expenses)
+    result = WorkloadResult(duration=duration)
+    deadline = time.perf_counter() + duration
+
+    async def read() -> None:
+        async with AsyncSession(engine) as session:
+            (await session.scalars(select(Expense).where(Expense.user_id == template.user_id))).all()
+
+    async def write() -> None:
+        async with AsyncSession(engine) as session:
+            session.add(Expense(
+                user_id=template.user_id, family_member_id=template.family_member_id,
+                name=template.name, expense_type=template.expense_type, amount=template.amount,
+                start_year=template.start_year, end_year=template.end_year,
+                expected_growth_rate=template.expected_growth_rate
+            ))
+            await session.commit()
+
+    async def worker(operation: str, call: Callable) -> None:
+        while True:
+            start = time.perf_counter()
+            if start >= deadline:
+                return
+            try:
+                await call()
+            except OperationalError:
+                # "database is locked" once busy_timeout runs out
+                result.errors[operation] += 1
+                continue
+            result.latencies[operation].append(time.perf_counter() - start)
+
+    await asyncio.gather(
+        *(worker("read", read) for _ in range(readers)),
+        *(worker("write", write) for _ in range(writers))
+    )
+    await engine.dispose()
+    return result
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.database", description=__doc__.split("\n\n")[0].strip()
+    )
+    parser.add_argument("--readers", type=int, default=8, help="Concurrent readers")
+    parser.add_argument("--writers", type=int, default=2, help="Concurrent writers")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per configuration")
+    parser.add_argument("--expenses", type=int, default=200, help="Expenses read by each read")
+    parser.add_argument(
+        "--only", choices=sorted(CONFIGURATIONS), action="append", help="Run only this configuration (repeatable)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    print(f"{args.readers} readers, {args.writers} writers, {args.duration:g}s per configuration")
+    print(f"{'configuration':<14} {'operation':<9} {'count':>7} {'ops/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+
+    for name in args.only or CONFIGURATIONS:
+        with tempfile.TemporaryDirectory(prefix="wealthsphere-db-benchmark-") as directory:
+            url = f"sqlite+aiosqlite:///{os.path.join(directory, 'benchmark.db')}"
+            engine = CONFIGURATIONS[name](url)
+            result = asyncio.run(run_workload(engine, args.readers, args.writers, args.duration, args.expenses))
+
+        for operation, stats in result.summary().items():
+            print(
+                f"{name:<14} {operation:<9} {stats['operations']:>7} {stats['throughput']:>9.1f}"
+                f" {stats['p50'] * 1e3:>9.1f} {stats['p99'] * 1e3:>9.1f}"
+                f" {stats['errors']:>7}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
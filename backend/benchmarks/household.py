@@ -0,0 +1,169 @@
+import random
+from datetime import date
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.models import (
+    AccountType,
+    Asset,
+    AssetType,
+    Expense,
+    ExpenseType,
+    FamilyMember,
+    IncomeSource,
+    IncomeType,
+    InsurancePolicy,
+    InsuranceType,
+    InvestmentAccount
+)
+
+
+# Account types assigned round-robin, so every withdrawal tier is exercised
+ACCOUNT_TYPES = [
+    AccountType.RRSP,
+    AccountType.TFSA,
+    AccountType.NON_REGISTERED,
+    AccountType.RRIF,
+    AccountType.LIRA,
+    AccountType.FHSA,
+    AccountType.CORPORATION,
+    AccountType.RESP,
+]
+
+# Household spending, spread over the expenses so totals don't depend on their number
+ANNUAL_SPENDING = 110000.0
+
+
+def synthetic_household(
+    num_accounts: int,
+    num_expenses: int,
+    start_year: int,
+    user_id: int = 1,
+    first_id: int = 1,
+    seed: int = 0
+) -> Dict[str, List]:
+    """
+    Generate a reproducible household of unsaved records.
+
+    The household has two members retiring around the start year, so the
+    projection runs into shortfalls, RRIF minimums and deaths. Spending is
+    split across the expenses and balances across the accounts, which keeps
+    the results comparable between sizes.
+
+    Every record gets an explicit id counted from `first_id`, so several
+    households can be stored in one database by spacing their first ids.
+
+    Args:
+        num_accounts: Number of investment accounts
+        num_expenses: Number of expenses
+        start_year: First projection year
+        user_id: Owner of the records
+        first_id: First id of every table
+        seed: Random seed
+
+    Returns:
+        Dict of record lists, in the shape of HouseholdPlan's arguments
+    """
+    rng = random.Random(seed)
+
+    members = [
+        FamilyMember(
+            id=first_id, user_id=user_id, first_name="Alex", last_name="Sample",
+            date_of_birth=date(start_year - 62, 3, 1), relationship_type="self",
+            is_primary=True, expected_retirement_age=65, expected_death_age=88
+        ),
+        FamilyMember(
+            id=first_id + 1, user_id=user_id, first_name="Sam", last_name="Sample",
+            date_of_birth=date(start_year - 58, 9, 1), relationship_type="spouse",
+            is_primary=False, expected_retirement_age=63, expected_death_age=93
+        ),
+    ]
+    member_ids = [member.id for member in members]
+
+    accounts = [
+        InvestmentAccount(
+            id=first_id + index, user_id=user_id, family_member_id=member_ids[index % 2],
+            name=f"Account {index + 1}", account_type=ACCOUNT_TYPES[index % len(ACCOUNT_TYPES)],
+            current_balance=round(rng.uniform(0.5, 1.5) * 900000.0 / num_accounts, 2),
+            expected_return_rate=round(rng.uniform(0.03, 0.07), 4)
+        )
+        for index in range(num_accounts)
+    ]
+
+    expense_types = list(ExpenseType)
+    expenses = []
+    for index in range(num_expenses):
+        # A quarter of the expenses end early and a quarter belong to one member
+        end_year = start_year + rng.randint(5, 30) if index % 4 == 1 else None
+        owner_id = member_ids[index % 2] if index % 4 == 2 else None
+        expenses.append(Expense(
+            id=first_id + index, user_id=user_id, family_member_id=owner_id,
+            name=f"Expense {index + 1}", expense_type=expense_types[index % len(expense_types)],
+            amount=round(rng.uniform(0.5, 1.5) * ANNUAL_SPENDING / num_expenses, 2),
+            start_year=start_year, end_year=end_year,
+            expected_growth_rate=round(rng.uniform(0.01, 0.03), 4)
+        ))
+
+    income_sources = [
+        IncomeSource(
+            id=first_id, user_id=user_id, family_member_id=member_ids[1], name="Salary",
+            income_type=IncomeType.SALARY, amount=85000.0,
+            start_year=start_year - 20, end_year=start_year + 4, expected_growth_rate=0.02
+        ),
+        IncomeSource(
+            id=first_id + 1, user_id=user_id, family_member_id=member_ids[0], name="Pension",
+            income_type=IncomeType.PENSION, amount=32000.0,
+            start_year=start_year + 3, expected_growth_rate=0.015
+        ),
+        IncomeSource(
+            id=first_id + 2, user_id=user_id, family_member_id=member_ids[0], name="CPP",
+            income_type=IncomeType.CPP, amount=12000.0,
+            start_year=start_year + 3, expected_growth_rate=0.02
+        ),
+        IncomeSource(
+            id=first_id + 3, user_id=user_id, family_member_id=member_ids[1], name="CPP",
+            income_type=IncomeType.CPP, amount=10000.0,
+            start_year=start_year + 7, expected_growth_rate=0.02
+        ),
+    ]
+
+    assets = [
+        Asset(
+            id=first_id, user_id=user_id, name="Home", asset_type=AssetType.PRIMARY_RESIDENCE,
+            current_value=850000.0, expected_annual_appreciation=0.03, is_primary_residence=True
+        ),
+        Asset(
+            id=first_id + 1, user_id=user_id, name="Car", asset_type=AssetType.VEHICLE,
+            current_value=35000.0, expected_annual_appreciation=-0.12
+        ),
+    ]
+
+    insurance_policies = [
+        InsurancePolicy(
+            id=first_id + index, user_id=user_id, family_member_id=member_id,
+            name=f"Life {index + 1}", insurance_type=InsuranceType.LIFE,
+            coverage_amount=250000.0, premium_amount=1800.0,
+            start_date=date(start_year - 10, 1, 1), end_date=date(start_year + 15, 12, 31)
+        )
+        for index, member_id in enumerate(member_ids)
+    ]
+
+    return {
+        "family_members": members,
+        "investment_accounts": accounts,
+        "assets": assets,
+        "income_sources": income_sources,
+        "expenses": expenses,
+        "insurance_policies": insurance_policies,
+    }
+
+
+def seed_household(db: Session, records: Dict[str, List]) -> None:
+    """Store a household from `synthetic_household`, members first."""
+    db.add_all(records["family_members"])
+    db.flush()
+    for name, items in records.items():
+        if name != "family_members":
+            db.add_all(items)
+    db.flush()
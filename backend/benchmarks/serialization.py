@@ -0,0 +1,137 @@
+"""
+Serialization CPU and wire size of the projection responses.
+
+Run from the backend directory:
+
+    python -m benchmarks.serialization --scale medium --repeat 5
+
+Each endpoint's engine output is computed once for a synthetic household,
+then encoded the way FastAPI did before the fast serialization layer
+(validation against the response model, serialization to JSON-compatible
+values and the standard library encoder) and the way it is now
+(`dumps_json`, with orjson when installed). The response body is then
+compressed with every available content encoding.
+"""
+import argparse
+import json
+import sys
+from datetime import date
+from typing import Any, Callable, Dict, List
+
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.core.compression import available_encodings, compress
+from app.core.encoding import dumps_json, orjson, to_builtin
+from app.routers.projections import (
+    CASH_FLOW_ADAPTER,
+    COLUMNAR_VIEWS,
+    DETAILED_WITHDRAWALS_ADAPTER,
+    FULL_PROJECTION_ADAPTER,
+    NET_WORTH_ADAPTER
+)
+from app.schemas import ProjectionView
+from app.services.household_snapshot import snapshot_household
+from app.services.projection_engine import ProjectionLedger, run_projection
+from benchmarks.household import synthetic_household
+from benchmarks.suite import SCALES, Scale, time_call
+
+
+def model_response(adapter: TypeAdapter) -> Callable[[Any], bytes]:
+    """Encoding of a response model by FastAPI with the default JSONResponse."""
+    def encode(content: Any) -> bytes:
+        value = adapter.dump_python(adapter.validate_python(content), mode="json")
+        return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return encode
+
+
+def stdlib_columns(content: Any) -> bytes:
+    """Encoding of the columnar responses before `dumps_json`."""
+    return json.dumps(to_builtin(content), separators=(",", ":")).encode("utf-8")
+
+
+def endpoint_outputs(ledger: ProjectionLedger) -> Dict[str, Any]:
+    """Engine output of each endpoint."""
+    return {
+        "net-worth": ledger.net_worth(),
+        "cash-flow": ledger.cash_flow(),
+        "detailed-withdrawals": ledger.detailed_withdrawals(),
+        "full": ledger.full(),
+        "v2/full": ledger.columnar(COLUMNAR_VIEWS[ProjectionView.FULL]),
+    }
+
+
+# Encoding of each endpoint before the fast serialization layer
+PREVIOUS_ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+    "net-worth": model_response(NET_WORTH_ADAPTER),
+    "cash-flow": model_response(CASH_FLOW_ADAPTER),
+    "detailed-withdrawals": model_response(DETAILED_WITHDRAWALS_ADAPTER),
+    "full": model_response(FULL_PROJECTION_ADAPTER),
+    "v2/full": stdlib_columns,
+}
+
+
+def run_benchmarks(scale: Scale, repeat: int) -> List[Dict[str, Any]]:
+    """Encoding times in seconds and body sizes in bytes of every endpoint."""
+    start_year = date.today().year
+    plan = snapshot_household(synthetic_household(scale.accounts, scale.expenses, start_year)).plan(
+        start_year, start_year + scale.years - 1
+    )
+    ledger = run_projection(plan, start_year)
+
+    rows = []
+    for endpoint, content in endpoint_outputs(ledger).items():
+        previous = PREVIOUS_ENCODERS[endpoint]
+        body = dumps_json(content)
+        row = {
+            "endpoint": endpoint,
+            "previous": time_call(endpoint, lambda: previous(content), repeat).median,
+            "current": time_call(endpoint, lambda: dumps_json(content), repeat).median,
+            "sizes": {"identity": len(body)},
+            "compression": {},
+        }
+        for encoding in available_encodings():
+            compress_body = lambda: compress(
+                body, encoding, settings.COMPRESSION_GZIP_LEVEL, settings.COMPRESSION_BROTLI_QUALITY
+            )
+            row["sizes"][encoding] = len(compress_body())
+            row["compression"][encoding] = time_call(endpoint, compress_body, repeat).median
+        rows.append(row)
+    return rows
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.serialization", description=__doc__.split("\n\n")[0].strip()
+    )
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium", help="Named household size")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    scale = Scale(*SCALES[args.scale])
+    encodings = available_encodings()
+    print(
+        f"Household: {scale.accounts} accounts, {scale.expenses} expenses, {scale.years} years;"
+        f" JSON encoder: {'orjson' if orjson is not None else 'json'}"
+    )
+    print(
+        f"{'endpoint':<22} {'previous ms':>12} {'current ms':>11} {'speedup':>8} {'identity KB':>12}"
+        + "".join(f" {encoding + ' KB':>9} {encoding + ' ms':>9}" for encoding in encodings)
+    )
+    for row in run_benchmarks(scale, args.repeat):
+        print(
+            f"{row['endpoint']:<22} {row['previous'] * 1e3:>12.2f} {row['current'] * 1e3:>11.2f}"
+            f" {row['previous'] / row['current']:>7.1f}x {row['sizes']['identity'] / 1024:>12.1f}"
+            + "".join(
+                f" {row['sizes'][encoding] / 1024:>9.1f} {row['compression'][encoding] * 1e3:>9.2f}"
+                for encoding in encodings
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,165 @@
+import asyncio
+import statistics
+import timeit
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Iterator, List
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base
+from app.models import User
+from app.routers.projections import project_cash_flow, project_detailed_withdrawals, project_net_worth
+from app.schemas import ProjectionParameters
+from app.services.calculations import calculate_cash_flow, calculate_tax_on_income, calculate_withdrawal_strategy
+from app.services.household_snapshot import load_household_snapshot, snapshot_household
+from app.services.projection_cache import projection_cache
+from benchmarks.household import seed_household, synthetic_household
+
+
+# Named household sizes: (accounts, expenses, years)
+SCALES = {
+    "small": (1, 10, 10),
+    "medium": (50, 500, 40),
+    "large": (500, 5000, 100),
+}
+
+# Supported ranges of the household dimensions
+ACCOUNT_RANGE = (1, 500)
+EXPENSE_RANGE = (10, 5000)
+YEAR_RANGE = (10, 100)
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Size of the synthetic household."""
+    accounts: int
+    expenses: int
+    years: int
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one benchmark, in seconds per call."""
+    name: str
+    loops: int
+    timings: List[float]
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.timings)
+
+    def to_dict(self) -> Dict:
+        return {
+            "loops": self.loops,
+            "min": min(self.timings),
+            "median": self.median,
+            "mean": statistics.fmean(self.timings),
+            "max": max(self.timings),
+        }
+
+
+@contextmanager
+def endpoint_session(scale: Scale, start_year: int) -> Iterator:
+    """
+    Yield an event loop, a session on an in-memory database holding one
+    synthetic household, and its user.
+    """
+    loop = asyncio.new_event_loop()
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    session = AsyncSession(engine, expire_on_commit=False)
+    records = synthetic_household(scale.accounts, scale.expenses, start_year)
+
+    async def seed() -> User:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        user = User(id=1, email="benchmark@example.com", hashed_password="-")
+        session.add(user)
+        await session.run_sync(seed_household, records)
+        await session.commit()
+        return user
+
+    try:
+        yield loop, session, loop.run_until_complete(seed())
+    finally:
+        loop.run_until_complete(session.close())
+        loop.run_until_complete(engine.dispose())
+        loop.close()
+
+
+def build_benchmarks(
+    scale: Scale,
+    start_year: int,
+    loop: asyncio.AbstractEventLoop,
+    session: AsyncSession,
+    user: User
+) -> Dict[str, Callable[[], object]]:
+    """
+    Benchmarked calls for a household size.
+
+    Calculation benchmarks cover every projection year, the way the engine
+    calls them. Endpoint benchmarks call the router functions with a cold
+    projection cache, so they include loading the household from the database.
+    """
+    end_year = start_year + scale.years - 1
+    plan = snapshot_household(synthetic_household(scale.accounts, scale.expenses, start_year)).plan(
+        start_year, end_year
+    )
+    years = plan.years.tolist()
+    incomes = np.linspace(0.0, 400000.0, scale.accounts * scale.years)
+    yearly_incomes = incomes[:scale.years].tolist()
+    params = ProjectionParameters(start_year=start_year, end_year=end_year)
+
+    def endpoint(function: Callable) -> Callable[[], object]:
+        def call():
+            projection_cache.clear()
+            return loop.run_until_complete(function(params, db=session, current_user=user))
+        return call
+
+    return {
+        "calculate_tax_on_income": lambda: [calculate_tax_on_income(income) for income in yearly_incomes],
+        "calculate_tax_on_income[array]": lambda: calculate_tax_on_income(incomes),
+        "calculate_cash_flow": lambda: [calculate_cash_flow(plan, year, start_year) for year in years],
+        "calculate_withdrawal_strategy": lambda: [
+            calculate_withdrawal_strategy(plan, year, start_year, {}) for year in years
+        ],
+        "load_household_snapshot": lambda: loop.run_until_complete(load_household_snapshot(session, user.id)),
+        "project_net_worth": endpoint(project_net_worth),
+        "project_cash_flow": endpoint(lambda *args, **kwargs: project_cash_flow(*args, stream=None, **kwargs)),
+        "project_detailed_withdrawals": endpoint(
+            lambda *args, **kwargs: project_detailed_withdrawals(*args, stream=None, **kwargs)
+        ),
+    }
+
+
+def time_call(name: str, function: Callable[[], object], repeat: int) -> BenchmarkResult:
+    """Time a call like `timeit`: loops are calibrated to last at least 0.2 seconds."""
+    timer = timeit.Timer(function)
+    loops, _ = timer.autorange()
+    timings = [total / loops for total in timer.repeat(repeat=repeat, number=loops)]
+    return BenchmarkResult(name=name, loops=loops, timings=timings)
+
+
+def run_suite(scale: Scale, repeat: int = 5, selected: List[str] = None) -> List[BenchmarkResult]:
+    """
+    Run the benchmarks for a household size.
+
+    Args:
+        scale: Size of the synthetic household
+        repeat: Number of timed repetitions per benchmark
+        selected: Names of the benchmarks to run, all of them if None
+
+    Returns:
+        The results, in the order of `build_benchmarks`
+    """
+    start_year = date.today().year
+    results = []
+    with endpoint_session(scale, start_year) as (loop, session, user):
+        for name, function in build_benchmarks(scale, start_year, loop, session, user).items():
+            if selected and name not in selected:
+                continue
+            results.append(time_call(name, function, repeat))
+    return results
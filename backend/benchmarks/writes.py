@@ -0,0 +1,252 @@
+"""
+Throughput of the single-item and bulk write endpoints.
+
+Run from the backend directory:
+
+    python -m benchmarks.writes --items 200 --repeat 3
+
+The app is served in-process against a temporary SQLite database. Each
+benchmark writes the same number of expenses once through the single-item
+endpoints, one request and transaction per expense, and once through the
+bulk endpoints, one request and transaction for all of them.
+
+The expense copy compares the former copy loop, one ORM object per target
+year and a refresh of each copy after the commit, with the set-based copy
+(one INSERT ... SELECT ... RETURNING), copying `--copy-sources` expenses to
+`--copy-years` years.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from typing import Dict, List, Sequence
+
+import httpx
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+PASSWORD = "benchmark-password"
+
+
+def expense_payload(index: int, family_member_id: int) -> Dict:
+    return {
+        "name": f"Expense {index}",
+        "expense_type": "OTHER",
+        "amount": 100.0 + index,
+        "category": "benchmark",
+        "start_year": 2030,
+        "family_member_id": family_member_id,
+    }
+
+
+class WriteBenchmarks:
+    """Single-item and bulk variants of each write, on one user's expenses."""
+
+    def __init__(self, client: httpx.AsyncClient, headers: Dict[str, str], family_member_id: int, items: int):
+        self.client = client
+        self.headers = headers
+        self.family_member_id = family_member_id
+        self.items = items
+
+    async def create_single(self) -> List[int]:
+        ids = []
+        for index in range(self.items):
+            response = await self.client.post(
+                "/api/expenses", json=expense_payload(index, self.family_member_id), headers=self.headers
+            )
+            ids.append(response.json()["id"])
+        return ids
+
+    async def create_bulk(self) -> List[int]:
+        items = [expense_payload(index, self.family_member_id) for index in range(self.items)]
+        response = await self.client.post("/api/expenses/bulk", json={"items": items}, headers=self.headers)
+        return [expense["id"] for expense in response.json()]
+
+    async def update_single(self, ids: List[int]) -> None:
+        for id_ in ids:
+            await self.client.put(f"/api/expenses/{id_}", json={"amount": 1.0}, headers=self.headers)
+
+    async def update_bulk(self, ids: List[int]) -> None:
+        items = [{"id": id_, "amount": 1.0} for id_ in ids]
+        await self.client.put("/api/expenses/bulk", json={"items": items}, headers=self.headers)
+
+    async def delete_single(self, ids: List[int]) -> None:
+        for id_ in ids:
+            await self.client.delete(f"/api/expenses/{id_}", headers=self.headers)
+
+    async def delete_bulk(self, ids: List[int]) -> None:
+        await self.client.post("/api/expenses/bulk/delete", json={"ids": ids}, headers=self.headers)
+
+    async def run(self, variant: str) -> Dict[str, float]:
+        """Create, update and delete the expenses with one variant; seconds per operation."""
+        timings = {}
+        start = time.perf_counter()
+        ids = await getattr(self, f"create_{variant}")()
+        timings["create"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await getattr(self, f"update_{variant}")(ids)
+        timings["update"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await getattr(self, f"delete_{variant}")(ids)
+        timings["delete"] = time.perf_counter() - start
+        return timings
+
+
+async def copy_loop(db: AsyncSession, user_id: int, expense_ids: Sequence[int], target_years: Sequence[int]) -> List:
+    """Copy expenses the way the copy endpoint did before the set-based copy, one call per expense."""
+    from app.models import Expense
+
+    copies = []
+    for expense_id in expense_ids:
+        source = await db.scalar(select(Expense).where(Expense.id == expense_id, Expense.user_id == user_id))
+        new_expenses = []
+        for year in target_years:
+            if source.start_year == year:
+                continue
+            copy = Expense(
+                user_id=user_id, name=source.name, expense_type=source.expense_type,
+                amount=source.amount, start_year=year, end_year=None,
+                expected_growth_rate=source.expected_growth_rate,
+                is_tax_deductible=source.is_tax_deductible, notes=source.notes,
+                family_member_id=source.family_member_id
+            )
+            db.add(copy)
+            new_expenses.append(copy)
+        await db.commit()
+        for copy in new_expenses:
+            await db.refresh(copy)
+        copies.extend(new_expenses)
+    return copies
+
+
+async def copy_set_based(
+    db: AsyncSession, user_id: int, expense_ids: Sequence[int], target_years: Sequence[int]
+) -> List:
+    """Copy expenses with the set-based copy used by the copy endpoints."""
+    from app.services.expense_copy import copy_expenses
+
+    copies = await copy_expenses(db, user_id, target_years, expense_ids=expense_ids)
+    await db.commit()
+    return copies
+
+
+COPY_VARIANTS = {
+    "loop": copy_loop,
+    "set": copy_set_based,
+}
+
+
+async def run_copy_benchmarks(
+    user_id: int, expense_ids: Sequence[int], years: int, repeat: int
+) -> Dict[str, List[float]]:
+    """Timings in seconds of each copy variant, `repeat` times each; the copies are deleted after each run."""
+    from app.db import AsyncSessionLocal
+    from app.models import Expense
+
+    # Target years all differ from the start year of the sources (2030)
+    target_years = list(range(2031, 2031 + years))
+    results: Dict[str, List[float]] = {}
+    for _ in range(repeat):
+        for variant, copy in COPY_VARIANTS.items():
+            async with AsyncSessionLocal() as db:
+                start = time.perf_counter()
+                copies = await copy(db, user_id, expense_ids, target_years)
+                results.setdefault(variant, []).append(time.perf_counter() - start)
+                assert len(copies) == len(expense_ids) * years
+                await db.execute(delete(Expense).where(Expense.id.in_([copy.id for copy in copies])))
+                await db.commit()
+    return results
+
+
+async def run_benchmarks(
+    items: int, repeat: int, copy_sources: int, copy_years: int
+) -> Dict[str, Dict[str, List[float]]]:
+    """Timings in seconds of every operation and variant, `repeat` times each."""
+    from app.core.security import get_password_hash
+    from app.db import SessionLocal, async_engine, init_db
+    from app.main import app
+    from app.models import FamilyMember, User
+
+    # Keep per-request log lines out of the report
+    logging.getLogger("wealthsphere").setLevel(logging.WARNING)
+    await init_db()
+    db = SessionLocal()
+    try:
+        user = User(email="writes@example.com", hashed_password=get_password_hash(PASSWORD), is_active=True)
+        db.add(user)
+        db.flush()
+        member = FamilyMember(
+            user_id=user.id, first_name="Bench", last_name="Mark",
+            date_of_birth=date(1970, 1, 1), relationship_type="self"
+        )
+        db.add(member)
+        db.commit()
+        user_id = user.id
+        family_member_id = member.id
+    finally:
+        db.close()
+
+    results: Dict[str, Dict[str, List[float]]] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        response = await client.post("/api/auth/login", data={"username": "writes@example.com", "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        benchmarks = WriteBenchmarks(client, headers, family_member_id, items)
+        for _ in range(repeat):
+            for variant in ("single", "bulk"):
+                for operation, seconds in (await benchmarks.run(variant)).items():
+                    results.setdefault(operation, {}).setdefault(variant, []).append(seconds)
+        sources = await WriteBenchmarks(client, headers, family_member_id, copy_sources).create_bulk()
+    results["copy"] = await run_copy_benchmarks(user_id, sources, copy_years, repeat)
+    await async_engine.dispose()
+    return results
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.writes", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--items", type=int, default=200, help="Expenses written by each benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions")
+    parser.add_argument("--copy-sources", type=int, default=50, help="Expenses copied by the copy benchmark")
+    parser.add_argument("--copy-years", type=int, default=40, help="Target years of the copy benchmark")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="wealthsphere-writes-") as directory:
+        # Settings are read when the app is imported, so point it at the temporary database first
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'writes.db')}"
+        os.environ["REQUEST_TRACING_ENABLED"] = "false"
+        results = asyncio.run(run_benchmarks(args.items, args.repeat, args.copy_sources, args.copy_years))
+
+        from app.db import engine
+        engine.dispose()
+
+    copies = results.pop("copy")
+    print(f"{args.items} expenses per benchmark, median of {args.repeat}")
+    print(f"{'operation':<10} {'single items/s':>15} {'bulk items/s':>13} {'speedup':>8}")
+    for operation, variants in results.items():
+        single = statistics.median(variants["single"])
+        bulk = statistics.median(variants["bulk"])
+        print(f"{operation:<10} {args.items / single:>15.0f} {args.items / bulk:>13.0f} {single / bulk:>7.1f}x")
+
+    loop = statistics.median(copies["loop"])
+    set_based = statistics.median(copies["set"])
+    print()
+    print(f"copy of {args.copy_sources} expenses to {args.copy_years} years, median of {args.repeat}")
+    print(f"{'variant':<10} {'ms':>10} {'speedup':>8}")
+    print(f"{'loop':<10} {loop * 1e3:>10.1f} {1:>7.1f}x")
+    print(f"{'set':<10} {set_based * 1e3:>10.1f} {loop / set_based:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
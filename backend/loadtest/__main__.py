@@ -0,0 +1,120 @@
+"""
+Offline HTTP load test of the API, served in-process.
+
+Run from the backend directory:
+
+    python -m loadtest --users 20 --concurrency 1,4,16,32 --duration 15
+
+The app is booted against a temporary SQLite database seeded with one
+synthetic household per user, then driven by virtual clients sending a mix
+of logins, list requests, projections and expense copies through an async
+HTTP client. Each concurrency level reports throughput and latency
+percentiles, which shows where p99 latency starts to degrade.
+
+A login-heavy mix shows login throughput and how well the other routes are
+isolated from password hashing:
+
+    python -m loadtest --mix login=40,list=30,projection=30 --concurrency 16 --hash-workers 2
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import Dict, List
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parse a workload mix such as "login=5,list=50,projection=35,copy=10"."""
+    mix = {}
+    for part in value.split(","):
+        operation, _, weight = part.partition("=")
+        operation = operation.strip()
+        if operation not in ("login", "list", "projection", "copy"):
+            raise argparse.ArgumentTypeError(f"unknown operation {operation!r}")
+        try:
+            mix[operation] = int(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight for {operation!r}")
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("at least one operation needs a positive weight")
+    return mix
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--users", type=int, default=20, help="Number of seeded users")
+    parser.add_argument(
+        "--concurrency", default="1,4,16",
+        help="Comma-separated numbers of concurrent virtual clients, one run each"
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each level")
+    parser.add_argument("--mix", type=parse_mix, help="Operation weights (default: login=5,list=50,projection=35,copy=10)")
+    parser.add_argument("--accounts", type=int, default=8, help="Investment accounts per household")
+    parser.add_argument("--expenses", type=int, default=40, help="Expenses per household")
+    parser.add_argument("--years", type=int, default=40, help="Projection years")
+    parser.add_argument("--bcrypt-rounds", type=int, help="bcrypt cost factor (default: BCRYPT_ROUNDS setting)")
+    parser.add_argument(
+        "--hash-workers", type=int,
+        help="Threads hashing passwords (default: PASSWORD_HASH_WORKERS setting)"
+    )
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    return parser.parse_args(argv)
+
+
+def print_level(summary: Dict) -> None:
+    print(f"\nConcurrency {summary['concurrency']} ({summary['duration']:g}s measured)")
+    print(f"{'operation':<12} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for operation, stats in summary["operations"].items():
+        print(
+            f"{operation:<12} {stats['requests']:>9} {stats['errors']:>7} {stats['throughput']:>9.1f}"
+            f" {stats['p50'] * 1e3:>9.1f} {stats['p90'] * 1e3:>9.1f}"
+            f" {stats['p99'] * 1e3:>9.1f} {stats['max'] * 1e3:>9.1f}"
+        )
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    with tempfile.TemporaryDirectory(prefix="wealthsphere-loadtest-") as directory:
+        # Settings are read when the app is imported, so point it at the temporary database first
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'loadtest.db')}"
+        os.environ["REQUEST_TRACING_ENABLED"] = "false"
+        if args.bcrypt_rounds is not None:
+            os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+        if args.hash_workers is not None:
+            os.environ["PASSWORD_HASH_WORKERS"] = str(args.hash_workers)
+        from datetime import date
+        from app.db import engine
+        from loadtest.harness import DEFAULT_MIX, run_level, seed_database
+
+        # Keep per-request log lines out of the report
+        logging.getLogger("wealthsphere").setLevel(logging.WARNING)
+
+        print(f"Seeding {args.users} users ({args.accounts} accounts, {args.expenses} expenses each)...")
+        users = seed_database(args.users, args.accounts, args.expenses, date.today().year)
+
+        summaries = []
+        for concurrency in levels:
+            result = asyncio.run(
+                run_level(users, concurrency, args.duration, args.warmup, args.mix or DEFAULT_MIX, args.years)
+            )
+            summary = result.summary()
+            summaries.append(summary)
+            print_level(summary)
+
+        engine.dispose()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as report_file:
+            json.dump({"arguments": vars(args), "levels": summaries}, report_file, indent=2)
+        print(f"\nReport written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
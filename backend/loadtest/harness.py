@@ -0,0 +1,200 @@
+import asyncio
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Tuple
+
+import httpx
+import numpy as np
+
+from app.core.security import get_password_hash
+from app.db import Base, SessionLocal, async_engine, engine
+from app.main import app
+from app.models import User
+from benchmarks.household import seed_household, synthetic_household
+
+
+PASSWORD = "loadtest-password"
+
+LIST_ENDPOINTS = [
+    "/api/family",
+    "/api/investment-accounts",
+    "/api/assets",
+    "/api/income-sources",
+    "/api/expenses",
+    "/api/insurance-policies",
+]
+
+PROJECTION_ENDPOINTS = [
+    "/api/projections/net-worth",
+    "/api/projections/cash-flow",
+    "/api/projections/detailed-withdrawals",
+    "/api/projections/full",
+]
+
+# Default share of each operation in the workload
+DEFAULT_MIX = {"login": 5, "list": 50, "projection": 35, "copy": 10}
+
+
+@dataclass
+class SeededUser:
+    """A user of the load-test database and one of their expenses."""
+    email: str
+    expense_id: int
+
+
+@dataclass
+class LevelResult:
+    """Samples of one concurrency level: (operation, latency in seconds, status code)."""
+    concurrency: int
+    duration: float
+    samples: List[Tuple[str, float, int]] = field(default_factory=list)
+
+    def summary(self) -> Dict:
+        """Throughput, errors and latency percentiles, overall and per operation."""
+        groups: Dict[str, List[Tuple[float, int]]] = defaultdict(list)
+        for operation, latency, status_code in self.samples:
+            groups[operation].append((latency, status_code))
+            groups["all"].append((latency, status_code))
+
+        operations = {}
+        for operation, samples in sorted(groups.items()):
+            latencies = np.array([latency for latency, _ in samples])
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99]).tolist()
+            operations[operation] = {
+                "requests": len(samples),
+                "errors": sum(1 for _, status_code in samples if status_code >= 400),
+                "throughput": len(samples) / self.duration,
+                "p50": p50,
+                "p90": p90,
+                "p99": p99,
+                "max": latencies.max().item(),
+            }
+        return {"concurrency": self.concurrency, "duration": self.duration, "operations": operations}
+
+
+def seed_database(
+    num_users: int,
+    num_accounts: int,
+    num_expenses: int,
+    start_year: int
+) -> List[SeededUser]:
+    """
+    Create the tables and store one synthetic household per user.
+
+    All users share one password hash, since hashing is deliberately slow.
+    """
+    Base.metadata.create_all(bind=engine)
+    hashed_password = get_password_hash(PASSWORD)
+    # Ids of each household are spaced so they never overlap
+    id_stride = max(num_accounts, num_expenses, 10)
+    users = []
+    db = SessionLocal()
+    try:
+        for index in range(num_users):
+            user = User(email=f"user{index}@loadtest.example.com", hashed_password=hashed_password, is_active=True)
+            db.add(user)
+            db.flush()
+            records = synthetic_household(
+                num_accounts, num_expenses, start_year,
+                user_id=user.id, first_id=index * id_stride + 1, seed=index
+            )
+            seed_household(db, records)
+            users.append(SeededUser(email=user.email, expense_id=records["expenses"][0].id))
+        db.commit()
+    finally:
+        db.close()
+    return users
+
+
+class VirtualClient:
+    """One simulated user sending requests back to back."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        user: SeededUser,
+        mix: Dict[str, int],
+        start_year: int,
+        num_years: int,
+        seed: int
+    ):
+        self.client = client
+        self.user = user
+        self.rng = random.Random(seed)
+        self.operations = list(mix)
+        self.weights = list(mix.values())
+        self.start_year = start_year
+        self.num_years = num_years
+        self.headers: Dict[str, str] = {}
+
+    async def login(self) -> httpx.Response:
+        response = await self.client.post(
+            "/api/auth/login", data={"username": self.user.email, "password": PASSWORD}
+        )
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+    async def list(self) -> httpx.Response:
+        return await self.client.get(self.rng.choice(LIST_ENDPOINTS), headers=self.headers)
+
+    async def projection(self) -> httpx.Response:
+        return await self.client.post(
+            self.rng.choice(PROJECTION_ENDPOINTS),
+            json={"start_year": self.start_year, "end_year": self.start_year + self.num_years - 1},
+            headers=self.headers
+        )
+
+    async def copy(self) -> httpx.Response:
+        first_year = self.start_year + self.rng.randint(1, self.num_years - 2)
+        return await self.client.post(
+            f"/api/expenses/{self.user.expense_id}/copy",
+            json={"target_years": [first_year, first_year + 1]},
+            headers=self.headers
+        )
+
+    async def run(self, deadline: float, samples: List[Tuple[str, float, int]], record_after: float) -> None:
+        """Send requests until the deadline, recording those started after `record_after`."""
+        await self.login()
+        while True:
+            start = time.perf_counter()
+            if start >= deadline:
+                return
+            operation = self.rng.choices(self.operations, self.weights)[0]
+            response = await getattr(self, operation)()
+            if start >= record_after:
+                samples.append((operation, time.perf_counter() - start, response.status_code))
+
+
+async def run_level(
+    users: List[SeededUser],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    mix: Dict[str, int],
+    num_years: int
+) -> LevelResult:
+    """
+    Drive the app with `concurrency` virtual clients for `duration` seconds.
+
+    Requests go straight to the ASGI app, in this process and event loop,
+    so no server or network is involved.
+    """
+    start_year = date.today().year
+    result = LevelResult(concurrency=concurrency, duration=duration)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        clients = [
+            VirtualClient(client, users[index % len(users)], mix, start_year, num_years, seed=index)
+            for index in range(concurrency)
+        ]
+        now = time.perf_counter()
+        record_after = now + warmup
+        deadline = record_after + duration
+        await asyncio.gather(*(virtual.run(deadline, result.samples, record_after) for virtual in clients))
+    # Pooled connections belong to this event loop
+    await async_engine.dispose()
+    return result
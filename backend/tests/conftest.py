@@ -0,0 +1,75 @@
+import os
+import tempfile
+from datetime import date
+
+import pytest
+
+# Settings are read on import, so the test database and a cheap password
+# hash cost are set before any application module is imported
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from app.models import AccountType, AssetType, IncomeType, InsuranceType  # noqa: E402
+from app.services.household_plan import (  # noqa: E402
+    AccountSnapshot,
+    AssetSnapshot,
+    ExpenseSnapshot,
+    IncomeSnapshot,
+    MemberSnapshot,
+    PolicySnapshot
+)
+from app.services.household_snapshot import HouseholdSnapshot  # noqa: E402
+
+
+@pytest.fixture
+def household() -> HouseholdSnapshot:
+    """
+    A household small enough to project by hand over 2030-2032.
+
+    Ann (born 1970) holds a non-registered account growing 10% a year and a
+    TFSA that doesn't grow. Her salary of 20,000 ends in 2031; the family
+    spends 21,000 a year plus a 500 premium on Ann's life policy. Bo (born
+    1940, expected death at 91) dies in 2031, with a 50,000 life policy. The
+    house appreciates 5% a year from 100,000 in 2030.
+    """
+    return HouseholdSnapshot(
+        family_members=(
+            MemberSnapshot(1, "Ann", "Lee", date(1970, 6, 1), 90),
+            MemberSnapshot(2, "Bo", "Lee", date(1940, 6, 1), 91),
+        ),
+        investment_accounts=(
+            AccountSnapshot(10, 1, "Brokerage", AccountType.NON_REGISTERED, 1000.0, 0.10, None),
+            AccountSnapshot(11, 1, "TFSA", AccountType.TFSA, 5000.0, 0.0, None),
+        ),
+        assets=(
+            AssetSnapshot(20, "House", AssetType.PRIMARY_RESIDENCE, 100000.0, 0.05),
+        ),
+        income_sources=(
+            IncomeSnapshot(30, 1, IncomeType.SALARY, 20000.0, True, 2030, 2031, 0.0),
+        ),
+        expenses=(
+            ExpenseSnapshot(40, None, 21000.0, 2030, None, 0.0),
+        ),
+        insurance_policies=(
+            PolicySnapshot(50, 1, InsuranceType.LIFE, 250000.0, 500.0, None, None),
+            PolicySnapshot(51, 2, InsuranceType.LIFE, 50000.0, 0.0, None, None),
+        ),
+    )
+
+
+@pytest.fixture(scope="session")
+def client():
+    """A test client for the API, logged in as the only registered user."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        credentials = {"email": "ann@example.com", "password": "password123"}
+        client.post("/api/auth/register", json=credentials)
+        response = client.post(
+            "/api/auth/login",
+            data={"username": credentials["email"], "password": credentials["password"]}
+        )
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        yield client
@@ -0,0 +1,35 @@
+from sqlalchemy import select
+
+from app.db import SessionLocal
+from app.models import User
+from app.services.auth_cache import auth_cache
+
+
+def test_user_changes_invalidate_on_commit(client):
+    with SessionLocal() as db:
+        user = db.scalar(select(User).where(User.email == "ann@example.com"))
+        revision = auth_cache.revision(user.id)
+
+        user.first_name = "Annie"
+        db.flush()
+        # A concurrent request could still read the row as it was before the commit
+        assert auth_cache.revision(user.id) == revision
+
+        db.commit()
+        assert auth_cache.revision(user.id) == revision + 1
+
+        user.first_name = "Ann"
+        db.flush()
+        db.rollback()
+        db.commit()
+        assert auth_cache.revision(user.id) == revision + 1
+
+
+def test_cached_user_is_refreshed_after_commit(client):
+    assert client.get("/api/auth/me").json()["first_name"] != "Bea"
+
+    with SessionLocal() as db:
+        db.scalar(select(User).where(User.email == "ann@example.com")).first_name = "Bea"
+        db.commit()
+
+    assert client.get("/api/auth/me").json()["first_name"] == "Bea"
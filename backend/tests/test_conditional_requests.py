@@ -0,0 +1,39 @@
+from sqlalchemy import update
+
+from app.db import SessionLocal
+from app.models import User
+
+
+def test_household_writes_change_the_etag(client):
+    response = client.get("/api/assets")
+    etag = response.headers["ETag"]
+    assert client.get("/api/assets", headers={"If-None-Match": etag}).status_code == 304
+
+    # Writes go through commit_household_write, which bumps the stored revision
+    created = client.post("/api/assets", json={
+        "name": "House", "asset_type": "PRIMARY_RESIDENCE", "current_value": 100000
+    })
+    assert created.status_code in (200, 201)
+
+    response = client.get("/api/assets", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert [asset["name"] for asset in response.json()] == ["House"]
+
+
+def test_revision_bumped_by_another_process_changes_the_etag(client):
+    etag = client.get("/api/assets").headers["ETag"]
+
+    # Another worker's write: its own session, bypassing this process's caches
+    with SessionLocal() as db:
+        db.execute(
+            update(User)
+            .where(User.email == "ann@example.com")
+            .values(household_revision=User.household_revision + 1)
+        )
+        db.commit()
+
+    response = client.get("/api/assets", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert client.get("/api/assets", headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
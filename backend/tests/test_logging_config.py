@@ -0,0 +1,24 @@
+import logging
+import threading
+
+from app.core.logging_config import APP_LOGGER_NAME, get_logger, setup_logging, start_trace, stop_trace
+
+
+def test_trace_captures_debug_records_of_the_traced_context_only():
+    setup_logging()
+    logger = get_logger("tests")
+    level = logging.getLogger(APP_LOGGER_NAME).level
+
+    token = start_trace()
+    logger.debug("traced %s", "debug")
+    other = threading.Thread(target=logger.debug, args=("untraced debug",))
+    other.start()
+    other.join()
+    records = stop_trace(token)
+
+    assert records == [f"{APP_LOGGER_NAME}.tests - DEBUG - traced debug"]
+    assert logging.getLogger(APP_LOGGER_NAME).level == level
+
+
+def test_loggers_are_plain_loggers():
+    assert type(get_logger("tests")) is logging.Logger
@@ -0,0 +1,88 @@
+import pytest
+
+from app.services.projection_engine import run_projection
+
+
+@pytest.fixture
+def ledger(household):
+    return run_projection(household.plan(2030, 2032), current_year=2030)
+
+
+def test_net_worth(ledger):
+    net_worth = ledger.net_worth()
+
+    assert list(net_worth) == ["2030", "2031", "2032"]
+    # 2030: the brokerage grows to 1,100 and is emptied first, the TFSA covers the other 400
+    assert net_worth["2030"]["non_registered_total"] == pytest.approx(0.0)
+    assert net_worth["2030"]["tfsa_total"] == pytest.approx(4600.0)
+    assert net_worth["2030"]["property_total"] == pytest.approx(100000.0)
+    assert net_worth["2030"]["total_net_worth"] == pytest.approx(104600.0)
+    # 2031: the TFSA covers the whole 1,500 shortfall
+    assert net_worth["2031"]["tfsa_total"] == pytest.approx(3100.0)
+    assert net_worth["2031"]["property_total"] == pytest.approx(105000.0)
+    assert net_worth["2031"]["total_net_worth"] == pytest.approx(108100.0)
+    # 2032: no salary, the accounts run dry and only the house is left
+    assert net_worth["2032"]["tfsa_total"] == pytest.approx(0.0)
+    assert net_worth["2032"]["total_net_worth"] == pytest.approx(110250.0)
+
+
+def test_cash_flow(ledger):
+    cash_flow = ledger.cash_flow()
+
+    year = cash_flow["2030"]
+    assert year["total_income"] == pytest.approx(20000.0)
+    assert year["total_expenses"] == pytest.approx(21500.0)
+    assert year["net_cash_flow"] == pytest.approx(-1500.0)
+    assert year["withdrawal_strategy"]["withdrawals"] == {"10": pytest.approx(1100.0), "11": pytest.approx(400.0)}
+    assert year["withdrawal_strategy"]["unfunded_amount"] == pytest.approx(0.0)
+    assert year["death_benefits"] == []
+
+    year = cash_flow["2031"]
+    assert year["withdrawal_strategy"]["withdrawals"] == {"11": pytest.approx(1500.0)}
+    assert year["death_benefits"] == [
+        {"family_member_id": 2, "family_member_name": "Bo Lee", "benefit_amount": pytest.approx(50000.0)}
+    ]
+
+    year = cash_flow["2032"]
+    assert year["total_income"] == pytest.approx(0.0)
+    assert year["net_cash_flow"] == pytest.approx(-21500.0)
+    assert year["withdrawal_strategy"]["withdrawals"] == {"11": pytest.approx(3100.0)}
+    assert year["withdrawal_strategy"]["unfunded_amount"] == pytest.approx(18400.0)
+    assert year["death_benefits"] == []
+
+
+def test_detailed_withdrawals(ledger):
+    withdrawals = ledger.detailed_withdrawals()
+
+    year = withdrawals["2030"]
+    assert year["shortfall"] == pytest.approx(1500.0)
+    assert year["account_details"]["10"] == {
+        "account_name": "Brokerage",
+        "account_type": "NON_REGISTERED",
+        "family_member_name": "Ann Lee",
+        "start_value": pytest.approx(1100.0),
+        "withdrawal": pytest.approx(1100.0),
+        "end_value": pytest.approx(0.0),
+    }
+    assert year["account_details"]["11"]["start_value"] == pytest.approx(5000.0)
+    assert year["account_details"]["11"]["end_value"] == pytest.approx(4600.0)
+
+    year = withdrawals["2032"]
+    assert year["unfunded_amount"] == pytest.approx(18400.0)
+    assert year["account_details"]["11"]["start_value"] == pytest.approx(3100.0)
+    assert year["account_details"]["11"]["withdrawal"] == pytest.approx(3100.0)
+    assert year["account_details"]["11"]["end_value"] == pytest.approx(0.0)
+
+
+def test_sliced_ledger_matches_shorter_projection(household, ledger):
+    shorter = run_projection(household.plan(2030, 2031), current_year=2030)
+
+    assert ledger.slice(2031).net_worth() == shorter.net_worth()
+    assert ledger.slice(2031).cash_flow() == shorter.cash_flow()
+
+
+def test_single_year_range(household):
+    ledger = run_projection(household.plan(2030, 2030), current_year=2030)
+
+    assert list(ledger.net_worth()) == ["2030"]
+    assert ledger.net_worth()["2030"]["total_net_worth"] == pytest.approx(104600.0)
@@ -0,0 +1,43 @@
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.projections import ProjectionParameters
+from app.services.projection_cache import ProjectionCache
+from app.services.projection_engine import run_projection
+
+
+def test_reversed_year_range_projects_no_years(household):
+    ledger = run_projection(household.plan(2031, 2030), current_year=2030)
+
+    assert ledger.net_worth() == {}
+    assert ledger.cash_flow() == {}
+    assert ledger.detailed_withdrawals() == {}
+
+
+def test_cache_skips_empty_ledgers(household):
+    cache = ProjectionCache(max_size=8, ttl_seconds=60)
+    ledger = run_projection(household.plan(2031, 2030), current_year=2030)
+
+    cache.put(1, 0, 2030, ledger)
+
+    assert cache.stats()["size"] == 0
+
+
+def test_parameters_reject_reversed_year_range():
+    with pytest.raises(ValidationError):
+        ProjectionParameters(start_year=2031, end_year=2030)
+
+    parameters = ProjectionParameters(start_year=2030, end_year=2030)
+    assert parameters.start_year == parameters.end_year
+
+
+def test_reversed_year_range_is_rejected(client):
+    response = client.post("/api/projections/net-worth", json={"start_year": 2031, "end_year": 2030})
+    assert response.status_code == 422
+
+    response = client.get("/api/projections/v2/net-worth", params={"start_year": 2031, "end_year": 2030})
+    assert response.status_code == 400
+
+
+def test_cache_stats_are_not_served_to_users(client):
+    assert client.get("/api/projections/cache-stats").status_code in (404, 405)
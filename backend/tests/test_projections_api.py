@@ -0,0 +1,21 @@
+def test_empty_household_projects_every_year(client):
+    response = client.post("/api/projections/net-worth", json={"start_year": 2030, "end_year": 2032})
+    assert response.status_code == 200
+    assert sorted(response.json()) == ["2030", "2031", "2032"]
+
+    response = client.get("/api/projections/v2/net-worth", params={"start_year": 2030, "end_year": 2032})
+    assert response.status_code == 200
+    assert response.json()["years"] == [2030, 2031, 2032]
+
+
+def test_long_year_range_is_rejected(client):
+    response = client.post("/api/projections/net-worth", json={"start_year": 2030, "end_year": 12030})
+    assert response.status_code == 422
+
+    response = client.get("/api/projections/v2/net-worth", params={"start_year": 2030, "end_year": 12030})
+    assert response.status_code == 400
+
+    response = client.post("/api/projections/monte-carlo", json={
+        "start_year": 2030, "end_year": 2129, "num_paths": 100000
+    })
+    assert response.status_code == 422
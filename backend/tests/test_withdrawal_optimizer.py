@@ -0,0 +1,184 @@
+import os
+import signal
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.models import AccountType
+from app.services import withdrawal_optimizer
+from app.services.calculations import calculate_tax_on_income
+from app.services.household_plan import AccountSnapshot, MemberSnapshot
+from app.services.household_snapshot import HouseholdSnapshot
+from app.services.withdrawal_optimizer import (
+    DEFAULT_ORDER_INDEX,
+    MAX_TERMINAL_ESTATE,
+    MIN_LIFETIME_TAX,
+    WITHDRAWAL_ORDERS,
+    WithdrawalCandidate,
+    candidate_memo,
+    compile_optimizer_inputs,
+    evaluate,
+    evaluate_candidate_group,
+    optimize_withdrawals
+)
+
+
+def tax(income: float) -> float:
+    return calculate_tax_on_income(np.array([income]), "ON")[0]
+
+
+def household(*accounts, members=(MemberSnapshot(1, "Ann", "Lee", date(1960, 6, 1), 90),)) -> HouseholdSnapshot:
+    return HouseholdSnapshot(
+        family_members=tuple(members),
+        investment_accounts=tuple(accounts),
+        assets=(),
+        income_sources=(),
+        expenses=(),
+        insurance_policies=()
+    )
+
+
+@pytest.fixture
+def plan():
+    """
+    Ann, 70 in 2030, has 100,000 in an RRSP and an empty TFSA, nothing grows
+    and there is nothing to spend: the only withdrawals are meltdowns and tax.
+    """
+    return household(
+        AccountSnapshot(10, 1, "RRSP", AccountType.RRSP, 100000.0, 0.0, None),
+        AccountSnapshot(11, 1, "TFSA", AccountType.TFSA, 0.0, 0.0, None),
+    ).plan(2030, 2032)
+
+
+@pytest.fixture
+def inputs(plan):
+    return compile_optimizer_inputs(plan, "ON")
+
+
+def test_meltdown_is_taxed_yearly_and_reinvested(inputs):
+    candidates = [
+        WithdrawalCandidate(DEFAULT_ORDER_INDEX, 0.0, 0),
+        WithdrawalCandidate(DEFAULT_ORDER_INDEX, 10000.0, 80),
+    ]
+    without, melted = evaluate_candidate_group(inputs, candidates)
+
+    # Without a meltdown, the whole RRSP is taxed as a deemed withdrawal at the end
+    assert without["lifetime_tax"] == pytest.approx(tax(100000.0))
+    assert without["terminal_estate"] == pytest.approx(100000.0 - tax(100000.0))
+
+    # Each year 10,000 moves to the TFSA and is taxed; the tax is paid from the
+    # TFSA the following year, and the 70,000 left is taxed at the end
+    assert melted["meltdown"].tolist() == [10000.0, 10000.0, 10000.0]
+    assert melted["tax"].tolist() == pytest.approx([tax(10000.0)] * 3)
+    tfsa = 30000.0 - 2 * tax(10000.0)
+    assert melted["lifetime_tax"] == pytest.approx(3 * tax(10000.0) + tax(70000.0))
+    assert melted["terminal_estate"] == pytest.approx(70000.0 + tfsa - tax(10000.0) - tax(70000.0))
+
+
+def test_meltdown_is_reinvested_in_a_living_holders_account():
+    # Ann dies after 2030; the meltdown of Bo's RRSP goes to her non-registered
+    # account while she lives, then to Bo's TFSA
+    plan = household(
+        AccountSnapshot(10, 2, "RRSP", AccountType.RRSP, 100000.0, 0.0, None),
+        AccountSnapshot(11, 1, "Brokerage", AccountType.NON_REGISTERED, 0.0, 0.0, None),
+        AccountSnapshot(12, 2, "TFSA", AccountType.TFSA, 0.0, 0.0, None),
+        members=(
+            MemberSnapshot(1, "Ann", "Lee", date(1950, 6, 1), 80),
+            MemberSnapshot(2, "Bo", "Lee", date(1965, 6, 1), 90),
+        )
+    ).plan(2030, 2032)
+    inputs = compile_optimizer_inputs(plan, "ON")
+    assert inputs.meltdown_targets.tolist() == [1, 2, 2]
+
+    [result] = evaluate_candidate_group(
+        inputs, [WithdrawalCandidate(DEFAULT_ORDER_INDEX, 10000.0, 80)]
+    )
+    assert result["meltdown"].tolist() == [10000.0, 10000.0, 10000.0]
+
+
+def test_no_meltdown_without_an_account_to_reinvest_in():
+    plan = household(AccountSnapshot(10, 1, "RRSP", AccountType.RRSP, 100000.0, 0.0, None)).plan(2030, 2032)
+    inputs = compile_optimizer_inputs(plan, "ON")
+    assert inputs.meltdown_targets.tolist() == [-1, -1, -1]
+
+    [result] = evaluate_candidate_group(
+        inputs, [WithdrawalCandidate(DEFAULT_ORDER_INDEX, 10000.0, 80)]
+    )
+    assert result["meltdown"].tolist() == [0.0, 0.0, 0.0]
+    assert result["lifetime_tax"] == pytest.approx(tax(100000.0))
+
+
+@pytest.mark.parametrize("objective", [MIN_LIFETIME_TAX, MAX_TERMINAL_ESTATE])
+def test_optimizer_ranks_the_meltdown_first(plan, objective):
+    result = optimize_withdrawals(
+        plan, "ON", ("rank", objective), objective, [0, 10000], [80], refinement_rounds=0, top_n=3
+    )
+
+    # Paying last year's tax from the RRSP melts it down further: the RRSP
+    # goes 100,000 -> 90,000 -> 77,995 -> 65,588 (rounded) and the tax is
+    # taxed again the year it is withdrawn
+    tax_2030 = tax(10000.0)
+    tax_2031 = tax(10000.0 + tax_2030)
+    tax_2032 = tax(10000.0 + tax_2031)
+    rrsp = 100000.0 - 30000.0 - tax_2030 - tax_2031
+    assert result["baseline"]["lifetime_tax"] == pytest.approx(tax(100000.0))
+    assert result["best"]["strategy"]["meltdown_amount"] == 10000.0
+    order = result["best"]["strategy"]["withdrawal_order"]
+    assert order.index(["RRSP", "RRIF"]) < order.index(["TFSA"])
+    assert result["best"]["lifetime_tax"] == pytest.approx(tax_2030 + tax_2031 + tax_2032 + tax(rrsp))
+    assert result["best"]["terminal_estate"] == pytest.approx(rrsp + 30000.0 - tax_2032 - tax(rrsp))
+    assert result["yearly"]["tax"] == pytest.approx([tax_2030, tax_2031, tax_2032])
+    assert result["yearly"]["meltdown"] == [10000.0, 10000.0, 10000.0]
+    ranked = [strategy["lifetime_tax"] for strategy in result["top"]]
+    assert ranked == sorted(ranked)
+
+
+def test_memo_reuses_evaluations(inputs):
+    candidates = [
+        WithdrawalCandidate(order_index, amount, 80)
+        for order_index in (0, 1) for amount in (1000.0, 10000.0)
+    ]
+    first = evaluate(inputs, "memo", candidates)
+    hits = candidate_memo.hits
+
+    second = evaluate(inputs, "memo", candidates)
+    assert candidate_memo.hits - hits == 4
+    assert all(second[candidate] is first[candidate] for candidate in candidates)
+
+    # Without a meltdown the stop age is irrelevant, so both candidates are the same
+    hits = candidate_memo.hits
+    evaluate(inputs, "memo", [WithdrawalCandidate(0, 0.0, 71)])
+    third = evaluate(inputs, "memo", [WithdrawalCandidate(0, 0.0, 80)])
+    assert candidate_memo.hits - hits == 1
+    assert list(third) == [WithdrawalCandidate(0, 0.0, 0)]
+
+
+def test_process_pool_matches_inline_evaluation(inputs, monkeypatch):
+    candidates = [
+        WithdrawalCandidate(order_index, amount, 80)
+        for order_index in range(len(WITHDRAWAL_ORDERS)) for amount in (5000.0, 10000.0)
+    ]
+    inline = evaluate(inputs, "inline", candidates)
+
+    monkeypatch.setattr(settings, "OPTIMIZER_WORKERS", 2)
+    withdrawal_optimizer.start_process_pool()
+    try:
+        pool = withdrawal_optimizer.get_process_pool()
+        assert pool is not None
+        pooled = evaluate(inputs, "pool", candidates)
+
+        # A dead worker breaks the pool: the evaluation runs inline and the pool is replaced
+        for process in list(pool._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+        recovered = evaluate(inputs, "broken pool", candidates)
+        assert withdrawal_optimizer.get_process_pool() not in (None, pool)
+    finally:
+        withdrawal_optimizer.shutdown_process_pool()
+
+    for results in (pooled, recovered):
+        for candidate in candidates:
+            assert results[candidate]["lifetime_tax"] == pytest.approx(inline[candidate]["lifetime_tax"])
+            assert results[candidate]["terminal_estate"] == pytest.approx(inline[candidate]["terminal_estate"])
+            assert results[candidate]["meltdown"].tolist() == inline[candidate]["meltdown"].tolist()
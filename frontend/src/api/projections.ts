@@ -43,6 +43,102 @@ export interface DeathBenefit {
   benefit_amount: number;
 }
 
+export interface FullProjection {
+  net_worth: Record<string, Record<string, number>>;
+  cash_flow: Record<string, CashFlowProjection>;
+  detailed_withdrawals: Record<string, WithdrawalStrategyResult>;
+}
+
+export type ProjectionView = 'net-worth' | 'cash-flow' | 'detailed-withdrawals' | 'full';
+
+export interface ColumnarAccount {
+  id: number;
+  name: string;
+  account_type: string;
+  family_member_id: number;
+  rrif_conversion_year: number | null;
+}
+
+export interface ColumnarProjection {
+  years: number[];
+  family_members: { id: number; name: string }[];
+  accounts: ColumnarAccount[];
+  net_worth?: Record<string, number[]>;
+  cash_flow?: Record<string, number[]>;
+  death_benefits?: {
+    year: number[];
+    family_member_id: number[];
+    benefit_amount: number[];
+  };
+  withdrawals?: {
+    shortfall: number[];
+    unfunded_amount: number[];
+    active: boolean[][];
+    start_value: number[][];
+    withdrawal: number[][];
+    end_value: number[][];
+  };
+}
+
+export interface BatchProjectionScenario {
+  scenario_id?: number;
+  parameters?: ProjectionParameters;
+}
+
+export interface BatchProjectionRequest {
+  parameters: ProjectionParameters;
+  scenarios: BatchProjectionScenario[];
+  view?: ProjectionView;
+}
+
+export interface BatchProjectionResult {
+  scenario_id: number | null;
+  name: string | null;
+  parameters: ProjectionParameters;
+  // Columnar projection without its own years; null outside the scenario's range
+  projection: Omit<ColumnarProjection, 'years'>;
+}
+
+export interface BatchProjectionResponse {
+  years: number[];
+  results: BatchProjectionResult[];
+}
+
+export type WithdrawalOptimizerObjective = 'min_lifetime_tax' | 'max_terminal_estate';
+
+export interface WithdrawalOptimizerParameters extends ProjectionParameters {
+  objective?: WithdrawalOptimizerObjective;
+  meltdown_amounts?: number[];
+  meltdown_until_ages?: number[];
+  refinement_rounds?: number;
+  top_n?: number;
+}
+
+export interface WithdrawalStrategyEvaluation {
+  strategy: {
+    withdrawal_order: string[][];
+    meltdown_amount: number;
+    meltdown_until_age: number | null;
+  };
+  lifetime_tax: number;
+  terminal_estate: number;
+  unfunded_amount: number;
+}
+
+export interface WithdrawalOptimizerResult {
+  objective: WithdrawalOptimizerObjective;
+  candidates_evaluated: number;
+  memo_hits: number;
+  baseline: WithdrawalStrategyEvaluation;
+  best: WithdrawalStrategyEvaluation;
+  top: WithdrawalStrategyEvaluation[];
+  yearly: {
+    years: number[];
+    tax: number[];
+    meltdown: number[];
+  };
+}
+
 export const projectionsApi = {
   /**
    * Generate net worth projections
@@ -69,5 +165,43 @@ export const projectionsApi = {
     params: ProjectionParameters
   ): Promise<Record<string, WithdrawalStrategyResult>> => {
     return api.post('/projections/detailed-withdrawals', params);
+  },
+
+  /**
+   * Generate net worth, cash flow and withdrawal projections in one run
+   */
+  getFullProjections: async (
+    params: ProjectionParameters
+  ): Promise<FullProjection> => {
+    return api.post('/projections/full', params);
+  },
+
+  /**
+   * Generate a projection view in columnar form (one array per series),
+   * suited for charts
+   */
+  getColumnarProjection: async (
+    view: ProjectionView,
+    params: ProjectionParameters
+  ): Promise<ColumnarProjection> => {
+    return api.post(`/projections/v2/${view}`, params);
+  },
+
+  /**
+   * Run several scenarios in one request, aligned on a shared year axis
+   */
+  getBatchProjections: async (
+    request: BatchProjectionRequest
+  ): Promise<BatchProjectionResponse> => {
+    return api.post('/projections/batch', request);
+  },
+
+  /**
+   * Search for the most tax-efficient withdrawal strategy
+   */
+  optimizeWithdrawals: async (
+    params: WithdrawalOptimizerParameters
+  ): Promise<WithdrawalOptimizerResult> => {
+    return api.post('/projections/optimize-withdrawals', params);
   }
 }; 
\ No newline at end of file